@@ -0,0 +1,52 @@
+""" Compares memory use of the substring and rolling-integer wordification paths. """
+import time
+import argparse
+import tracemalloc
+from typing import Set, List, Tuple, Callable
+
+from telephone.engine import VocabIndex
+from telephone.all_wordifications import compute_wordifications
+from telephone.integer_index import compute_wordifications_by_lattice
+from benchmarks.thread_scaling import synthetic_vocabulary, synthetic_numbers
+
+# pylint: disable=bad-continuation
+
+
+def measure(
+    function: Callable[[str], Set[str]], numbers: List[str]
+) -> Tuple[float, int]:
+    """ Returns seconds taken and peak traced bytes running ``function`` on each. """
+    tracemalloc.start()
+    start = time.perf_counter()
+    for number in numbers:
+        function(number)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    """ Prints time and peak memory for each path. """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vocab-size", type=int, default=2000)
+    parser.add_argument("--numbers", type=int, default=300)
+    args = parser.parse_args()
+
+    index = VocabIndex(synthetic_vocabulary(args.vocab_size))
+    numbers = synthetic_numbers(args.numbers)
+    paths = {
+        "substring": lambda number: compute_wordifications(
+            number, "", index.vocab_map
+        ),
+        "integer": lambda number: compute_wordifications_by_lattice(
+            number, "", index.integer_map, index.max_hash_length
+        ),
+    }
+    for name, function in paths.items():
+        elapsed, peak = measure(function, numbers)
+        print("%-10s %8.3fs  peak=%8.1f KiB" % (name, elapsed, peak / 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+""" Fits the planner's cost model to timings on this machine. """
+import random
+import string
+import argparse
+from typing import List
+
+from telephone.engine import Engine
+from telephone.planner import Planner, calibrate
+from benchmarks.thread_scaling import synthetic_vocabulary
+
+# pylint: disable=bad-continuation
+
+
+def sample_numbers(count: int, seed: int = 0) -> List[str]:
+    """
+    Random numbers with 3 to 8 digit bases, so that with single letters in the
+    vocabulary the result counts range over several orders of magnitude.
+    """
+    rng = random.Random(seed)
+    return [
+        "1-" + "".join(rng.choice("23456789") for _ in range(rng.randint(3, 8)))
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    """ Calibrates, prints the coefficients and a sample plan, and saves them. """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vocab-size", type=int, default=2000)
+    parser.add_argument("--numbers", type=int, default=40)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--output", default="costs.json")
+    args = parser.parse_args()
+
+    vocabulary = synthetic_vocabulary(args.vocab_size) | set(string.ascii_lowercase)
+    engine = Engine.from_vocabulary(vocabulary)
+    numbers = sample_numbers(args.numbers)
+
+    costs = calibrate(engine, numbers, processes=args.processes)
+    for strategy, (fixed, per_unit) in sorted(costs.coefficients.items()):
+        print("%-16s fixed=%.2es per_unit=%.2es" % (strategy, fixed, per_unit))
+    print(Planner(engine, costs, args.processes).explain(numbers[0]))
+    costs.to_json(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+""" Fails when a fast path slows down relative to the frozen reference. """
+import sys
+import random
+import argparse
+from typing import List
+
+from telephone.engine import Engine
+from telephone.regression import (
+    compute_paths,
+    check_path,
+    measure_paths,
+    find_regressions,
+    load_baseline,
+    save_baseline,
+)
+from benchmarks.thread_scaling import synthetic_vocabulary, synthetic_numbers
+
+# pylint: disable=bad-continuation
+
+BASELINE_PATH = "benchmarks/baseline.json"
+
+
+def sample_phonewords(engine: Engine, numbers: List[str], seed: int = 0) -> List[str]:
+    """ One random phoneword of each of ``numbers``. """
+    rng = random.Random(seed)
+    return [
+        engine.sample_wordifications(number, 1, rng.randrange(2 ** 32))[0]
+        for number in numbers
+    ]
+
+
+def main() -> None:
+    """ Checks and times every path, then compares with or rewrites the baseline. """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--vocab-size", type=int, default=2000)
+    parser.add_argument("--numbers", type=int, default=300)
+    parser.add_argument("--update", action="store_true", help="rewrite the baseline")
+    args = parser.parse_args()
+
+    vocabulary = synthetic_vocabulary(args.vocab_size)
+    numbers = synthetic_numbers(args.numbers)
+    phonewords = sample_phonewords(Engine.from_vocabulary(vocabulary), numbers)
+    paths = compute_paths(vocabulary)
+
+    for name in paths:
+        inputs = phonewords if name.startswith("words_to_number/") else numbers
+        for value in inputs:
+            check_path(paths, name, value)
+
+    timings = measure_paths(paths, numbers, phonewords, args.repeats)
+    for name, ratio in sorted(timings.items()):
+        print("%-34s %7.3fx of reference" % (name, ratio))
+
+    if args.update:
+        save_baseline(timings, args.baseline)
+        print("Wrote %s." % args.baseline)
+        return
+
+    baseline = load_baseline(args.baseline)
+    regressions = find_regressions(timings, baseline, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+""" Replays a recorded trace against an engine at several concurrency levels. """
+import argparse
+
+from telephone.engine import Engine
+from telephone.build_index import build_vocab_index
+from telephone.trace import read_trace, engine_caller, replay
+
+# pylint: disable=bad-continuation
+
+
+def main() -> None:
+    """ Prints one ``ReplayReport`` per concurrency level. """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("trace", help="JSON lines file written by TraceRecorder")
+    parser.add_argument("vocabulary", nargs="+", help="word list files")
+    parser.add_argument("--speedup", type=float, default=1.0, help="0 for unpaced")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    engine = Engine(build_vocab_index(args.vocabulary))
+    records = list(read_trace(args.trace))
+    for concurrency in args.concurrency:
+        report = replay(
+            records,
+            engine_caller(engine),
+            args.speedup,
+            concurrency,
+            engine.index.fingerprint,
+        )
+        print("concurrency=%-3d %s" % (concurrency, report))
+        if report.fingerprint_mismatches:
+            mismatches = report.fingerprint_mismatches
+            print("  %d records used another vocabulary" % mismatches)
+
+
+if __name__ == "__main__":
+    main()
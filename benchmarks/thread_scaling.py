@@ -0,0 +1,70 @@
+""" Measures how ``run_batch()`` throughput scales with thread count. """
+import sys
+import time
+import random
+import sysconfig
+import argparse
+from typing import Set, List
+
+from telephone.engine import Engine, run_batch
+
+# pylint: disable=bad-continuation
+
+
+def synthetic_vocabulary(size: int, seed: int = 0) -> Set[str]:
+    """ Random lowercase words of 3 to 7 letters. """
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary: Set[str] = set()
+    while len(vocabulary) < size:
+        length = rng.randint(3, 7)
+        vocabulary.add("".join(rng.choice(letters) for _ in range(length)))
+    return vocabulary
+
+
+def synthetic_numbers(count: int, seed: int = 0) -> List[str]:
+    """ Random US numbers with country code and dashes. """
+    rng = random.Random(seed)
+    return [
+        "1-%03d-%03d-%04d"
+        % (rng.randrange(1000), rng.randrange(1000), rng.randrange(10000))
+        for _ in range(count)
+    ]
+
+
+def gil_status() -> str:
+    """ Describes whether this interpreter was built with, and is running, the GIL. """
+    free_threaded_build = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    return "build=%s gil=%s" % (
+        "free-threaded" if free_threaded_build else "default",
+        "enabled" if is_gil_enabled() else "disabled",
+    )
+
+
+def main() -> None:
+    """ Runs the benchmark and prints one line per thread count. """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vocab-size", type=int, default=2000)
+    parser.add_argument("--numbers", type=int, default=1000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    engine = Engine.from_vocabulary(synthetic_vocabulary(args.vocab_size))
+    numbers = synthetic_numbers(args.numbers)
+    print("Python %s, %s" % (sys.version.split()[0], gil_status()))
+
+    baseline = 0.0
+    for threads in args.threads:
+        start = time.perf_counter()
+        run_batch(engine.all_wordifications, numbers, max_workers=threads)
+        throughput = len(numbers) / (time.perf_counter() - start)
+        baseline = baseline or throughput
+        print(
+            "threads=%-3d %9.1f numbers/s  speedup=%.2fx"
+            % (threads, throughput, throughput / baseline)
+        )
+
+
+if __name__ == "__main__":
+    main()
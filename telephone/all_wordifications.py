@@ -1,16 +1,17 @@
 """ A function to generate all possible phonewords from a given number. """
-import re
-from typing import Set, Dict, List, Tuple, Optional
+from typing import Set, Dict, List, Tuple, Mapping, Sequence, Optional
 
 from telephone.utils import (
     validate,
     get_vocabulary,
     compute_vocab_map,
     get_country_code_and_base,
+    infer_format,
     get_substring_starting_index_map,
     insert_dashes,
 )
-from telephone.tests.test_constants import US_LETTER_MAP
+from telephone.keypad import LetterMap, US_KEYPAD
+from telephone.limits import Limits, Budget, LimitExceeded
 
 # pylint: disable=bad-continuation, too-many-locals, too-many-nested-blocks
 
@@ -19,7 +20,8 @@ def all_wordifications(
     number: str,
     numformat: str = "",
     vocabulary: Optional[Set[str]] = None,
-    letter_map: Dict[str, str] = US_LETTER_MAP,
+    letter_map: LetterMap = US_KEYPAD,
+    limits: Optional[Limits] = None,
 ) -> Set[str]:
     """
     Generates all phonewords from ``number`` using words from ``vocabulary``.
@@ -33,14 +35,22 @@ def all_wordifications(
     vocabulary : ``Optional[Set[str]]``.
         Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
         and use a default US vocabulary.
-    letter_map : ``Dict[str, str]``.
-        Maps uppercase English letters to digits.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    limits : ``Optional[Limits]``.
+        Bounds on results, intermediate states, time and cancellation.
 
     Returns
     -------
     phonewords : ``Set[str]``.
         The set of all possible phonewords which can be generated from ``number`` with
         the given ``vocab_map``. All letters are uppercase.
+
+    Raises
+    ------
+    LimitExceeded.
+        If any of ``limits`` is hit. Its ``partial`` attribute holds the phonewords
+        completed so far.
     """
     validate(number)
     if number == "":
@@ -49,13 +59,44 @@ def all_wordifications(
     vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
     vocabulary_map: Dict[str, List[str]] = compute_vocab_map(vocab, letter_map)
 
+    return compute_wordifications(number, numformat, vocabulary_map, limits)
+
+
+def compute_wordifications(
+    number: str,
+    numformat: str,
+    vocabulary_map: Mapping[str, Sequence[str]],
+    limits: Optional[Limits] = None,
+) -> Set[str]:
+    """
+    Generates all phonewords from ``number`` given a precomputed ``vocabulary_map``,
+    as returned by ``compute_vocab_map()``. Does not modify ``vocabulary_map``, so a
+    single map may be shared between threads.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid, nonempty US phone number with country code and dashes.
+    numformat : ``str``.
+        Format of the number using "0" and "-". Inferred from ``number`` if empty.
+    vocabulary_map : ``Mapping[str, Sequence[str]]``.
+        Maps digit hashes to the uppercase words which hash to them.
+    limits : ``Optional[Limits]``.
+        Bounds on results, intermediate states, time and cancellation.
+
+    Returns
+    -------
+    phonewords : ``Set[str]``.
+        As for ``all_wordifications()``.
+    """
     # Format inference.
     if numformat == "":
-        numformat = re.sub(r"[0-9]", "0", number)
+        numformat = infer_format(number)
 
     spacer = "&"
     country_code, base_number = get_country_code_and_base(number)
     substrs_map = get_substring_starting_index_map(base_number)
+    budget = Budget(limits)
 
     # Gives the list of all phonewords for ``base_number[i:]``.
     phoneword_map: Dict[int, List[Tuple[str, int]]] = {}
@@ -69,47 +110,64 @@ def all_wordifications(
     # NOTE: Lists should be sorted by order of indices.
     phoneword_map[len(base_number)] = [("", len(base_number))]
     i = len(base_number) - 1
-    while i >= 0:
-        substrs_starting_at_i = substrs_map[i]
-        new_list: List[Tuple[str, int]] = []
-        previous_list: List[Tuple[str, int]] = phoneword_map[i + 1]
-
-        # Wordifications of a substring are still valid wordifications.
-        # Add the phonewords you get by just adding ``base_number[i]`` to phonewords of
-        # ``base_number[i + 1:]``.
-        # i.e. ``4bike`` from ``bike`` for ``base_number == 42453``.
-        new_list.extend([(base_number[i] + substr, k) for substr, k in previous_list])
-        for old_phoneword, end_index in previous_list:
-
-            # Compute the gap between the beginning of the current string
-            # ``base_number[i:]`` and the first alphabetic substitution in
-            # ``old_phoneword``.
-            gap: str = base_number[i:end_index]
-            gap_substrs = substrs_starting_at_i[: len(gap)]
-
-            # For each substring of ``gap`` which includes first char of ``gap``.
-            for gap_substr in gap_substrs:
-
-                # If the substring has 1 or more wordifications, grab them as a list.
-                if gap_substr in vocabulary_map:
-                    substr_wordifications: List[str] = vocabulary_map[gap_substr]
-
-                    # For each word in the list, make the substitution and add to list.
-                    for word in substr_wordifications:
-
-                        # Placing two words adjacent to each other; delimit them.
-                        # Make sure we don't put a spacer at the very end.
-                        if len(word) == len(gap) and end_index < len(base_number):
-                            phoneword = word + spacer + old_phoneword[len(word) - 1 :]
-                        else:
-                            # print("No spacer for word '%s'." % word)
-                            # print("End index:", end_index)
-                            # print("Len base_number:", len(base_number))
-                            phoneword = word + old_phoneword[len(word) - 1 :]
-                        new_list.append((phoneword, i))
-
-        phoneword_map[i] = new_list
-        i -= 1
+    new_list: List[Tuple[str, int]] = phoneword_map[len(base_number)]
+    try:
+        while i >= 0:
+            substrs_starting_at_i = substrs_map[i]
+            previous_list: List[Tuple[str, int]] = phoneword_map[i + 1]
+            new_list = []
+
+            # Wordifications of a substring are still valid wordifications.
+            # Add the phonewords you get by just adding ``base_number[i]`` to
+            # phonewords of ``base_number[i + 1:]``.
+            # i.e. ``4bike`` from ``bike`` for ``base_number == 42453``.
+            new_list.extend(
+                [(base_number[i] + substr, k) for substr, k in previous_list]
+            )
+            budget.charge(len(previous_list))
+            for old_phoneword, end_index in previous_list:
+
+                # Compute the gap between the beginning of the current string
+                # ``base_number[i:]`` and the first alphabetic substitution in
+                # ``old_phoneword``.
+                gap: str = base_number[i:end_index]
+                gap_substrs = substrs_starting_at_i[: len(gap)]
+                size_before = len(new_list)
+
+                # For each substring of ``gap`` which includes first char of ``gap``.
+                for gap_substr in gap_substrs:
+
+                    # If the substring has 1 or more wordifications, grab them.
+                    if gap_substr in vocabulary_map:
+                        substr_wordifications = vocabulary_map[gap_substr]
+
+                        # For each word in the list, make the substitution.
+                        for word in substr_wordifications:
+
+                            # Placing two words adjacent to each other; delimit them.
+                            # Make sure we don't put a spacer at the very end.
+                            if len(word) == len(gap) and end_index < len(base_number):
+                                phoneword = (
+                                    word + spacer + old_phoneword[len(word) - 1 :]
+                                )
+                            else:
+                                phoneword = word + old_phoneword[len(word) - 1 :]
+                            new_list.append((phoneword, i))
+
+                if len(new_list) > size_before:
+                    budget.charge(len(new_list) - size_before)
+                    budget.check_results(len(new_list))
+
+            phoneword_map[i] = new_list
+            i -= 1
+    except LimitExceeded as error:
+        # Every suffix phoneword at index ``i`` completes to a full phoneword when
+        # prefixed with the digits before it, so these are valid partial results.
+        prefix = country_code + spacer + base_number[: max(i, 0)]
+        error.partial = budget.collect_partial(
+            new_list, lambda item: insert_dashes(prefix + item[0], spacer, numformat)
+        )
+        raise
 
     # Note that at this point, the phonewords may have spacer tokens in them.
     phonewords = {word.upper() for word, _ in phoneword_map[0]}
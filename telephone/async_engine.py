@@ -0,0 +1,163 @@
+""" Non-blocking, request-coalescing wordification for asyncio applications. """
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Set, Dict, Tuple, Callable, Optional, Hashable
+
+from telephone.engine import Engine
+from telephone.limits import Limits, CancellationToken
+
+# pylint: disable=bad-continuation, too-few-public-methods
+
+
+class Flight:
+    """ One in-flight computation and the number of coroutines awaiting it. """
+
+    __slots__ = ("future", "token", "waiters")
+
+    def __init__(self, future: "asyncio.Future[Any]", token: CancellationToken) -> None:
+        self.future = future
+        self.token = token
+        self.waiters = 0
+
+
+class AsyncEngine:
+    """
+    Awaitable wrappers around the methods of an ``Engine``. Work runs on
+    ``executor`` so that the event loop is never blocked, and concurrent calls with
+    identical arguments share a single computation ("single-flight").
+
+    Cancelling an awaiting task detaches it from the shared computation; once no
+    task is left awaiting, the computation itself is cancelled at its next budget
+    check and the executor thread is released.
+
+    Parameters
+    ----------
+    engine : ``Engine``.
+        The engine to compute with. Shared across executor threads.
+    executor : ``Optional[ThreadPoolExecutor]``.
+        Thread pool to run computations on. ``None`` uses the event loop's default
+        executor. Process pools are not supported: the engine is shared rather than
+        copied, and cancellation signals the computation through shared memory.
+
+    Raises
+    ------
+    TypeError.
+        If ``executor`` is not a ``ThreadPoolExecutor``.
+    """
+
+    def __init__(
+        self, engine: Engine, executor: Optional[ThreadPoolExecutor] = None
+    ) -> None:
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise TypeError(
+                "AsyncEngine needs a ThreadPoolExecutor, got '%s'."
+                % type(executor).__name__
+            )
+        self.engine = engine
+        self.executor = executor
+        self._flights: Dict[Hashable, Flight] = {}
+
+    async def aall_wordifications(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> Set[str]:
+        """
+        As ``Engine.all_wordifications()``, awaitable and coalesced. Each caller gets
+        its own copy of the shared result, so mutating it affects no other caller.
+        """
+        result: Set[str] = await self._coalesce(
+            self.engine.all_wordifications, number, numformat, limits
+        )
+        return set(result)
+
+    async def anumber_to_words(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> str:
+        """ As ``Engine.number_to_words()``, awaitable and coalesced. """
+        result: str = await self._coalesce(
+            self.engine.number_to_words, number, numformat, limits
+        )
+        return result
+
+    def in_flight(self) -> int:
+        """ Returns the number of distinct computations currently running. """
+        return len(self._flights)
+
+    async def _coalesce(
+        self,
+        method: Callable[[str, str, Optional[Limits]], Any],
+        number: str,
+        numformat: str,
+        limits: Optional[Limits],
+    ) -> Any:
+        """
+        Awaits the computation of ``method(number, numformat, limits)``, starting it
+        only if no identical call is already running.
+
+        Raises
+        ------
+        ValueError.
+            If ``limits`` carries a ``CancellationToken``; cancel the awaiting task
+            instead.
+        """
+        limits = Limits() if limits is None else limits
+        if limits.cancel is not None:
+            raise ValueError("Cancel the awaiting task rather than passing a token.")
+        key = (
+            method.__name__,
+            number,
+            numformat,
+            limits.max_results,
+            limits.max_states,
+            limits.timeout,
+            limits.deadline,
+        )
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._start(key, method, number, numformat, limits)
+
+        flight.waiters += 1
+        try:
+            # Shielded so that cancelling one waiter does not cancel the others.
+            return await asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.future.done():
+                flight.token.cancel()
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def _start(
+        self,
+        key: Tuple[Any, ...],
+        method: Callable[[str, str, Optional[Limits]], Any],
+        number: str,
+        numformat: str,
+        limits: Limits,
+    ) -> Flight:
+        """ Submits a computation to the executor and registers it under ``key``. """
+        token = CancellationToken()
+        flight_limits = Limits(
+            limits.max_results,
+            limits.max_states,
+            limits.timeout,
+            limits.deadline,
+            token,
+        )
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self.executor, functools.partial(method, number, numformat, flight_limits)
+        )
+        flight = Flight(future, token)
+        self._flights[key] = flight
+
+        def finish(done: "asyncio.Future[Any]") -> None:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            # Marks the outcome of an abandoned computation as retrieved.
+            if not done.cancelled():
+                done.exception()
+
+        future.add_done_callback(finish)
+        return flight
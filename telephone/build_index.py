@@ -0,0 +1,185 @@
+""" Streaming, parallel construction of a ``VocabIndex`` from large word lists. """
+import os
+import gzip
+import heapq
+import itertools
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    IO,
+    Dict,
+    List,
+    Tuple,
+    Deque,
+    Mapping,
+    Iterable,
+    Iterator,
+    Optional,
+)
+from collections import deque
+
+from telephone.keypad import Keypad, LetterMap, US_KEYPAD, as_keypad
+from telephone.engine import VocabIndex
+
+# pylint: disable=bad-continuation, too-many-locals, global-statement
+
+# Sort key of a word: (negated frequency, global line number). Lower is better.
+RankKey = Tuple[float, int]
+
+# A hashed vocabulary entry: (hash, uppercase word, rank key).
+Entry = Tuple[str, str, RankKey]
+
+WORKER_KEYPAD: Optional[Keypad] = None
+
+
+def open_word_list(path: str) -> IO[str]:
+    """ Opens a plain or gzipped (``.gz``) text file for reading. """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_line_chunks(
+    paths: Iterable[str], chunk_size: int
+) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Streams the lines of ``paths`` in order as ``(first line number, lines)`` chunks
+    of at most ``chunk_size`` lines, numbering lines across all files.
+    """
+    line_number = 0
+    for path in paths:
+        with open_word_list(path) as word_file:
+            while True:
+                lines = list(itertools.islice(word_file, chunk_size))
+                if not lines:
+                    break
+                yield line_number, lines
+                line_number += len(lines)
+
+
+def hash_lines(start: int, lines: List[str], keypad: Keypad) -> List[Entry]:
+    """
+    Parses and hashes one chunk of a word list, returning a run sorted by hash and
+    word.
+
+    Each nonblank line holds a word, optionally followed by whitespace and a
+    frequency. Words are checked as ``compute_vocab_map()`` checks them.
+
+    Raises
+    ------
+    ValueError.
+        If a word contains non-alpha characters or letters outside of the keypad, or
+        a frequency is not a number.
+    """
+    run: List[Entry] = []
+    for line_number, line in enumerate(lines, start):
+        fields = line.split()
+        if not fields:
+            continue
+        token = fields[0]
+        if not token.isalpha():
+            raise ValueError(
+                "Vocabulary word '%s' on line %d contains non-alpha chars."
+                % (token, line_number + 1)
+            )
+        if keypad.unmapped(token):
+            raise ValueError(
+                "Vocabulary word '%s' on line %d contains letters outside the keypad."
+                % (token, line_number + 1)
+            )
+        try:
+            frequency = float(fields[1]) if len(fields) > 1 else 0.0
+        except ValueError:
+            raise ValueError(
+                "Frequency '%s' on line %d is not a number."
+                % (fields[1], line_number + 1)
+            )
+        rank_key = (-frequency, line_number)
+        run.append((keypad.translate(token), token.upper(), rank_key))
+    run.sort()
+    return run
+
+
+def init_worker(letter_map: Dict[str, str]) -> None:
+    """ Compiles the keypad once per worker process. """
+    global WORKER_KEYPAD
+    WORKER_KEYPAD = Keypad(letter_map)
+
+
+def hash_chunk(start: int, lines: List[str]) -> List[Entry]:
+    """ Runs ``hash_lines()`` in a worker set up by ``init_worker()``. """
+    assert WORKER_KEYPAD is not None
+    return hash_lines(start, lines, WORKER_KEYPAD)
+
+
+def build_vocab_index(
+    paths: Iterable[str],
+    letter_map: LetterMap = US_KEYPAD,
+    processes: Optional[int] = None,
+    chunk_size: int = 200000,
+) -> VocabIndex:
+    """
+    Builds a ``VocabIndex`` from word list files without loading them whole.
+
+    Files are read in chunks of ``chunk_size`` lines, which are parsed, validated and
+    hashed into sorted runs on a process pool. At most two chunks per process are in
+    flight at once, so memory is bounded by the runs rather than the raw text. The
+    runs are then merged, deduplicating words and keeping the best rank of each.
+
+    Parameters
+    ----------
+    paths : ``Iterable[str]``.
+        Word list files, plain or gzipped (``.gz``). One word per line, optionally
+        followed by whitespace and a frequency.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    processes : ``Optional[int]``.
+        Worker processes. ``None`` uses every CPU; ``1`` hashes in this process.
+    chunk_size : ``int``.
+        Lines per chunk.
+
+    Returns
+    -------
+    index : ``VocabIndex``.
+        The compiled vocabulary. ``ranks`` orders words by descending frequency, then
+        by first appearance, so files without frequencies are ranked by line order.
+    """
+    keypad = as_keypad(letter_map)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    chunks = iter_line_chunks(paths, chunk_size)
+
+    runs: List[List[Entry]] = []
+    if processes <= 1:
+        runs = [hash_lines(start, lines, keypad) for start, lines in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=init_worker,
+            initargs=(dict(keypad.letter_map),),
+        ) as executor:
+            pending: Deque["Future[List[Entry]]"] = deque()
+            for start, lines in chunks:
+                if len(pending) >= 2 * processes:
+                    runs.append(pending.popleft().result())
+                pending.append(executor.submit(hash_chunk, start, lines))
+            runs.extend([future.result() for future in pending])
+
+    return merge_runs(runs, keypad)
+
+
+def merge_runs(runs: List[List[Entry]], keypad: Keypad) -> VocabIndex:
+    """ Merges sorted runs from ``hash_lines()`` into a ranked ``VocabIndex``. """
+    vocab_map: Dict[str, List[str]] = {}
+    best_keys: Dict[str, RankKey] = {}
+    previous_word = ""
+    for wordhash, word, key in heapq.merge(*runs):
+        # Duplicates are adjacent after merging, best key first.
+        if word == previous_word:
+            continue
+        previous_word = word
+        best_keys[word] = key
+        vocab_map.setdefault(wordhash, []).append(word)
+
+    ordered = sorted([(key, word) for word, key in best_keys.items()])
+    ranks: Mapping[str, int] = {word: rank for rank, (_, word) in enumerate(ordered)}
+    return VocabIndex.from_vocab_map(vocab_map, keypad, ranks)
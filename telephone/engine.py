@@ -0,0 +1,344 @@
+""" A frozen, thread-safe wordification engine over a compiled vocabulary. """
+import hashlib
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Set,
+    List,
+    Tuple,
+    Mapping,
+    Sequence,
+    Iterable,
+    Callable,
+    Iterator,
+    Optional,
+    FrozenSet,
+    TypeVar,
+)
+
+from telephone.utils import validate, compute_vocab_map, get_country_code_and_base
+from telephone.keypad import Frozen, Keypad, LetterMap, US_KEYPAD, as_keypad
+from telephone.limits import Limits
+from telephone.integer_index import (
+    encode_digits,
+    compute_integer_lattice,
+    compute_wordifications_by_lattice,
+    compute_number_to_words_by_lattice,
+)
+from telephone.words_to_number import words_to_number
+from telephone.page_wordifications import compute_page_wordifications
+from telephone.sample_wordifications import compute_sample_wordifications
+from telephone.factorised_wordifications import (
+    FactorisedWordifications,
+    IntegerPlaceholderMap,
+    compute_factorised_wordifications,
+)
+from telephone.sharded_wordifications import compute_sharded_wordifications
+
+# pylint: disable=bad-continuation, too-many-arguments
+
+T = TypeVar("T")
+
+
+class VocabIndex(Frozen):
+    """
+    A vocabulary compiled against one keypad. Immutable once built, and therefore
+    safe to share between any number of concurrent readers.
+
+    Parameters
+    ----------
+    vocabulary : ``Iterable[str]``.
+        Lowercase, alphabetical-only vocabulary words.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    ranks : ``Optional[Mapping[str, int]]``.
+        Frequency rank of each uppercase word, ``0`` being the most frequent.
+
+    Attributes
+    ----------
+    keypad : ``Keypad``.
+        The layout words were hashed with.
+    vocabulary : ``FrozenSet[str]``.
+        The source words.
+    vocab_map : ``Mapping[str, Tuple[str, ...]]``.
+        Read-only map from digit hashes to sorted uppercase words.
+    hash_lengths : ``Tuple[int, ...]``.
+        Sorted distinct lengths of the hashes in ``vocab_map``.
+    integer_map : ``Mapping[int, Tuple[str, ...]]``.
+        ``vocab_map`` keyed by ``encode_digits()`` of each hash.
+    max_hash_length : ``int``.
+        Length of the longest hash, or zero for an empty vocabulary.
+    ranks : ``Mapping[str, int]``.
+        Frequency ranks of uppercase words, empty if none were given.
+    fingerprint : ``str``.
+        Stable digest of the vocabulary and keypad, suitable as a cache key.
+    """
+
+    __slots__ = (
+        "keypad",
+        "vocabulary",
+        "vocab_map",
+        "hash_lengths",
+        "integer_map",
+        "max_hash_length",
+        "ranks",
+        "fingerprint",
+    )
+
+    keypad: Keypad
+    vocabulary: FrozenSet[str]
+    vocab_map: Mapping[str, Tuple[str, ...]]
+    hash_lengths: Tuple[int, ...]
+    integer_map: Mapping[int, Tuple[str, ...]]
+    max_hash_length: int
+    ranks: Mapping[str, int]
+    fingerprint: str
+
+    def __init__(
+        self,
+        vocabulary: Iterable[str],
+        letter_map: LetterMap = US_KEYPAD,
+        ranks: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        keypad = as_keypad(letter_map)
+        vocab_map = compute_vocab_map(set(vocabulary), keypad)
+        self._compile(keypad, vocab_map, ranks)
+
+    @classmethod
+    def from_vocab_map(
+        cls,
+        vocab_map: Mapping[str, Sequence[str]],
+        letter_map: LetterMap = US_KEYPAD,
+        ranks: Optional[Mapping[str, int]] = None,
+    ) -> "VocabIndex":
+        """
+        Wraps an already computed vocab map, as returned by ``compute_vocab_map()``,
+        without rehashing any words. The caller is responsible for ``vocab_map``
+        agreeing with ``letter_map``.
+        """
+        index = cls.__new__(cls)
+        index._compile(as_keypad(letter_map), vocab_map, ranks)
+        return index
+
+    def _compile(
+        self,
+        keypad: Keypad,
+        vocab_map: Mapping[str, Sequence[str]],
+        ranks: Optional[Mapping[str, int]],
+    ) -> None:
+        """ Freezes ``vocab_map`` and derives the remaining attributes from it. """
+        frozen_map = {wordhash: tuple(sorted(ws)) for wordhash, ws in vocab_map.items()}
+        digest = hashlib.sha256(keypad.fingerprint.encode())
+        for wordhash in sorted(frozen_map):
+            entry = "\n%s:%s" % (wordhash, ",".join(frozen_map[wordhash]))
+            digest.update(entry.encode())
+        hash_lengths = tuple(sorted({len(wordhash) for wordhash in frozen_map}))
+        words = frozenset(
+            word.lower() for group in frozen_map.values() for word in group
+        )
+        self._freeze(
+            keypad=keypad,
+            vocabulary=words,
+            vocab_map=MappingProxyType(frozen_map),
+            hash_lengths=hash_lengths,
+            integer_map=MappingProxyType(
+                {encode_digits(wordhash): ws for wordhash, ws in frozen_map.items()}
+            ),
+            max_hash_length=hash_lengths[-1] if hash_lengths else 0,
+            ranks=MappingProxyType(dict(ranks) if ranks is not None else {}),
+            fingerprint=digest.hexdigest(),
+        )
+
+    def __repr__(self) -> str:
+        return "VocabIndex(%d words, %s)" % (
+            len(self.vocabulary),
+            self.fingerprint[:12],
+        )
+
+
+class Engine(Frozen):
+    """
+    The wordification entry points bound to a ``VocabIndex``. Methods keep all
+    per-call state local, so one engine may serve concurrent requests from any number
+    of threads, with or without the GIL. Every method matches words by rolling
+    integer codes, so none slices substrings.
+
+    Parameters
+    ----------
+    index : ``VocabIndex``.
+        The compiled vocabulary to wordify with.
+    """
+
+    __slots__ = ("index",)
+
+    index: VocabIndex
+
+    def __init__(self, index: VocabIndex) -> None:
+        self._freeze(index=index)
+
+    @classmethod
+    def from_vocabulary(
+        cls, vocabulary: Iterable[str], letter_map: LetterMap = US_KEYPAD
+    ) -> "Engine":
+        """ Compiles ``vocabulary`` and wraps it in an engine. """
+        return cls(VocabIndex(vocabulary, letter_map))
+
+    def _lattice(
+        self, number: str, integer_map: Optional[Mapping[int, Sequence[str]]] = None
+    ) -> List[List[Tuple[str, int]]]:
+        """
+        Builds the token lattice of the nonempty ``number`` from ``integer_map``,
+        which defaults to the index's.
+        """
+        _, base_number = get_country_code_and_base(number)
+        integer_map = self.index.integer_map if integer_map is None else integer_map
+        return compute_integer_lattice(
+            base_number, integer_map, self.index.max_hash_length
+        )
+
+    def all_wordifications(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> Set[str]:
+        """ As ``telephone.all_wordifications.all_wordifications()``. """
+        validate(number)
+        if number == "":
+            return set()
+        return compute_wordifications_by_lattice(
+            number,
+            numformat,
+            self.index.integer_map,
+            self.index.max_hash_length,
+            limits,
+        )
+
+    def number_to_words(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> str:
+        """
+        As ``telephone.number_to_words.number_to_words()``, but deterministic; see
+        ``compute_number_to_words_by_lattice()``.
+        """
+        validate(number)
+        if number == "":
+            return ""
+        return compute_number_to_words_by_lattice(
+            number,
+            numformat,
+            self.index.integer_map,
+            self.index.max_hash_length,
+            limits,
+        )
+
+    def words_to_number(self, phoneword: str, numformat: str = "") -> str:
+        """ As ``telephone.words_to_number.words_to_number()``. """
+        return words_to_number(phoneword, numformat, self.index.keypad)
+
+    def page_wordifications(
+        self,
+        number: str,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        numformat: str = "",
+        limits: Optional[Limits] = None,
+    ) -> Tuple[List[str], Optional[str]]:
+        """ As ``telephone.page_wordifications.page_wordifications()``. """
+        validate(number)
+        if limit < 1:
+            raise ValueError("Page limit must be positive, got '%d'." % limit)
+        if number == "":
+            return [], None
+        return compute_page_wordifications(
+            number,
+            cursor,
+            limit,
+            numformat,
+            self.index.vocab_map,
+            limits,
+            self.index.hash_lengths,
+            self._lattice(number),
+        )
+
+    def sample_wordifications(
+        self, number: str, k: int, seed: Optional[int] = None, numformat: str = ""
+    ) -> List[str]:
+        """ As ``telephone.sample_wordifications.sample_wordifications()``. """
+        validate(number)
+        if k < 0:
+            raise ValueError("Sample size must be nonnegative, got '%d'." % k)
+        if number == "":
+            return []
+        return compute_sample_wordifications(
+            number,
+            k,
+            seed,
+            numformat,
+            self.index.vocab_map,
+            self.index.hash_lengths,
+            self._lattice(number),
+        )
+
+    def factorised_wordifications(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> FactorisedWordifications:
+        """ As ``telephone.factorised_wordifications.factorised_wordifications()``. """
+        validate(number)
+        if number == "":
+            return FactorisedWordifications([], {})
+        return compute_factorised_wordifications(
+            number,
+            numformat,
+            self.index.vocab_map,
+            limits,
+            self.index.hash_lengths,
+            self._lattice(number, IntegerPlaceholderMap(self.index.integer_map)),
+        )
+
+    def iter_sharded_wordifications(
+        self,
+        number: str,
+        numformat: str = "",
+        processes: Optional[int] = None,
+        shards_per_process: int = 4,
+    ) -> Iterator[str]:
+        """ As ``telephone.sharded_wordifications.iter_sharded_wordifications()``. """
+        validate(number)
+        if number == "":
+            return iter(())
+        return compute_sharded_wordifications(
+            number,
+            numformat,
+            self.index.vocab_map,
+            processes,
+            shards_per_process,
+            self.index.hash_lengths,
+            self._lattice(number),
+        )
+
+
+def run_batch(
+    function: Callable[[str], T],
+    numbers: Iterable[str],
+    max_workers: Optional[int] = None,
+) -> List[T]:
+    """
+    Applies ``function`` to each of ``numbers`` on a thread pool, preserving order.
+    Intended for the bound methods of an ``Engine``, e.g.
+    ``run_batch(engine.all_wordifications, numbers, 8)``.
+
+    Parameters
+    ----------
+    function : ``Callable[[str], T]``.
+        A thread-safe function of a single number.
+    numbers : ``Iterable[str]``.
+        Inputs to ``function``.
+    max_workers : ``Optional[int]``.
+        Thread count, defaulting to that of ``ThreadPoolExecutor``.
+
+    Returns
+    -------
+    results : ``List[T]``.
+        ``function(number)`` for each of ``numbers``, in order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(function, numbers))
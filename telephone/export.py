@@ -0,0 +1,287 @@
+""" Bounded-memory export of every phoneword of an inventory as one sorted file. """
+import os
+import sys
+import gzip
+import heapq
+import tempfile
+import itertools
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    IO,
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Deque,
+    Iterable,
+    Iterator,
+    Optional,
+    NamedTuple,
+)
+from collections import deque
+
+from telephone.keypad import LetterMap, US_KEYPAD
+from telephone.engine import Engine, VocabIndex
+from telephone.utils import get_vocabulary
+from telephone.normalize import NumberError, classify_number
+from telephone.build_index import open_word_list
+
+# pylint: disable=bad-continuation, too-many-arguments, too-many-locals
+# pylint: disable=global-statement
+
+# Approximate bytes held per buffered phoneword beyond its characters: the string
+# header and the list slot pointing to it.
+ENTRY_OVERHEAD = sys.getsizeof("") + 8
+
+WORKER_EXPORT: Optional[Tuple[Engine, str, str, int]] = None
+
+
+class ExportStats(NamedTuple):
+    """
+    Summary of an ``export_wordifications()`` run.
+
+    Attributes
+    ----------
+    numbers : ``int``.
+        Inventory numbers wordified.
+    runs : ``int``.
+        Sorted runs spilled to disk during generation.
+    merge_passes : ``int``.
+        Passes over the runs needed to merge them into the output.
+    phonewords : ``int``.
+        Distinct phonewords written.
+    """
+
+    numbers: int
+    runs: int
+    merge_passes: int
+    phonewords: int
+
+
+def open_output(path: str) -> IO[str]:
+    """ Opens a plain or gzipped (``.gz``) text file for writing. """
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def iter_checked_numbers(numbers: Iterable[str]) -> Iterator[str]:
+    """
+    Strips each of ``numbers`` and yields it once ``classify_number()`` accepts it.
+
+    Raises
+    ------
+    ValueError.
+        Naming the first number rejected, and why.
+    """
+    for number in numbers:
+        number = number.strip()
+        code = classify_number(number)
+        if code != NumberError.OK:
+            raise ValueError("Invalid number '%s': %s." % (number, code.name))
+        yield number
+
+
+def write_run(phonewords: List[str], directory: str) -> str:
+    """ Sorts, deduplicates and writes ``phonewords`` to a new run file. """
+    descriptor, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(descriptor, "w", encoding="utf-8") as run_file:
+        previous = None
+        for phoneword in sorted(phonewords):
+            if phoneword != previous:
+                run_file.write(phoneword + "\n")
+                previous = phoneword
+    return path
+
+
+def spill_runs(
+    engine: Engine, numformat: str, numbers: List[str], directory: str, budget: int
+) -> List[str]:
+    """
+    Wordifies ``numbers``, buffering phonewords until they take about ``budget``
+    bytes and then spilling them as a sorted run.
+
+    Returns
+    -------
+    paths : ``List[str]``.
+        The runs written, in no particular order.
+    """
+    paths: List[str] = []
+    buffered: List[str] = []
+    size = 0
+    for number in numbers:
+        for phoneword in engine.all_wordifications(number, numformat):
+            buffered.append(phoneword)
+            size += len(phoneword) + ENTRY_OVERHEAD
+        if size >= budget:
+            paths.append(write_run(buffered, directory))
+            buffered = []
+            size = 0
+    if buffered:
+        paths.append(write_run(buffered, directory))
+    return paths
+
+
+def init_export_worker(
+    vocab_map: Dict[str, Tuple[str, ...]],
+    letter_map: Dict[str, str],
+    numformat: str,
+    directory: str,
+    budget: int,
+) -> None:
+    """ Compiles the engine once per worker process. """
+    global WORKER_EXPORT
+    index = VocabIndex.from_vocab_map(vocab_map, letter_map)
+    WORKER_EXPORT = (Engine(index), numformat, directory, budget)
+
+
+def export_chunk(numbers: List[str]) -> List[str]:
+    """ Runs ``spill_runs()`` in a worker set up by ``init_export_worker()``. """
+    assert WORKER_EXPORT is not None
+    engine, numformat, directory, budget = WORKER_EXPORT
+    return spill_runs(engine, numformat, numbers, directory, budget)
+
+
+def iter_run(path: str) -> Iterator[str]:
+    """ Streams the phonewords of a run without their newlines. """
+    with open_word_list(path) as run_file:
+        for line in run_file:
+            yield line[:-1]
+
+
+def merge_into(paths: List[str], output: IO[str]) -> int:
+    """
+    Merges sorted runs into ``output``, dropping duplicates across runs.
+
+    Returns
+    -------
+    count : ``int``.
+        Distinct phonewords written.
+    """
+    count = 0
+    previous = None
+    for phoneword in heapq.merge(*[iter_run(path) for path in paths]):
+        if phoneword != previous:
+            output.write(phoneword + "\n")
+            previous = phoneword
+            count += 1
+    return count
+
+
+def export_wordifications(
+    numbers: Iterable[str],
+    path: str,
+    numformat: str = "",
+    vocabulary: Optional[Set[str]] = None,
+    letter_map: LetterMap = US_KEYPAD,
+    processes: Optional[int] = None,
+    memory_budget: int = 256 * 1024 * 1024,
+    chunk_size: int = 1000,
+    fan_in: int = 64,
+    temp_dir: Optional[str] = None,
+) -> ExportStats:
+    """
+    Writes every phoneword of every number in an inventory to ``path``, sorted and
+    without duplicates, in bounded memory.
+
+    Generation runs on a process pool, each worker wordifying chunks of
+    ``chunk_size`` numbers and spilling sorted runs to a temporary directory whenever
+    its buffer fills its share of ``memory_budget``. The runs are then merged at most
+    ``fan_in`` at a time, in as many passes as needed, deduplicating as they go.
+
+    Parameters
+    ----------
+    numbers : ``Iterable[str]``.
+        The inventory. Surrounding whitespace is stripped, and each number is checked
+        by ``classify_number()`` before it is sent to a worker.
+    path : ``str``.
+        Output file, one phoneword per line. Gzipped if it ends in ``.gz``.
+    numformat : ``str``.
+        Format of the numbers using "0" and "-". Inferred per number if empty.
+    vocabulary : ``Optional[Set[str]]``.
+        Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
+        and use a default US vocabulary.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    processes : ``Optional[int]``.
+        Worker processes. ``None`` uses every CPU; ``1`` generates in this process.
+    memory_budget : ``int``.
+        Approximate bytes of buffered phonewords, shared between the workers. The
+        phonewords of a single number are always held at once.
+    chunk_size : ``int``.
+        Numbers per task sent to a worker.
+    fan_in : ``int``.
+        Most runs open at once while merging.
+    temp_dir : ``Optional[str]``.
+        Where to create the directory for runs. Defaults to the system's.
+
+    Returns
+    -------
+    stats : ``ExportStats``.
+        Counts of numbers, runs, merge passes and phonewords.
+
+    Raises
+    ------
+    ValueError.
+        If a number is invalid, or ``chunk_size`` or ``fan_in`` is too small.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive, got '%d'." % chunk_size)
+    if fan_in < 2:
+        raise ValueError("Merge fan-in must be at least 2, got '%d'." % fan_in)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
+    engine = Engine.from_vocabulary(vocab, letter_map)
+    budget = max(memory_budget // processes, 1)
+    checked = iter_checked_numbers(numbers)
+    chunks = iter(lambda: list(itertools.islice(checked, chunk_size)), [])
+
+    count = 0
+    with tempfile.TemporaryDirectory(prefix="telephone-export-", dir=temp_dir) as tmp:
+        runs: List[str] = []
+        if processes <= 1:
+            for chunk in chunks:
+                runs.extend(spill_runs(engine, numformat, chunk, tmp, budget))
+                count += len(chunk)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=init_export_worker,
+                initargs=(
+                    dict(engine.index.vocab_map),
+                    dict(engine.index.keypad.letter_map),
+                    numformat,
+                    tmp,
+                    budget,
+                ),
+            ) as executor:
+                pending: Deque["Future[List[str]]"] = deque()
+                for chunk in chunks:
+                    if len(pending) >= 2 * processes:
+                        runs.extend(pending.popleft().result())
+                    pending.append(executor.submit(export_chunk, chunk))
+                    count += len(chunk)
+                for future in pending:
+                    runs.extend(future.result())
+
+        # Merge down to at most ``fan_in`` runs, then into the output.
+        spilled = len(runs)
+        passes = 1
+        while len(runs) > fan_in:
+            merged: List[str] = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start : start + fan_in]
+                descriptor, merged_path = tempfile.mkstemp(suffix=".run", dir=tmp)
+                with os.fdopen(descriptor, "w", encoding="utf-8") as merged_file:
+                    merge_into(group, merged_file)
+                for run in group:
+                    os.remove(run)
+                merged.append(merged_path)
+            runs = merged
+            passes += 1
+        with open_output(path) as output:
+            phonewords = merge_into(runs, output)
+
+    return ExportStats(count, spilled, passes, phonewords)
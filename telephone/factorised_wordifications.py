@@ -0,0 +1,289 @@
+""" Factorised phonewords which share one slot per class of colliding words. """
+import re
+import itertools
+from types import MappingProxyType
+from typing import (
+    Any,
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Mapping,
+    Sequence,
+    Iterator,
+    Optional,
+)
+
+from telephone.utils import (
+    validate,
+    get_vocabulary,
+    compute_vocab_map,
+    get_country_code_and_base,
+    infer_format,
+    compute_token_lattice,
+    iter_lattice_paths,
+    assemble_phoneword,
+)
+from telephone.keypad import LetterMap, US_KEYPAD
+from telephone.limits import Limits, Budget, LimitExceeded
+
+# pylint: disable=bad-continuation, too-many-locals
+
+SLOT = re.compile(r"\{([0-9]+)\}")
+PLACEHOLDER = "X"
+
+
+class PlaceholderMap(Mapping[str, Sequence[str]]):
+    """ Views a vocab map with each hash class replaced by a single placeholder. """
+
+    def __init__(self, vocabulary_map: Mapping[str, Sequence[str]]) -> None:
+        self.vocabulary_map = vocabulary_map
+
+    def __getitem__(self, wordhash: str) -> Sequence[str]:
+        if wordhash not in self.vocabulary_map:
+            raise KeyError(wordhash)
+        return (PLACEHOLDER * len(wordhash),)
+
+    def __contains__(self, wordhash: object) -> bool:
+        return wordhash in self.vocabulary_map
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.vocabulary_map)
+
+    def __len__(self) -> int:
+        return len(self.vocabulary_map)
+
+
+class IntegerPlaceholderMap(Mapping[int, Sequence[str]]):
+    """
+    Views an integer vocab map, as returned by ``compute_integer_vocab_map()``, with
+    each hash class replaced by a single placeholder, for building a hash lattice
+    with ``compute_integer_lattice()``.
+    """
+
+    def __init__(self, integer_map: Mapping[int, Sequence[str]]) -> None:
+        self.integer_map = integer_map
+
+    def __getitem__(self, code: int) -> Sequence[str]:
+        if code not in self.integer_map:
+            raise KeyError(code)
+        return (PLACEHOLDER * (len(str(code)) - 1),)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.integer_map
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.integer_map)
+
+    def __len__(self) -> int:
+        return len(self.integer_map)
+
+
+def compute_hash_lattice(
+    lattice: List[List[Tuple[str, int]]]
+) -> List[List[Tuple[str, int]]]:
+    """
+    Collapses a token lattice, as returned by ``compute_token_lattice()``, to the
+    lattice over hashes built from a ``PlaceholderMap``, without any lookups.
+    """
+    hash_lattice: List[List[Tuple[str, int]]] = []
+    for i, options in enumerate(lattice):
+        ends = sorted({end for _, end in options[1:]})
+        hash_lattice.append(
+            [options[0]] + [(PLACEHOLDER * (end - i), end) for end in ends]
+        )
+    return hash_lattice
+
+
+class FactorisedWordifications:
+    """
+    Phonewords grouped by the digit hashes of their words. Each template is a
+    phoneword with every word replaced by a slot such as ``{7246837}``, which stands
+    for any word in that hash class, so a template expands to the product of its
+    class sizes.
+
+    Parameters
+    ----------
+    templates : ``Sequence[str]``.
+        Distinct templates, e.g. ``1-800-{7246837}``.
+    classes : ``Mapping[str, Sequence[str]]``.
+        Maps each hash used by a slot to its uppercase words.
+    """
+
+    __slots__ = ("templates", "classes")
+
+    def __init__(
+        self, templates: Sequence[str], classes: Mapping[str, Sequence[str]]
+    ) -> None:
+        self.templates: Tuple[str, ...] = tuple(templates)
+        self.classes: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {wordhash: tuple(words) for wordhash, words in classes.items()}
+        )
+
+    def count(self) -> int:
+        """ Returns the number of phonewords, without expanding any template. """
+        total = 0
+        for template in self.templates:
+            size = 1
+            for wordhash in SLOT.findall(template):
+                size *= len(self.classes[wordhash])
+            total += size
+        return total
+
+    def __iter__(self) -> Iterator[str]:
+        """ Streams every phoneword, one template at a time. """
+        for template in self.templates:
+            yield from expand_template(template, self.classes)
+
+    def expand(self) -> Set[str]:
+        """ Returns every phoneword, as ``all_wordifications()`` would. """
+        return set(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """ A JSON-serialisable form, inverted by ``from_dict()``. """
+        return {
+            "templates": list(self.templates),
+            "classes": {
+                wordhash: list(words) for wordhash, words in self.classes.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "FactorisedWordifications":
+        """ Rebuilds an instance from the output of ``to_dict()``. """
+        return cls(data["templates"], data["classes"])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FactorisedWordifications):
+            return NotImplemented
+        same_templates = set(self.templates) == set(other.templates)
+        return same_templates and dict(self.classes) == dict(other.classes)
+
+    def __repr__(self) -> str:
+        return "FactorisedWordifications(%d templates, %d classes)" % (
+            len(self.templates),
+            len(self.classes),
+        )
+
+
+def expand_template(
+    template: str, classes: Mapping[str, Sequence[str]]
+) -> Iterator[str]:
+    """
+    Yields each phoneword obtained by filling every slot of ``template`` with a word
+    from its class.
+    """
+    # Even-indexed parts are literal text; odd-indexed parts are slot hashes.
+    parts = SLOT.split(template)
+    literals = parts[0::2]
+    choices = [classes[wordhash] for wordhash in parts[1::2]]
+    for words in itertools.product(*choices):
+        pieces = [literals[0]]
+        for word, literal in zip(words, literals[1:]):
+            pieces.append(word)
+            pieces.append(literal)
+        yield "".join(pieces)
+
+
+def factorised_wordifications(
+    number: str,
+    numformat: str = "",
+    vocabulary: Optional[Set[str]] = None,
+    letter_map: LetterMap = US_KEYPAD,
+    limits: Optional[Limits] = None,
+) -> FactorisedWordifications:
+    """
+    Generates all phonewords from ``number`` in factorised form: one template per
+    arrangement of digits and word hashes, rather than one phoneword per choice of
+    word within each hash class.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    numformat : ``str``.
+        Format of the number using "0" and "-", e.g. "0-000-000-0000" for US numbers.
+    vocabulary : ``Optional[Set[str]]``.
+        Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
+        and use a default US vocabulary.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    limits : ``Optional[Limits]``.
+        Bounds on results, states, time and cancellation. Results are counted in
+        templates.
+
+    Returns
+    -------
+    factorised : ``FactorisedWordifications``.
+        Templates and hash classes which expand to exactly
+        ``all_wordifications(number, ...)``.
+    """
+    validate(number)
+    if number == "":
+        return FactorisedWordifications([], {})
+
+    vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
+    vocabulary_map: Dict[str, List[str]] = compute_vocab_map(vocab, letter_map)
+
+    return compute_factorised_wordifications(number, numformat, vocabulary_map, limits)
+
+
+def compute_factorised_wordifications(
+    number: str,
+    numformat: str,
+    vocabulary_map: Mapping[str, Sequence[str]],
+    limits: Optional[Limits] = None,
+    hash_lengths: Optional[Sequence[int]] = None,
+    hash_lattice: Optional[List[List[Tuple[str, int]]]] = None,
+) -> FactorisedWordifications:
+    """
+    Factorises the phonewords of the nonempty ``number`` given a precomputed
+    ``vocabulary_map``, as returned by ``compute_vocab_map()``. See
+    ``factorised_wordifications()``.
+
+    A ``hash_lattice`` of ``number`` built by the caller, e.g. by
+    ``compute_integer_lattice()`` over an ``IntegerPlaceholderMap``, is used instead
+    of building one.
+    """
+    # Format inference.
+    if numformat == "":
+        numformat = infer_format(number)
+
+    country_code, base_number = get_country_code_and_base(number)
+
+    # A lattice over hashes rather than words. A hash is determined by where it
+    # starts and how long it is, so a run of placeholder letters identifies it.
+    if hash_lattice is None:
+        placeholder_map = PlaceholderMap(vocabulary_map)
+        hash_lattice = compute_token_lattice(base_number, placeholder_map, hash_lengths)
+
+    budget = Budget(limits)
+    templates: List[str] = []
+    classes: Dict[str, Sequence[str]] = {}
+    try:
+        for path in iter_lattice_paths(hash_lattice):
+            budget.charge(len(path))
+            budget.check_results(len(templates) + 1)
+            position = 0
+            tokens: List[str] = []
+            slots: List[str] = []
+            for index in path:
+                token, end = hash_lattice[position][index]
+                if token.isalpha():
+                    wordhash = base_number[position:end]
+                    if wordhash not in classes:
+                        classes[wordhash] = sorted(vocabulary_map[wordhash])
+                    slots.append("{%s}" % wordhash)
+                tokens.append(token)
+                position = end
+            rendered = assemble_phoneword(country_code, tokens, numformat)
+            slot_iterator = iter(slots)
+            templates.append(
+                re.sub("%s+" % PLACEHOLDER, lambda _: next(slot_iterator), rendered)
+            )
+    except LimitExceeded as error:
+        partial = FactorisedWordifications(templates, classes)
+        error.partial = budget.collect_partial(partial, str)
+        raise
+
+    return FactorisedWordifications(templates, classes)
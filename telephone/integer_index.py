@@ -0,0 +1,228 @@
+""" Integer-encoded word hashes and rolling-hash matching against phone numbers. """
+from typing import Set, Dict, List, Tuple, Mapping, Sequence, Optional
+
+from telephone.utils import get_country_code_and_base, infer_format, insert_dashes
+from telephone.limits import Limits, Budget, LimitExceeded
+
+# pylint: disable=bad-continuation, too-many-locals
+
+ZERO = ord("0")
+
+
+def encode_digits(digits: str) -> int:
+    """
+    Packs a digit string into an integer, keeping its length and leading zeros by
+    prefixing a ``1``, e.g. ``"007" -> 1007``. Matches the rolling code built by
+    ``compute_integer_lattice()``.
+    """
+    return int("1" + digits)
+
+
+def compute_integer_vocab_map(
+    vocab_map: Mapping[str, Sequence[str]]
+) -> Dict[int, Tuple[str, ...]]:
+    """
+    Re-keys a vocab map, as returned by ``compute_vocab_map()``, by
+    ``encode_digits()`` of each hash. Words in each class are sorted.
+    """
+    return {
+        encode_digits(wordhash): tuple(sorted(words))
+        for wordhash, words in vocab_map.items()
+    }
+
+
+def compute_integer_lattice(
+    base_number: str, integer_map: Mapping[int, Sequence[str]], max_hash_length: int
+) -> List[List[Tuple[str, int]]]:
+    """
+    Builds the same lattice as ``compute_token_lattice()`` without slicing any
+    substrings: the code of ``base_number[i:j]`` is rolled forward one digit at a time
+    as ``code * 10 + digit`` and looked up directly in ``integer_map``.
+
+    Parameters
+    ----------
+    base_number : ``str``.
+        A phone number without its country code. ASCII digits only.
+    integer_map : ``Mapping[int, Sequence[str]]``.
+        As returned by ``compute_integer_vocab_map()``.
+    max_hash_length : ``int``.
+        Length of the longest hash in ``integer_map``.
+
+    Returns
+    -------
+    lattice : ``List[List[Tuple[str, int]]]``.
+        As for ``compute_token_lattice()``.
+    """
+    digits = base_number.encode("ascii")
+    size = len(digits)
+    lattice: List[List[Tuple[str, int]]] = []
+    for i in range(size):
+        options: List[Tuple[str, int]] = []
+        code = 1
+        for j in range(i, min(size, i + max_hash_length)):
+            code = code * 10 + digits[j] - ZERO
+            words = integer_map.get(code)
+            if words is not None:
+                options.extend([(word, j + 1) for word in words])
+        options.sort()
+        lattice.append([(base_number[i], i + 1)] + options)
+    return lattice
+
+
+def compute_wordifications_by_lattice(
+    number: str,
+    numformat: str,
+    integer_map: Mapping[int, Sequence[str]],
+    max_hash_length: int,
+    limits: Optional[Limits] = None,
+) -> Set[str]:
+    """
+    Generates all phonewords of the nonempty ``number``, as
+    ``compute_wordifications()`` does, but driven by the integer lattice and
+    rendered by ``compute_lattice_wordifications()``.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid, nonempty US phone number with country code and dashes.
+    numformat : ``str``.
+        Format of the number using "0" and "-". Inferred from ``number`` if empty.
+    integer_map : ``Mapping[int, Sequence[str]]``.
+        As returned by ``compute_integer_vocab_map()``.
+    max_hash_length : ``int``.
+        Length of the longest hash in ``integer_map``.
+    limits : ``Optional[Limits]``.
+        Bounds on results, intermediate states, time and cancellation.
+
+    Returns
+    -------
+    phonewords : ``Set[str]``.
+        As for ``all_wordifications()``.
+    """
+    # Format inference.
+    if numformat == "":
+        numformat = infer_format(number)
+
+    country_code, base_number = get_country_code_and_base(number)
+    lattice = compute_integer_lattice(base_number, integer_map, max_hash_length)
+    return compute_lattice_wordifications(
+        country_code, base_number, numformat, lattice, max_hash_length, Budget(limits)
+    )
+
+
+def compute_lattice_wordifications(
+    country_code: str,
+    base_number: str,
+    numformat: str,
+    lattice: List[List[Tuple[str, int]]],
+    reach: int,
+    budget: Budget,
+) -> Set[str]:
+    """
+    Renders every path through a token lattice of ``base_number`` as a phoneword.
+    Each suffix list is built once from the lists it extends, and released as soon
+    as no later index can reach it.
+
+    Parameters
+    ----------
+    country_code : ``str``.
+        The country code of the number.
+    base_number : ``str``.
+        The number without its country code or dashes.
+    numformat : ``str``.
+        Format of the number using "0" and "-".
+    lattice : ``List[List[Tuple[str, int]]]``.
+        As returned by ``compute_token_lattice()``.
+    reach : ``int``.
+        Length of the longest word in ``lattice``, or any larger bound.
+    budget : ``Budget``.
+        Tracks the call's limits. May be shared by several lattices of one call.
+
+    Returns
+    -------
+    phonewords : ``Set[str]``.
+        As for ``all_wordifications()``.
+    """
+    spacer = "&"
+    size = len(base_number)
+    reach = max(reach, 1)
+
+    # Entry ``i`` holds (phoneword of ``base_number[i:]``, whether it starts with a
+    # word) pairs, or ``None`` once released.
+    suffixes: List[Optional[List[Tuple[str, bool]]]] = [None] * size + [[("", False)]]
+    current: List[Tuple[str, bool]] = [("", False)]
+    i = size
+    try:
+        for i in range(size - 1, -1, -1):
+            current = []
+            for option, (token, end) in enumerate(lattice[i]):
+                is_word = option > 0
+                following = suffixes[end]
+                assert following is not None
+                if is_word:
+                    for suffix, starts_with_word in following:
+                        if starts_with_word:
+                            current.append((token + spacer + suffix, True))
+                        else:
+                            current.append((token + suffix, True))
+                else:
+                    current.extend([(token + suffix, False) for suffix, _ in following])
+                budget.charge(len(following))
+                budget.check_results(len(current))
+            suffixes[i] = current
+            if i + reach <= size:
+                suffixes[i + reach] = None
+    except LimitExceeded as error:
+        prefix = country_code + spacer + base_number[:i]
+        error.partial = budget.collect_partial(
+            current, lambda item: insert_dashes(prefix + item[0], spacer, numformat)
+        )
+        raise
+
+    prefix = country_code + spacer
+    return {insert_dashes(prefix + suffix, spacer, numformat) for suffix, _ in current}
+
+
+def compute_number_to_words_by_lattice(
+    number: str,
+    numformat: str,
+    integer_map: Mapping[int, Sequence[str]],
+    max_hash_length: int,
+    limits: Optional[Limits] = None,
+) -> str:
+    """
+    As ``compute_number_to_words()``, matching by rolling integer codes rather than
+    substring slices: the longest word at the earliest index, ties broken
+    alphabetically.
+    """
+    # Format inference.
+    if numformat == "":
+        numformat = infer_format(number)
+
+    spacer = "&"
+    country_code, base_number = get_country_code_and_base(number)
+    digits = base_number.encode("ascii")
+    size = len(digits)
+    phoneword = base_number
+    budget = Budget(limits)
+    try:
+        for i in range(size):
+            budget.charge()
+            code = 1
+            best: Optional[Tuple[str, int]] = None
+            for j in range(i, min(size, i + max_hash_length)):
+                code = code * 10 + digits[j] - ZERO
+                words = integer_map.get(code)
+                if words is not None:
+                    best = (words[0], j + 1)
+            if best is not None:
+                word, end = best
+                phoneword = base_number[:i] + word + base_number[end:]
+                break
+    except LimitExceeded as error:
+        error.partial = {
+            insert_dashes(country_code + spacer + phoneword, spacer, numformat)
+        }
+        raise
+
+    return insert_dashes(country_code + spacer + phoneword, spacer, numformat)
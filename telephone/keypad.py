@@ -0,0 +1,146 @@
+""" A precompiled telephone keypad layout. """
+import os
+import json
+import hashlib
+import functools
+from types import MappingProxyType
+from typing import Any, Dict, List, Tuple, Mapping, Optional, FrozenSet, Union
+
+# pylint: disable=bad-continuation
+
+MAPPING_PATH = os.path.join(os.path.dirname(__file__), "settings", "mapping.json")
+DIGITS = "0123456789"
+
+
+class Frozen:
+    """ Base for objects whose attributes may only be set during ``__init__()``. """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def _freeze(self, **attributes: Any) -> None:
+        """ Sets ``attributes`` once, bypassing the immutability guard. """
+        for name, value in attributes.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("'%s' is read-only." % type(self).__name__)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("'%s' is read-only." % type(self).__name__)
+
+
+class Keypad(Frozen):
+    """
+    An immutable layout mapping letters to keypad digits.
+
+    All of the tables needed for hashing words are built once on construction, so
+    translating a word is a single call to ``str.translate()``. Attributes cannot be
+    rebound, so instances may be shared freely between threads.
+
+    Parameters
+    ----------
+    letter_map : ``Mapping[str, str]``.
+        Maps uppercase letters to single digits.
+
+    Raises
+    ------
+    ValueError.
+        If a key is not a single uppercase letter or a value is not a single digit.
+    """
+
+    __slots__ = ("letter_map", "digit_map", "fingerprint", "table", "mask")
+
+    letter_map: Mapping[str, str]
+    digit_map: Mapping[str, str]
+    fingerprint: str
+    table: Mapping[int, str]
+    mask: Mapping[int, Optional[int]]
+
+    def __init__(self, letter_map: Mapping[str, str]) -> None:
+        for letter, digit in letter_map.items():
+            if len(letter) != 1 or not letter.isalpha() or not letter.isupper():
+                raise ValueError(
+                    "Key '%s' of letter map must be an uppercase letter." % letter
+                )
+            if len(digit) != 1 or digit not in DIGITS:
+                raise ValueError(
+                    "Value '%s' for key '%s' must be a digit." % (digit, letter)
+                )
+
+        # Maps both cases of each letter to its digit.
+        translations: Dict[str, str] = {}
+        for letter, digit in letter_map.items():
+            translations[letter] = digit
+            translations[letter.lower()] = digit
+
+        # Inverse map from digits to the (sorted) letters which hash to them.
+        digit_map: Dict[str, List[str]] = {}
+        for letter in sorted(letter_map):
+            digit_map.setdefault(letter_map[letter], []).append(letter)
+
+        canonical = json.dumps(sorted(letter_map.items()), separators=(",", ":"))
+
+        self._freeze(
+            letter_map=MappingProxyType(dict(letter_map)),
+            digit_map=MappingProxyType(
+                {digit: "".join(letters) for digit, letters in digit_map.items()}
+            ),
+            fingerprint=hashlib.sha256(canonical.encode()).hexdigest(),
+            table=MappingProxyType(str.maketrans(translations)),
+            mask=MappingProxyType(str.maketrans("", "", "".join(translations))),
+        )
+
+    @classmethod
+    def from_json(cls, path: str = MAPPING_PATH) -> "Keypad":
+        """ Loads a layout from a JSON object mapping letters to digits. """
+        with open(path, "r") as mapping_file:
+            return cls(json.load(mapping_file))
+
+    def translate(self, word: str) -> str:
+        """
+        Hashes ``word`` to digits. Characters outside the layout are left untouched,
+        so callers should check ``unmapped()`` first if ``word`` is untrusted.
+        """
+        return word.translate(self.table)
+
+    def unmapped(self, word: str) -> str:
+        """ Returns the characters of ``word`` which have no digit in this layout. """
+        return word.translate(self.mask)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Keypad):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint)
+
+    def __repr__(self) -> str:
+        return "Keypad(%s)" % self.fingerprint[:12]
+
+
+LetterMap = Union[Mapping[str, str], Keypad]
+
+
+@functools.lru_cache(maxsize=64)
+def compile_keypad(items: FrozenSet[Tuple[str, str]]) -> Keypad:
+    """ Compiles a layout given as the items of a letter map, caching the result. """
+    return Keypad(dict(items))
+
+
+def as_keypad(letter_map: LetterMap) -> Keypad:
+    """
+    Returns ``letter_map`` compiled to a ``Keypad`` if it isn't one already. Dicts
+    are compiled once per distinct layout, so passing the same one on every call is
+    cheap.
+    """
+    if isinstance(letter_map, Keypad):
+        return letter_map
+    try:
+        items = frozenset(letter_map.items())
+    except TypeError:
+        return Keypad(letter_map)
+    return compile_keypad(items)
+
+
+US_KEYPAD = Keypad.from_json()
@@ -0,0 +1,159 @@
+""" Resource limits and cooperative cancellation for wordification. """
+import time
+import threading
+from typing import Set, TypeVar, Callable, Iterable, Optional
+
+# pylint: disable=bad-continuation, too-few-public-methods, too-many-arguments
+
+T = TypeVar("T")
+
+
+class CancellationToken:
+    """ A flag which a caller sets to stop a running computation at its next check. """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """ Requests cancellation. Safe to call from any thread, more than once. """
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """ Whether ``cancel()`` has been called. """
+        return self._event.is_set()
+
+
+class LimitExceeded(RuntimeError):
+    """
+    Raised when a computation hits one of its ``Limits``.
+
+    Attributes
+    ----------
+    reason : ``str``.
+        One of ``"max_results"``, ``"max_states"``, ``"deadline"`` or ``"cancelled"``.
+    partial : ``Set[str]``.
+        Valid phonewords found before stopping. Always a subset of the full result,
+        and never larger than ``max_results`` or ``Budget.PARTIAL_LIMIT``.
+    """
+
+    def __init__(self, reason: str, partial: Optional[Set[str]] = None) -> None:
+        super().__init__("Wordification stopped early: %s." % reason)
+        self.reason = reason
+        self.partial: Set[str] = set() if partial is None else partial
+        self.truncated = True
+
+
+class Limits:
+    """
+    Bounds on the work a single call may do. All limits default to ``None``, meaning
+    unlimited.
+
+    Parameters
+    ----------
+    max_results : ``Optional[int]``.
+        Maximum number of phonewords a call may return.
+    max_states : ``Optional[int]``.
+        Maximum number of intermediate partial phonewords a call may build.
+    timeout : ``Optional[float]``.
+        Seconds after the call starts at which to give up.
+    deadline : ``Optional[float]``.
+        Absolute ``time.monotonic()`` value at which to give up.
+    cancel : ``Optional[CancellationToken]``.
+        Token checked periodically for cancellation.
+    """
+
+    __slots__ = ("max_results", "max_states", "timeout", "deadline", "cancel")
+
+    def __init__(
+        self,
+        max_results: Optional[int] = None,
+        max_states: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+    ) -> None:
+        self.max_results = max_results
+        self.max_states = max_states
+        self.timeout = timeout
+        self.deadline = deadline
+        self.cancel = cancel
+
+
+class Budget:
+    """
+    Tracks the usage of one call against its ``Limits``. Charging states is an
+    integer add and compare; the clock and cancellation token are only consulted every
+    ``CHECK_INTERVAL`` states.
+    """
+
+    CHECK_INTERVAL = 1024
+
+    # Most phonewords, and most seconds, spent rendering ``LimitExceeded.partial``.
+    PARTIAL_LIMIT = 1024
+    PARTIAL_SECONDS = 0.005
+
+    def __init__(self, limits: Optional[Limits] = None) -> None:
+        limits = Limits() if limits is None else limits
+        deadline = limits.deadline
+        if limits.timeout is not None:
+            timeout_deadline = time.monotonic() + limits.timeout
+            if deadline is None or timeout_deadline < deadline:
+                deadline = timeout_deadline
+        self.max_results = limits.max_results
+        self.max_states = limits.max_states
+        self.deadline = deadline
+        self.cancel = limits.cancel
+        self.states = 0
+        self._watched = deadline is not None or limits.cancel is not None
+        self._next_check = 0
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """ Sets the state count at which ``charge()`` next does a full check. """
+        next_check = self.states + self.CHECK_INTERVAL if self._watched else -1
+        if self.max_states is not None:
+            bound = self.max_states + 1
+            next_check = bound if next_check == -1 else min(next_check, bound)
+        self._next_check = next_check
+
+    def charge(self, states: int = 1) -> None:
+        """ Records ``states`` units of work, raising ``LimitExceeded`` if over. """
+        self.states += states
+        if 0 <= self._next_check <= self.states:
+            self.check()
+            self._schedule()
+
+    def check(self) -> None:
+        """ Checks every limit except ``max_results`` now. """
+        if self.max_states is not None and self.states > self.max_states:
+            raise LimitExceeded("max_states")
+        if self.cancel is not None and self.cancel.cancelled:
+            raise LimitExceeded("cancelled")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise LimitExceeded("deadline")
+
+    def check_results(self, count: int) -> None:
+        """ Raises ``LimitExceeded`` if ``count`` results is too many. """
+        if self.max_results is not None and count > self.max_results:
+            raise LimitExceeded("max_results")
+
+    def collect_partial(
+        self, items: Iterable[T], render: Callable[[T], str]
+    ) -> Set[str]:
+        """
+        Renders a bounded sample of ``items`` for ``LimitExceeded.partial``: at most
+        ``max_results`` or ``PARTIAL_LIMIT`` of them, whichever is fewer, stopping
+        early after ``PARTIAL_SECONDS`` so that a call past its deadline returns
+        promptly.
+        """
+        limit = self.PARTIAL_LIMIT
+        if self.max_results is not None:
+            limit = min(limit, self.max_results)
+        stop = time.monotonic() + self.PARTIAL_SECONDS
+        partial: Set[str] = set()
+        for count, item in enumerate(items):
+            if count >= limit or (count % 64 == 63 and time.monotonic() >= stop):
+                break
+            partial.add(render(item))
+        return partial
@@ -0,0 +1,199 @@
+""" Wordification for several keypad layouts at once over a shared letter trie. """
+from typing import Set, Dict, List, Tuple, Mapping, Iterable, Optional
+
+from telephone.utils import (
+    validate,
+    get_vocabulary,
+    get_country_code_and_base,
+    infer_format,
+)
+from telephone.keypad import Keypad, LetterMap, as_keypad
+from telephone.limits import Limits, Budget
+from telephone.integer_index import compute_lattice_wordifications
+
+# pylint: disable=bad-continuation, too-many-locals, too-few-public-methods
+
+
+class LetterTrie:
+    """
+    A trie over the uppercase letters of a vocabulary, independent of any keypad.
+    Projecting it onto a set of layouts with ``project()`` lets one walk match words
+    for all of them.
+
+    Parameters
+    ----------
+    vocabulary : ``Iterable[str]``.
+        Alphabetical-only vocabulary words, in any case.
+
+    Raises
+    ------
+    ValueError.
+        If a word contains non-alpha characters.
+    """
+
+    __slots__ = ("children", "word", "depth")
+
+    def __init__(self, vocabulary: Iterable[str] = ()) -> None:
+        self.children: Dict[str, LetterTrie] = {}
+        self.word: Optional[str] = None
+        self.depth = 0
+        for token in vocabulary:
+            if not token.isalpha():
+                raise ValueError(
+                    "Vocabulary word '%s' contains non-alpha chars." % token
+                )
+            self.insert(token.upper())
+
+    def insert(self, word: str) -> None:
+        """ Adds the uppercase ``word`` below this node. """
+        node = self
+        self.depth = max(self.depth, len(word))
+        for letter in word:
+            child = node.children.get(letter)
+            if child is None:
+                child = node.children[letter] = LetterTrie()
+            node = child
+        node.word = word
+
+    def project(self, layouts: Iterable[LetterMap]) -> "ProjectedTrie":
+        """ Pairs the trie with the letter tables of ``layouts``. """
+        return ProjectedTrie(self, [as_keypad(layout) for layout in layouts])
+
+
+class ProjectedTrie:
+    """
+    A ``LetterTrie`` seen through several keypads. Layout ``k`` is bit ``1 << k`` of a
+    layout mask, and ``masks[letter][digit]`` is the mask of the layouts which send
+    ``letter`` to ``digit``, so a letter absent from a layout matches no digit there.
+
+    Parameters
+    ----------
+    trie : ``LetterTrie``.
+        The vocabulary.
+    keypads : ``List[Keypad]``.
+        The layouts, in bit order.
+    """
+
+    __slots__ = ("trie", "keypads", "masks", "all_layouts")
+
+    def __init__(self, trie: LetterTrie, keypads: List[Keypad]) -> None:
+        masks: Dict[str, Dict[str, int]] = {}
+        for bit, keypad in enumerate(keypads):
+            for letter, digit in keypad.letter_map.items():
+                by_digit = masks.setdefault(letter, {})
+                by_digit[digit] = by_digit.get(digit, 0) | (1 << bit)
+        self.trie = trie
+        self.keypads = keypads
+        self.masks = masks
+        self.all_layouts = (1 << len(keypads)) - 1
+
+    def compute_lattices(self, base_number: str) -> List[List[List[Tuple[str, int]]]]:
+        """
+        Builds the token lattice of ``base_number`` for every layout in one walk of
+        the trie from each index. A trie node is followed at most once per index, with
+        the mask of the layouts still consistent with the digits read so far.
+
+        Returns
+        -------
+        lattices : ``List[List[List[Tuple[str, int]]]]``.
+            One lattice per keypad, each as returned by ``compute_token_lattice()``.
+        """
+        size = len(base_number)
+        count = len(self.keypads)
+        lattices: List[List[List[Tuple[str, int]]]] = [[] for _ in range(count)]
+        for i in range(size):
+            options: List[List[Tuple[str, int]]] = [[] for _ in range(count)]
+            frontier: List[Tuple[LetterTrie, int]] = [(self.trie, self.all_layouts)]
+            for j in range(i, min(size, i + self.trie.depth)):
+                digit = base_number[j]
+                advanced: List[Tuple[LetterTrie, int]] = []
+                for node, mask in frontier:
+                    for letter, child in node.children.items():
+                        child_mask = mask & self.masks.get(letter, {}).get(digit, 0)
+                        if not child_mask:
+                            continue
+                        advanced.append((child, child_mask))
+                        if child.word is not None:
+                            for bit in range(count):
+                                if child_mask >> bit & 1:
+                                    options[bit].append((child.word, j + 1))
+                if not advanced:
+                    break
+                frontier = advanced
+            for bit in range(count):
+                options[bit].sort()
+                lattices[bit].append([(base_number[i], i + 1)] + options[bit])
+        return lattices
+
+
+def multi_layout_wordifications(
+    number: str,
+    layouts: Mapping[str, LetterMap],
+    numformat: str = "",
+    vocabulary: Optional[Set[str]] = None,
+    limits: Optional[Limits] = None,
+) -> Dict[str, Set[str]]:
+    """
+    Generates all phonewords of ``number`` under each of several keypad layouts,
+    matching words for all of them in a single pass over the number.
+
+    Unlike ``compute_vocab_map()``, a word with letters missing from a layout is not
+    an error; it is simply never matched under that layout. This is what legacy
+    layouts without Q and Z need.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    layouts : ``Mapping[str, LetterMap]``.
+        Named layouts, each mapping uppercase English letters to digits, or a
+        precompiled ``Keypad``.
+    numformat : ``str``.
+        Format of the number using "0" and "-", e.g. "0-000-000-0000" for US numbers.
+    vocabulary : ``Optional[Set[str]]``.
+        Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
+        and use a default US vocabulary.
+    limits : ``Optional[Limits]``.
+        Bounds on results, states, time and cancellation. ``max_results`` bounds
+        the phonewords of each layout; the others bound the call as a whole.
+
+    Returns
+    -------
+    phonewords : ``Dict[str, Set[str]]``.
+        For each layout name, the phonewords of ``number`` under that layout.
+    """
+    validate(number)
+    if number == "":
+        return {name: set() for name in layouts}
+
+    vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
+    trie = LetterTrie(vocab)
+    names = list(layouts)
+    projected = trie.project([layouts[name] for name in names])
+    results = compute_multi_layout_wordifications(number, numformat, projected, limits)
+    return dict(zip(names, results))
+
+
+def compute_multi_layout_wordifications(
+    number: str,
+    numformat: str,
+    projected: ProjectedTrie,
+    limits: Optional[Limits] = None,
+) -> List[Set[str]]:
+    """
+    Generates the phonewords of the nonempty ``number`` for each keypad of
+    ``projected``, in order. See ``multi_layout_wordifications()``.
+    """
+    # Format inference.
+    if numformat == "":
+        numformat = infer_format(number)
+
+    # One budget for every layout, so the timeout is a single absolute deadline.
+    country_code, base_number = get_country_code_and_base(number)
+    budget = Budget(limits)
+    return [
+        compute_lattice_wordifications(
+            country_code, base_number, numformat, lattice, projected.trie.depth, budget
+        )
+        for lattice in projected.compute_lattices(base_number)
+    ]
@@ -0,0 +1,115 @@
+""" Batch normalisation and validation of raw phone numbers. """
+import enum
+from typing import Dict, List, Tuple, Iterable, NamedTuple
+
+from telephone.utils import FUNCTION_SEQUENCES, STRIP_FUNCTION_TABLE, FORMAT_TABLE
+
+# pylint: disable=bad-continuation
+
+DIGIT_DELETION_TABLE = str.maketrans("", "", "0123456789")
+
+
+class NumberError(enum.IntEnum):
+    """ Per-row outcome codes of ``normalize_numbers()``. """
+
+    OK = 0
+    EMPTY = 1
+    INVALID_CHARACTERS = 2
+    INVALID_SEQUENCE = 3
+    MISSING_BASE = 4
+
+
+class NormalizedNumbers(NamedTuple):
+    """
+    Column-oriented output of ``normalize_numbers()``.
+
+    The first four columns are aligned with each other and hold one entry per
+    distinct valid number, in order of first appearance. ``rows`` and ``errors`` are
+    aligned with the input.
+
+    Attributes
+    ----------
+    numbers : ``List[str]``.
+        Distinct valid numbers, stripped of surrounding whitespace.
+    country_codes : ``List[str]``.
+        The country code of each number.
+    base_numbers : ``List[str]``.
+        Each number without its country code or dashes.
+    numformats : ``List[str]``.
+        The inferred format of each number, e.g. ``0-000-000-0000``.
+    rows : ``List[int]``.
+        For each input, its index into the columns above, or ``-1`` if invalid.
+    errors : ``List[NumberError]``.
+        For each input, why it was rejected, or ``NumberError.OK``.
+    """
+
+    numbers: List[str]
+    country_codes: List[str]
+    base_numbers: List[str]
+    numformats: List[str]
+    rows: List[int]
+    errors: List[NumberError]
+
+
+def classify_number(number: str) -> NumberError:
+    """
+    Applies the checks of ``validate()`` to a stripped number without raising. Unlike
+    ``validate()`` this only accepts ASCII digits, and rejects empty numbers and
+    numbers without a base after the country code.
+    """
+    if number == "":
+        return NumberError.EMPTY
+    if number.translate(STRIP_FUNCTION_TABLE).translate(DIGIT_DELETION_TABLE):
+        return NumberError.INVALID_CHARACTERS
+    for fn_str in FUNCTION_SEQUENCES:
+        if fn_str in number:
+            return NumberError.INVALID_SEQUENCE
+    if number.startswith("-") or number.endswith("-") or "-" not in number:
+        return NumberError.MISSING_BASE
+    return NumberError.OK
+
+
+def normalize_numbers(raw_numbers: Iterable[str]) -> NormalizedNumbers:
+    """
+    Validates, splits, infers formats for and deduplicates ``raw_numbers`` in one
+    pass, so that ingest pipelines can feed only the distinct valid numbers to
+    ``all_wordifications()`` or ``number_to_words()`` and map the results back to
+    their rows.
+
+    Each distinct raw string is classified once; every step is a C-level string
+    method call, with no regular expressions or per-character Python loops.
+
+    Parameters
+    ----------
+    raw_numbers : ``Iterable[str]``.
+        Candidate phone numbers with country code and dashes. Surrounding whitespace
+        is ignored.
+
+    Returns
+    -------
+    normalized : ``NormalizedNumbers``.
+        Columns of distinct valid numbers plus per-row indices and error codes.
+    """
+    normalized = NormalizedNumbers([], [], [], [], [], [])
+    seen: Dict[str, Tuple[int, NumberError]] = {}
+    for raw_number in raw_numbers:
+        outcome = seen.get(raw_number)
+        if outcome is None:
+            number = raw_number.strip()
+            outcome = seen.get(number)
+            if outcome is None:
+                error = classify_number(number)
+                row = -1
+                if error is NumberError.OK:
+                    row = len(normalized.numbers)
+                    country_code, _, rest = number.partition("-")
+                    normalized.numbers.append(number)
+                    normalized.country_codes.append(country_code)
+                    normalized.base_numbers.append(rest.replace("-", ""))
+                    normalized.numformats.append(number.translate(FORMAT_TABLE))
+                outcome = (row, error)
+                seen[number] = outcome
+            seen[raw_number] = outcome
+        normalized.rows.append(outcome[0])
+        normalized.errors.append(outcome[1])
+    return normalized
@@ -1,24 +1,30 @@
 """ A function to generate phonewords. """
-import re
-from typing import Set, List, Dict, Optional
+import itertools
+from typing import Set, List, Dict, Mapping, Sequence, Optional
 
 from telephone.utils import (
     validate,
     insert_dashes,
     get_country_code_and_base,
+    infer_format,
     get_substring_length_map,
     get_vocabulary,
 )
-from telephone.tests.test_constants import US_LETTER_MAP
+from telephone.keypad import LetterMap, US_KEYPAD, as_keypad
+from telephone.limits import Limits, Budget, LimitExceeded
 
 # pylint: disable=bad-continuation
 
+# Vocabulary words tried between charges to the budget.
+CHARGE_BATCH = 256
+
 
 def number_to_words(
     number: str,
     numformat: str = "",
     vocabulary: Optional[Set[str]] = None,
-    letter_map: Dict[str, str] = US_LETTER_MAP,
+    letter_map: LetterMap = US_KEYPAD,
+    limits: Optional[Limits] = None,
 ) -> str:
     """
     Generates a phoneword from ``number`` using words from ``vocabulary``.
@@ -32,33 +38,116 @@ def number_to_words(
     vocabulary : ``Optional[Set[str]]``.
         Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
         and use a default US vocabulary.
-    letter_map : ``Dict[str, str]``.
-        Maps uppercase English letters to digits.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    limits : ``Optional[Limits]``.
+        Bounds on time and cancellation. Each vocabulary word tried counts as a state.
+
+    Raises
+    ------
+    LimitExceeded.
+        If any of ``limits`` is hit. Its ``partial`` attribute holds the phoneword
+        found so far.
     """
     validate(number)
     if number == "":
         return ""
 
     vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
+    keypad = as_keypad(letter_map)
 
     # Format inference.
     if numformat == "":
-        numformat = re.sub(r"[0-9]", "0", number)
+        numformat = infer_format(number)
 
     spacer = "&"
     country_code, base_number = get_country_code_and_base(number)
     substring_length_map: Dict[int, List[str]] = get_substring_length_map(base_number)
     phoneword = base_number
 
-    for token in vocab:
-        uppercased_token = token.upper()
-        token_len = len(uppercased_token)
-        if token_len in substring_length_map:
-            tokenhash = "".join([letter_map[char] for char in uppercased_token])
-            for substr in substring_length_map[token_len]:
-                if substr == tokenhash:
-                    phoneword = base_number.replace(substr, uppercased_token, 1)
-                    break
+    # The budget is charged per batch of words to keep the loop free of calls.
+    table = keypad.table
+    budget = Budget(limits)
+    tokens = iter(vocab)
+    try:
+        while True:
+            batch = list(itertools.islice(tokens, CHARGE_BATCH))
+            if not batch:
+                break
+            budget.charge(len(batch))
+            for token in batch:
+                substrings = substring_length_map.get(len(token))
+                if substrings is None:
+                    continue
+
+                # Untranslated characters survive ``translate()`` as non-digits.
+                tokenhash = token.translate(table)
+                if not (tokenhash.isdigit() and token.isalpha()):
+                    raise ValueError(
+                        "Vocabulary word '%s' contains letters outside of the keypad."
+                        % token
+                    )
+                if tokenhash in substrings:
+                    phoneword = base_number.replace(tokenhash, token.upper(), 1)
+    except LimitExceeded as error:
+        error.partial = {
+            insert_dashes(country_code + spacer + phoneword, spacer, numformat)
+        }
+        raise
     phoneword = insert_dashes(country_code + spacer + phoneword, spacer, numformat)
 
     return phoneword
+
+
+def compute_number_to_words(
+    number: str,
+    numformat: str,
+    vocabulary_map: Mapping[str, Sequence[str]],
+    hash_lengths: Sequence[int],
+    limits: Optional[Limits] = None,
+) -> str:
+    """
+    Generates a phoneword from the nonempty ``number`` given a precomputed
+    ``vocabulary_map``, as returned by ``compute_vocab_map()``. Like
+    ``number_to_words()`` this makes a single substitution, but the choice is
+    deterministic: the longest word at the earliest index, ties broken alphabetically.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid, nonempty US phone number with country code and dashes.
+    numformat : ``str``.
+        Format of the number using "0" and "-". Inferred from ``number`` if empty.
+    vocabulary_map : ``Mapping[str, Sequence[str]]``.
+        Maps digit hashes to the uppercase words which hash to them.
+    hash_lengths : ``Sequence[int]``.
+        The sorted, distinct lengths of the keys of ``vocabulary_map``.
+    limits : ``Optional[Limits]``.
+        Bounds on time and cancellation. Each index scanned counts as a state.
+    """
+    # Format inference.
+    if numformat == "":
+        numformat = infer_format(number)
+
+    spacer = "&"
+    country_code, base_number = get_country_code_and_base(number)
+    phoneword = base_number
+    budget = Budget(limits)
+    try:
+        for i in range(len(base_number)):
+            budget.charge()
+            for length in reversed(hash_lengths):
+                substr = base_number[i : i + length]
+                if len(substr) == length and substr in vocabulary_map:
+                    word = min(vocabulary_map[substr])
+                    phoneword = base_number[:i] + word + base_number[i + length :]
+                    break
+            if phoneword != base_number:
+                break
+    except LimitExceeded as error:
+        error.partial = {
+            insert_dashes(country_code + spacer + phoneword, spacer, numformat)
+        }
+        raise
+
+    return insert_dashes(country_code + spacer + phoneword, spacer, numformat)
@@ -0,0 +1,156 @@
+""" Paginated, resumable enumeration of the phonewords of a number. """
+import json
+import base64
+import hashlib
+import binascii
+from typing import Set, Dict, List, Tuple, Mapping, Sequence, Optional
+
+from telephone.utils import (
+    validate,
+    get_vocabulary,
+    compute_vocab_map,
+    get_country_code_and_base,
+    infer_format,
+    compute_token_lattice,
+    iter_lattice_paths,
+    assemble_phoneword,
+)
+from telephone.keypad import LetterMap, US_KEYPAD
+from telephone.limits import Limits, Budget, LimitExceeded
+
+# pylint: disable=bad-continuation, too-many-arguments
+
+
+def page_wordifications(
+    number: str,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    numformat: str = "",
+    vocabulary: Optional[Set[str]] = None,
+    letter_map: LetterMap = US_KEYPAD,
+    limits: Optional[Limits] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """
+    Returns one page of the phonewords of ``number`` in a deterministic order.
+
+    Results are ordered lexicographically by their sequence of tokens, where each
+    token is a single digit or a vocabulary word and digits sort before words. The
+    union of all pages is exactly ``all_wordifications(number, ...)``.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    cursor : ``Optional[str]``.
+        The opaque cursor returned with the previous page, or ``None`` for the first.
+    limit : ``int``.
+        Maximum number of phonewords to return.
+    numformat : ``str``.
+        Format of the number using "0" and "-", e.g. "0-000-000-0000" for US numbers.
+    vocabulary : ``Optional[Set[str]]``.
+        Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
+        and use a default US vocabulary.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    limits : ``Optional[Limits]``.
+        Bounds on results, states, time and cancellation. Each token visited counts
+        as a state.
+
+    Returns
+    -------
+    page : ``Tuple[List[str], Optional[str]]``.
+        The phonewords on this page and a cursor for the next one, which is ``None``
+        once the enumeration is exhausted.
+
+    Raises
+    ------
+    ValueError.
+        If ``limit`` is not positive, or ``cursor`` is malformed or was issued for a
+        different number, vocabulary or letter map.
+    LimitExceeded.
+        If any of ``limits`` is hit. Its ``partial`` attribute holds phonewords of
+        this page found so far, at most ``Budget.PARTIAL_LIMIT`` of them.
+    """
+    validate(number)
+    if limit < 1:
+        raise ValueError("Page limit must be positive, got '%d'." % limit)
+    if number == "":
+        return [], None
+
+    vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
+    vocabulary_map: Dict[str, List[str]] = compute_vocab_map(vocab, letter_map)
+
+    return compute_page_wordifications(
+        number, cursor, limit, numformat, vocabulary_map, limits
+    )
+
+
+def compute_page_wordifications(
+    number: str,
+    cursor: Optional[str],
+    limit: int,
+    numformat: str,
+    vocabulary_map: Mapping[str, Sequence[str]],
+    limits: Optional[Limits] = None,
+    hash_lengths: Optional[Sequence[int]] = None,
+    lattice: Optional[List[List[Tuple[str, int]]]] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """
+    Returns one page of the phonewords of the nonempty ``number`` given a precomputed
+    ``vocabulary_map``, as returned by ``compute_vocab_map()``. See
+    ``page_wordifications()``.
+    A ``lattice`` of ``number`` built by the caller, e.g. by
+    ``compute_integer_lattice()``, is used instead of building one.
+    """
+    # Format inference.
+    if numformat == "":
+        numformat = infer_format(number)
+
+    country_code, base_number = get_country_code_and_base(number)
+    if lattice is None:
+        lattice = compute_token_lattice(base_number, vocabulary_map, hash_lengths)
+    fingerprint = hashlib.sha256(repr(lattice).encode()).hexdigest()[:16]
+    after = None if cursor is None else decode_cursor(cursor, fingerprint)
+
+    budget = Budget(limits)
+    page: List[str] = []
+    last_path: List[int] = []
+    try:
+        for path in iter_lattice_paths(lattice, after):
+            if len(page) == limit:
+                return page, encode_cursor(last_path, fingerprint)
+            budget.charge(len(path))
+            budget.check_results(len(page) + 1)
+            position = 0
+            tokens: List[str] = []
+            for index in path:
+                token, position = lattice[position][index]
+                tokens.append(token)
+            page.append(assemble_phoneword(country_code, tokens, numformat))
+            last_path = path
+    except LimitExceeded as error:
+        error.partial = budget.collect_partial(page, str)
+        raise
+
+    return page, None
+
+
+def encode_cursor(path: List[int], fingerprint: str) -> str:
+    """ Packs a lattice path and the lattice fingerprint into an opaque string. """
+    payload = json.dumps([fingerprint, path], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> List[int]:
+    """ Inverse of ``encode_cursor()``, checking the cursor fits this lattice. """
+    try:
+        cursor_fingerprint, path = json.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError("Malformed cursor '%s'." % cursor)
+    if cursor_fingerprint != fingerprint:
+        raise ValueError(
+            "Cursor '%s' was issued for a different number or vocabulary." % cursor
+        )
+    if not isinstance(path, list) or not all(isinstance(i, int) for i in path):
+        raise ValueError("Malformed cursor '%s'." % cursor)
+    return path
@@ -0,0 +1,451 @@
+""" Cost-based choice between the wordification strategies of an ``Engine``. """
+import json
+import time
+from typing import (
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Union,
+    Mapping,
+    Callable,
+    Iterable,
+    Optional,
+    NamedTuple,
+)
+
+from telephone.utils import (
+    validate,
+    infer_format,
+    get_country_code_and_base,
+    count_lattice_paths,
+)
+from telephone.engine import Engine
+from telephone.limits import Limits, Budget
+from telephone.integer_index import (
+    compute_integer_lattice,
+    compute_lattice_wordifications,
+)
+from telephone.factorised_wordifications import (
+    compute_hash_lattice,
+    compute_factorised_wordifications,
+)
+from telephone.sharded_wordifications import compute_sharded_wordifications
+from telephone.all_wordifications import compute_wordifications
+from telephone.number_to_words import compute_number_to_words
+
+# pylint: disable=bad-continuation, too-many-arguments, too-many-locals
+
+Lattice = List[List[Tuple[str, int]]]
+
+# Candidate strategies for each kind of output.
+STRATEGIES: Mapping[str, Tuple[str, ...]] = {
+    "all": ("integer_lattice", "substring_dp", "factorised", "sharded"),
+    "count": ("count_lattice",),
+    "one": ("integer_scan", "substring_scan"),
+}
+
+# Strategies which apply ``Limits`` exactly as ``all_wordifications()`` does.
+LIMIT_AWARE = ("integer_lattice", "substring_dp", "integer_scan", "substring_scan")
+
+# Strategies which walk the token lattice, and so can reuse that of the plan.
+LATTICE_DRIVEN = ("integer_lattice", "factorised", "sharded", "count_lattice")
+
+# (fixed seconds, seconds per unit of work) for each strategy, from a run of
+# ``benchmarks/calibrate_planner.py`` on a single core. ``sharded`` was fitted from
+# in-process shards plus the start-up time of a process pool.
+DEFAULT_COSTS: Mapping[str, Tuple[float, float]] = {
+    "integer_lattice": (5.0e-5, 3.2e-6),
+    "substring_dp": (3.0e-5, 3.5e-6),
+    "factorised": (1.0e-4, 2.4e-7),
+    "sharded": (1.2e-2, 5.4e-6),
+    "count_lattice": (5.8e-6, 6.4e-7),
+    "integer_scan": (2.5e-5, 5.8e-7),
+    "substring_scan": (2.3e-5, 2.5e-7),
+}
+
+
+class PlanFeatures(NamedTuple):
+    """
+    Statistics of one number against a vocabulary, from which costs are estimated.
+
+    Attributes
+    ----------
+    length : ``int``.
+        Digits in the number after its country code.
+    lookups : ``int``.
+        Hash lookups made in building the token lattice.
+    results : ``int``.
+        Phonewords of the number.
+    templates : ``int``.
+        Factorised templates, i.e. arrangements of digits and word hashes.
+    states : ``int``.
+        Partial phonewords built by a suffix DP, summed over every index.
+    """
+
+    length: int
+    lookups: int
+    results: int
+    templates: int
+    states: int
+
+
+# Units of work done by each strategy, as a function of the features and the
+# number of processes. Units are roughly characters written or hashes looked up.
+WORK: Mapping[str, Callable[[PlanFeatures, int], float]] = {
+    "integer_lattice": lambda f, _: f.lookups + f.states * f.length,
+    "substring_dp": lambda f, _: f.length * f.length + f.states * f.length,
+    "factorised": lambda f, _: f.lookups + (f.templates + f.results) * f.length,
+    "sharded": lambda f, processes: f.lookups + f.results * f.length / processes,
+    "count_lattice": lambda f, _: f.lookups,
+    "integer_scan": lambda f, _: f.lookups,
+    "substring_scan": lambda f, _: f.length * f.length,
+}
+
+
+class CostModel:
+    """
+    Linear cost estimates, ``fixed + per_unit * work``, for each strategy.
+
+    Parameters
+    ----------
+    coefficients : ``Mapping[str, Tuple[float, float]]``.
+        ``(fixed, per_unit)`` seconds for each strategy. Strategies left out take the
+        values of ``DEFAULT_COSTS``.
+    """
+
+    __slots__ = ("coefficients",)
+
+    def __init__(
+        self, coefficients: Optional[Mapping[str, Tuple[float, float]]] = None
+    ) -> None:
+        merged = dict(DEFAULT_COSTS)
+        merged.update(coefficients or {})
+        self.coefficients: Dict[str, Tuple[float, float]] = {
+            strategy: (float(fixed), float(per_unit))
+            for strategy, (fixed, per_unit) in merged.items()
+        }
+
+    def estimate(self, strategy: str, features: PlanFeatures, processes: int) -> float:
+        """ Returns the estimated seconds ``strategy`` takes on ``features``. """
+        fixed, per_unit = self.coefficients[strategy]
+        return fixed + per_unit * WORK[strategy](features, processes)
+
+    @classmethod
+    def from_json(cls, path: str) -> "CostModel":
+        """ Loads a model saved with ``to_json()``. """
+        with open(path, "r") as model_file:
+            data: Dict[str, List[float]] = json.load(model_file)
+        return cls({strategy: (pair[0], pair[1]) for strategy, pair in data.items()})
+
+    def to_json(self, path: str) -> None:
+        """ Saves the coefficients as a JSON object of ``[fixed, per_unit]`` pairs. """
+        with open(path, "w") as model_file:
+            json.dump(self.coefficients, model_file, indent=4, sort_keys=True)
+
+
+class Plan(NamedTuple):
+    """
+    The strategy chosen for one call, with the estimates it was chosen from.
+
+    Attributes
+    ----------
+    output : ``str``.
+        One of ``"all"``, ``"count"`` or ``"one"``.
+    strategy : ``str``.
+        The cheapest candidate.
+    estimates : ``Dict[str, float]``.
+        Estimated seconds for each candidate considered.
+    features : ``PlanFeatures``.
+        The statistics the estimates were made from.
+    lattice : ``Optional[List[List[Tuple[str, int]]]]``.
+        The token lattice measured for ``"all"`` and ``"count"``, which ``execute()``
+        reuses rather than building again.
+    """
+
+    output: str
+    strategy: str
+    estimates: Dict[str, float]
+    features: PlanFeatures
+    lattice: Optional[Lattice] = None
+
+    def __str__(self) -> str:
+        lines = ["output=%s strategy=%s" % (self.output, self.strategy)]
+        features = self.features._asdict().items()
+        lines.append("  features: " + ", ".join("%s=%d" % item for item in features))
+        for strategy, seconds in sorted(self.estimates.items(), key=lambda x: x[1]):
+            marker = "*" if strategy == self.strategy else " "
+            lines.append("  %s %-16s %.3es" % (marker, strategy, seconds))
+        return "\n".join(lines)
+
+
+class Planner:
+    """
+    Chooses, for each call, the strategy of ``engine`` with the lowest estimated cost
+    under ``costs``, and runs it. Every strategy returns the same result, so the
+    choice only affects speed. ``explain()`` shows the choice and its estimates.
+
+    Parameters
+    ----------
+    engine : ``Engine``.
+        The engine to compute with.
+    costs : ``Optional[CostModel]``.
+        Calibrated costs, e.g. from ``calibrate()``. Defaults to ``DEFAULT_COSTS``.
+    processes : ``int``.
+        Worker processes available to the ``sharded`` strategy. It is only
+        considered when this is above one.
+    """
+
+    def __init__(
+        self, engine: Engine, costs: Optional[CostModel] = None, processes: int = 1
+    ) -> None:
+        self.engine = engine
+        self.costs = CostModel() if costs is None else costs
+        self.processes = processes
+
+        # Vocabulary statistics, reported by ``explain()``.
+        vocab_map = engine.index.vocab_map
+        histogram: Dict[int, int] = {}
+        for wordhash in vocab_map:
+            histogram[len(wordhash)] = histogram.get(len(wordhash), 0) + 1
+        self.hash_length_histogram: Dict[int, int] = dict(sorted(histogram.items()))
+        words = sum(len(group) for group in vocab_map.values())
+        self.mean_collision_size = words / len(vocab_map) if vocab_map else 0.0
+
+    def features(self, number: str, output: str) -> PlanFeatures:
+        """
+        Measures the valid ``number`` against the vocabulary. For ``"all"`` and
+        ``"count"`` this builds the token lattice and counts its paths and templates
+        exactly, which costs the same as the lookups alone.
+        """
+        return self._measure(number, output)[0]
+
+    def _measure(
+        self, number: str, output: str
+    ) -> Tuple[PlanFeatures, Optional[Lattice]]:
+        """ As ``features()``, also returning the token lattice if one was built. """
+        if number == "":
+            return PlanFeatures(0, 0, 0, 0, 0), None
+        index = self.engine.index
+        _, base_number = get_country_code_and_base(number)
+        size = len(base_number)
+        lookups = sum(min(size - i, index.max_hash_length) for i in range(size))
+        if output == "one":
+            return PlanFeatures(size, lookups, 0, 0, 0), None
+
+        lattice = compute_integer_lattice(
+            base_number, index.integer_map, index.max_hash_length
+        )
+        counts = count_lattice_paths(lattice)
+        # Templates from each index: one for the digit, and one per distinct end of a
+        # word hash. A one-letter hash ends where the digit does, but is a new choice.
+        templates = [0] * size + [1]
+        for i in range(size - 1, -1, -1):
+            ends = {end for _, end in lattice[i][1:]}
+            templates[i] = templates[i + 1] + sum(templates[end] for end in ends)
+        features = PlanFeatures(size, lookups, counts[0], templates[0], sum(counts))
+        return features, lattice
+
+    def plan(
+        self, number: str, output: str = "all", limits: Optional[Limits] = None
+    ) -> Plan:
+        """
+        Chooses a strategy for ``output`` of ``number``: ``"all"`` phonewords, their
+        ``"count"``, or ``"one"`` phoneword.
+
+        Raises
+        ------
+        ValueError.
+            If ``number`` is invalid or ``output`` unknown.
+        """
+        validate(number)
+        if output not in STRATEGIES:
+            raise ValueError(
+                "Output must be one of %s, got '%s'." % (tuple(STRATEGIES), output)
+            )
+        features, lattice = self._measure(number, output)
+        candidates = [
+            strategy
+            for strategy in STRATEGIES[output]
+            if (strategy != "sharded" or self.processes > 1)
+            and (limits is None or output == "count" or strategy in LIMIT_AWARE)
+        ]
+        estimates = {
+            strategy: self.costs.estimate(strategy, features, self.processes)
+            for strategy in candidates
+        }
+        strategy = min(candidates, key=lambda candidate: estimates[candidate])
+        return Plan(output, strategy, estimates, features, lattice)
+
+    def explain(
+        self, number: str, output: str = "all", limits: Optional[Limits] = None
+    ) -> str:
+        """ Describes the vocabulary and the plan for ``number``, for humans. """
+        histogram = " ".join(
+            "%d:%d" % item for item in self.hash_length_histogram.items()
+        )
+        vocabulary = "vocabulary: %d hashes, mean collision size %.2f, lengths %s" % (
+            len(self.engine.index.vocab_map),
+            self.mean_collision_size,
+            histogram or "-",
+        )
+        return "%s\n%s" % (vocabulary, self.plan(number, output, limits))
+
+    def execute(
+        self,
+        strategy: str,
+        number: str,
+        numformat: str,
+        limits: Optional[Limits],
+        lattice: Optional[Lattice] = None,
+    ) -> Union[Set[str], int, str]:
+        """
+        Runs ``strategy`` on the valid, nonempty ``number``. Strategies driven by the
+        token lattice use ``lattice``, e.g. ``Plan.lattice``, rather than building it.
+        """
+        engine = self.engine
+        index = engine.index
+        if numformat == "":
+            numformat = infer_format(number)
+        country_code, base_number = get_country_code_and_base(number)
+        if lattice is None and strategy in LATTICE_DRIVEN:
+            lattice = compute_integer_lattice(
+                base_number, index.integer_map, index.max_hash_length
+            )
+
+        if strategy == "integer_lattice":
+            assert lattice is not None
+            return compute_lattice_wordifications(
+                country_code,
+                base_number,
+                numformat,
+                lattice,
+                index.max_hash_length,
+                Budget(limits),
+            )
+        if strategy == "substring_dp":
+            return compute_wordifications(number, numformat, index.vocab_map, limits)
+        if strategy == "factorised":
+            assert lattice is not None
+            return compute_factorised_wordifications(
+                number,
+                numformat,
+                index.vocab_map,
+                hash_lattice=compute_hash_lattice(lattice),
+            ).expand()
+        if strategy == "sharded":
+            return set(
+                compute_sharded_wordifications(
+                    number, numformat, index.vocab_map, self.processes, lattice=lattice
+                )
+            )
+        if strategy == "count_lattice":
+            assert lattice is not None
+            return count_lattice_paths(lattice)[0]
+        if strategy == "integer_scan":
+            return engine.number_to_words(number, numformat, limits)
+        if strategy == "substring_scan":
+            return compute_number_to_words(
+                number, numformat, index.vocab_map, index.hash_lengths, limits
+            )
+        raise ValueError("Unknown strategy '%s'." % strategy)
+
+    def all_wordifications(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> Set[str]:
+        """ As ``Engine.all_wordifications()``, by the cheapest strategy. """
+        validate(number)
+        if number == "":
+            return set()
+        plan = self.plan(number, "all", limits)
+        result = self.execute(plan.strategy, number, numformat, limits, plan.lattice)
+        assert isinstance(result, set)
+        return result
+
+    def count_wordifications(self, number: str) -> int:
+        """ Returns ``len(all_wordifications(number))`` without enumerating. """
+        validate(number)
+        if number == "":
+            return 0
+        return self.plan(number, "count").features.results
+
+    def number_to_words(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> str:
+        """ As ``Engine.number_to_words()``, by the cheapest strategy. """
+        validate(number)
+        if number == "":
+            return ""
+        strategy = self.plan(number, "one", limits).strategy
+        result = self.execute(strategy, number, numformat, limits)
+        assert isinstance(result, str)
+        return result
+
+
+def fit_line(points: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """
+    Fits ``seconds = fixed + per_unit * work`` to ``(work, seconds)`` points by least
+    squares, clamping both coefficients to be nonnegative. Returns ``None`` if the
+    points do not vary in ``work``.
+    """
+    count = len(points)
+    if count < 2:
+        return None
+    mean_work = sum(work for work, _ in points) / count
+    mean_seconds = sum(seconds for _, seconds in points) / count
+    variance = sum((work - mean_work) ** 2 for work, _ in points)
+    if variance == 0:
+        return None
+    covariance = sum(
+        (work - mean_work) * (seconds - mean_seconds) for work, seconds in points
+    )
+    per_unit = max(covariance / variance, 0.0)
+    fixed = max(mean_seconds - per_unit * mean_work, 0.0)
+    return fixed, per_unit
+
+
+def calibrate(
+    engine: Engine, numbers: Iterable[str], processes: int = 1, repeats: int = 3
+) -> CostModel:
+    """
+    Times every strategy on each of ``numbers`` and fits a ``CostModel`` to the
+    results. Strategies which cannot be fitted keep their default costs.
+
+    Parameters
+    ----------
+    engine : ``Engine``.
+        The engine whose vocabulary the planner will use.
+    numbers : ``Iterable[str]``.
+        Valid, nonempty sample numbers. They should vary in length and density.
+    processes : ``int``.
+        Processes for the ``sharded`` strategy, which is skipped if one.
+    repeats : ``int``.
+        Runs per measurement; the fastest is kept.
+
+    Returns
+    -------
+    costs : ``CostModel``.
+        The fitted model.
+    """
+    planner = Planner(engine, processes=processes)
+    samples: Dict[str, List[Tuple[float, float]]] = {}
+    for number in numbers:
+        for output, strategies in STRATEGIES.items():
+            features = planner.features(number, output)
+            for strategy in strategies:
+                if strategy == "sharded" and processes <= 1:
+                    continue
+                best = float("inf")
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    planner.execute(strategy, number, "", None)
+                    best = min(best, time.perf_counter() - start)
+                work = WORK[strategy](features, processes)
+                samples.setdefault(strategy, []).append((work, best))
+
+    coefficients: Dict[str, Tuple[float, float]] = {}
+    for strategy, points in samples.items():
+        fitted = fit_line(points)
+        if fitted is not None:
+            coefficients[strategy] = fitted
+    return CostModel(coefficients)
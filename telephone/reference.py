@@ -0,0 +1,174 @@
+"""
+Frozen reference implementations of ``all_wordifications()``, ``number_to_words()``
+and ``words_to_number()``, copied from the original release.
+
+These are the yardstick that every optimised path is tested against, and that
+regression timings are measured relative to. Do not optimise or otherwise change
+anything in this module: a fix here silently changes what "correct" means.
+"""
+import re
+from typing import Set, Dict, List, Tuple, Mapping
+
+# pylint: disable=bad-continuation, too-many-locals, too-many-nested-blocks
+
+
+def reference_vocab_map(
+    vocabulary: Set[str], letter_map: Mapping[str, str]
+) -> Dict[str, List[str]]:
+    """ As the original ``compute_vocab_map()``. """
+    vocab_map: Dict[str, List[str]] = {}
+    for token in vocabulary:
+        if not token.isalpha():
+            raise ValueError("Vocabulary word '%s' contains non-alpha chars." % token)
+        uppercased_token = token.upper()
+        tokenhash = "".join([letter_map[char] for char in uppercased_token])
+        if tokenhash in vocab_map:
+            vocab_map[tokenhash].append(uppercased_token)
+        else:
+            vocab_map[tokenhash] = [uppercased_token]
+    return vocab_map
+
+
+def reference_country_code_and_base(number: str) -> Tuple[str, str]:
+    """ As the original ``get_country_code_and_base()``. """
+    if number == "":
+        return "", ""
+    segments = number.split("-")
+    return segments[0], "".join(segments[1:])
+
+
+def reference_insert_dashes(spaced_phoneword: str, spacer: str, numformat: str) -> str:
+    """ As the original ``insert_dashes()``. """
+    delim = "*"
+    assert spacer != delim
+
+    phoneword = spaced_phoneword
+    if re.search("[^A-Z0-9%s]" % spacer, phoneword):
+        raise ValueError(
+            "Word '%s' should only contain '[A-Z0-9%s]'." % (phoneword, spacer)
+        )
+    assert len(numformat.replace("-", "")) == len(phoneword.replace(spacer, ""))
+
+    delim_format = re.sub("([0-9])(?!(%s|$))" % "-", r"\1" + delim, numformat)
+    delim_phoneword = re.sub("([A-Z0-9])(?!(%s|$))" % spacer, r"\1" + delim, phoneword)
+    assert len(delim_format) == len(delim_phoneword)
+
+    for i, char in enumerate(delim_format):
+        if char == "-":
+            if delim_phoneword[i] == delim:
+                delim_phoneword = delim_phoneword[:i] + char + delim_phoneword[i + 1 :]
+
+    phoneword = delim_phoneword.replace(delim, "")
+
+    country_code_length = len(numformat.split("-")[0])
+    base = phoneword[country_code_length + 1 :]
+    base = re.sub(r"([0-9]+)([A-Z]+)", r"\1-\2", base)
+    base = re.sub(r"([A-Z]+)([0-9]+)", r"\1-\2", base)
+    base = re.sub(r"([A-Z])-(?=[A-Z])", r"\1", base)
+    phoneword = phoneword[: country_code_length + 1] + base
+
+    return phoneword.replace(spacer, "-")
+
+
+def reference_all_wordifications(
+    number: str, numformat: str, vocabulary: Set[str], letter_map: Mapping[str, str]
+) -> Set[str]:
+    """ As the original ``all_wordifications()``, for a valid ``number``. """
+    if number == "":
+        return set()
+    vocabulary_map = reference_vocab_map(vocabulary, letter_map)
+    if numformat == "":
+        numformat = re.sub(r"[0-9]", "0", number)
+
+    spacer = "&"
+    country_code, base_number = reference_country_code_and_base(number)
+    substrs_map = {
+        i: [base_number[i : j + 1] for j in range(i, len(base_number))]
+        for i in range(len(base_number))
+    }
+
+    # Phonewords of ``base_number[i:]``, each with the index of its first word.
+    phoneword_map: Dict[int, List[Tuple[str, int]]] = {}
+    phoneword_map[len(base_number)] = [("", len(base_number))]
+    i = len(base_number) - 1
+    while i >= 0:
+        substrs_starting_at_i = substrs_map[i]
+        new_list: List[Tuple[str, int]] = []
+        previous_list = phoneword_map[i + 1]
+        new_list.extend([(base_number[i] + substr, k) for substr, k in previous_list])
+        for old_phoneword, end_index in previous_list:
+            gap = base_number[i:end_index]
+            for gap_substr in substrs_starting_at_i[: len(gap)]:
+                if gap_substr in vocabulary_map:
+                    for word in vocabulary_map[gap_substr]:
+                        if len(word) == len(gap) and end_index < len(base_number):
+                            phoneword = word + spacer + old_phoneword[len(word) - 1 :]
+                        else:
+                            phoneword = word + old_phoneword[len(word) - 1 :]
+                        new_list.append((phoneword, i))
+        phoneword_map[i] = new_list
+        i -= 1
+
+    phonewords = {word.upper() for word, _ in phoneword_map[0]}
+    phonewords = {country_code + spacer + word for word in phonewords}
+    return {reference_insert_dashes(word, spacer, numformat) for word in phonewords}
+
+
+def reference_number_to_words(
+    number: str, numformat: str, vocabulary: Set[str], letter_map: Mapping[str, str]
+) -> Set[str]:
+    """
+    Every phoneword the original ``number_to_words()`` can return for a valid
+    ``number``. The original keeps the last matching word in set iteration order, so
+    its output is only defined up to this set: the number itself if no word matches,
+    otherwise the first occurrence of each matching word's hash replaced by the word.
+    """
+    if number == "":
+        return {""}
+    if numformat == "":
+        numformat = re.sub(r"[0-9]", "0", number)
+
+    spacer = "&"
+    country_code, base_number = reference_country_code_and_base(number)
+    candidates: Set[str] = set()
+    for token in vocabulary:
+        uppercased_token = token.upper()
+        tokenhash = "".join([letter_map[char] for char in uppercased_token])
+        if tokenhash in base_number:
+            candidates.add(base_number.replace(tokenhash, uppercased_token, 1))
+    if not candidates:
+        candidates.add(base_number)
+    return {
+        reference_insert_dashes(country_code + spacer + phoneword, spacer, numformat)
+        for phoneword in candidates
+    }
+
+
+def reference_words_to_number(
+    phoneword: str, numformat: str, letter_map: Mapping[str, str]
+) -> str:
+    """ As the original ``words_to_number()``. """
+    if phoneword == "":
+        return ""
+    if phoneword.upper() != phoneword:
+        raise ValueError("Word '%s' contains lowercase letters." % phoneword)
+    if numformat == "":
+        numformat = re.sub(r"[A-Z0-9]", "0", phoneword)
+
+    translated_segments: List[str] = []
+    for segment in phoneword.split("-"):
+        if not segment.isnumeric():
+            try:
+                segment_hash = "".join([letter_map[char] for char in segment])
+            except KeyError:
+                raise ValueError(
+                    "Found invalid character in '%s' for mapping domain '%s'."
+                    % (segment, str(letter_map.keys()))
+                )
+        else:
+            segment_hash = segment
+        translated_segments.append(segment_hash)
+    translated_dashless_number = "".join(translated_segments)
+    dashless_format = numformat.replace("-", "")
+    translated_dashless_number = translated_dashless_number[: len(dashless_format)]
+    return reference_insert_dashes(translated_dashless_number, "&", numformat)
@@ -0,0 +1,198 @@
+""" Differential and timing checks of every fast path against the frozen reference. """
+import gc
+import json
+import time
+from typing import Any, Set, Dict, List, Callable, Optional, Sequence
+
+from telephone.keypad import US_KEYPAD
+from telephone.engine import Engine
+from telephone.utils import compute_vocab_map
+from telephone.planner import Planner
+from telephone.multi_layout import LetterTrie, compute_multi_layout_wordifications
+from telephone.all_wordifications import all_wordifications, compute_wordifications
+from telephone.number_to_words import number_to_words, compute_number_to_words
+from telephone.words_to_number import words_to_number
+from telephone.reference import (
+    reference_all_wordifications,
+    reference_number_to_words,
+    reference_words_to_number,
+)
+
+# pylint: disable=bad-continuation
+
+# Path names are "<operation>/<implementation>"; "<operation>/reference" is the
+# frozen implementation which the others are timed relative to.
+Paths = Dict[str, Callable[[str], Any]]
+
+
+def compute_paths(vocabulary: Set[str]) -> Paths:
+    """
+    Binds every implementation of each operation to ``vocabulary`` on the US keypad,
+    building any index once up front as a long-running server would.
+
+    Returns
+    -------
+    paths : ``Dict[str, Callable[[str], Any]]``.
+        For ``all_wordifications/*`` a function from a number to a set of phonewords,
+        for ``number_to_words/*`` from a number to one phoneword, and for
+        ``words_to_number/*`` from a phoneword to a number. The reference
+        ``number_to_words`` returns the set of outputs it allows.
+    """
+    letter_map = dict(US_KEYPAD.letter_map)
+    engine = Engine.from_vocabulary(vocabulary)
+    planner = Planner(engine)
+    vocab_map = compute_vocab_map(vocabulary, US_KEYPAD)
+    projected = LetterTrie(vocabulary).project([US_KEYPAD])
+    index = engine.index
+
+    def paged(number: str) -> Set[str]:
+        phonewords: Set[str] = set()
+        cursor: Optional[str] = None
+        while True:
+            page, cursor = engine.page_wordifications(number, cursor, 100)
+            phonewords.update(page)
+            if cursor is None:
+                return phonewords
+
+    return {
+        "all_wordifications/reference": lambda number: reference_all_wordifications(
+            number, "", vocabulary, letter_map
+        ),
+        "all_wordifications/function": lambda number: all_wordifications(
+            number, "", vocabulary
+        ),
+        "all_wordifications/substring_dp": lambda number: compute_wordifications(
+            number, "", vocab_map
+        ),
+        "all_wordifications/engine": engine.all_wordifications,
+        "all_wordifications/factorised": lambda number: (
+            engine.factorised_wordifications(number).expand()
+        ),
+        "all_wordifications/paged": paged,
+        "all_wordifications/sharded": lambda number: set(
+            engine.iter_sharded_wordifications(number, processes=1)
+        ),
+        "all_wordifications/multi_layout": lambda number: (
+            compute_multi_layout_wordifications(number, "", projected)[0]
+        ),
+        "all_wordifications/planner": planner.all_wordifications,
+        "number_to_words/reference": lambda number: reference_number_to_words(
+            number, "", vocabulary, letter_map
+        ),
+        "number_to_words/function": lambda number: number_to_words(
+            number, "", vocabulary
+        ),
+        "number_to_words/substring_scan": lambda number: compute_number_to_words(
+            number, "", vocab_map, index.hash_lengths
+        ),
+        "number_to_words/engine": engine.number_to_words,
+        "number_to_words/planner": planner.number_to_words,
+        "words_to_number/reference": lambda phoneword: reference_words_to_number(
+            phoneword, "", letter_map
+        ),
+        "words_to_number/function": words_to_number,
+        "words_to_number/engine": engine.words_to_number,
+    }
+
+
+def check_path(paths: Paths, name: str, value: str) -> None:
+    """
+    Asserts that the path ``name`` agrees with the reference for its operation on
+    ``value``. The reference itself is skipped.
+
+    Raises
+    ------
+    AssertionError.
+        If the outputs differ, or ``number_to_words`` gives a phoneword the
+        reference could not have given.
+    """
+    operation, implementation = name.split("/")
+    if implementation == "reference":
+        return
+    expected = paths[operation + "/reference"](value)
+    actual = paths[name](value)
+    if operation == "number_to_words":
+        assert actual in expected, "%s(%r) = %r" % (name, value, actual)
+    else:
+        assert actual == expected, "%s(%r) differs from the reference" % (name, value)
+
+
+def measure(function: Callable[[str], Any], inputs: Sequence[str]) -> float:
+    """ Times one run of ``function`` over ``inputs``, with garbage collection off. """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for value in inputs:
+            function(value)
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def measure_paths(
+    paths: Paths, numbers: Sequence[str], phonewords: Sequence[str], repeats: int = 5
+) -> Dict[str, float]:
+    """
+    Times every path, relative to the reference for its operation on the same
+    inputs. Relative timings depend far less on the machine than absolute ones, and
+    paths are timed in rounds so that drift in machine load affects all alike. The
+    fastest of ``repeats`` rounds is kept for each path.
+
+    Returns
+    -------
+    timings : ``Dict[str, float]``.
+        Seconds taken by each non-reference path divided by those of its reference.
+    """
+    absolute = {name: float("inf") for name in paths}
+    for _ in range(repeats):
+        for name, function in paths.items():
+            inputs = phonewords if name.startswith("words_to_number/") else numbers
+            absolute[name] = min(absolute[name], measure(function, inputs))
+    return {
+        name: seconds / max(absolute[name.split("/")[0] + "/reference"], 1e-9)
+        for name, seconds in absolute.items()
+        if not name.endswith("/reference")
+    }
+
+
+def find_regressions(
+    timings: Dict[str, float], baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    """
+    Compares relative timings with a baseline from ``measure_paths()``.
+
+    Returns
+    -------
+    regressions : ``List[str]``.
+        One message per path which is more than ``tolerance`` (a fraction, e.g.
+        ``0.25``) slower than its baseline. Paths missing from either are skipped.
+    """
+    regressions: List[str] = []
+    for name in sorted(set(timings) & set(baseline)):
+        if timings[name] > baseline[name] * (1 + tolerance):
+            regressions.append(
+                "%s: %.3fx of reference, baseline %.3fx (+%.0f%%)"
+                % (
+                    name,
+                    timings[name],
+                    baseline[name],
+                    100 * (timings[name] / baseline[name] - 1),
+                )
+            )
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    """ Reads relative timings saved by ``save_baseline()``. """
+    with open(path, "r") as baseline_file:
+        baseline: Dict[str, float] = json.load(baseline_file)
+    return baseline
+
+
+def save_baseline(timings: Dict[str, float], path: str) -> None:
+    """ Writes relative timings as a sorted JSON object. """
+    with open(path, "w") as baseline_file:
+        json.dump(timings, baseline_file, indent=4, sort_keys=True)
+        baseline_file.write("\n")
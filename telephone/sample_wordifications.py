@@ -0,0 +1,117 @@
+""" Uniform random sampling of phonewords without full enumeration. """
+import sys
+import random
+from typing import Set, Dict, List, Tuple, Mapping, Sequence, Optional
+
+from telephone.utils import (
+    validate,
+    get_vocabulary,
+    compute_vocab_map,
+    get_country_code_and_base,
+    infer_format,
+    compute_token_lattice,
+    count_lattice_paths,
+    unrank_lattice_path,
+    assemble_phoneword,
+)
+from telephone.keypad import LetterMap, US_KEYPAD
+
+# pylint: disable=bad-continuation, too-many-arguments
+
+
+def sample_wordifications(
+    number: str,
+    k: int,
+    seed: Optional[int] = None,
+    numformat: str = "",
+    vocabulary: Optional[Set[str]] = None,
+    letter_map: LetterMap = US_KEYPAD,
+) -> List[str]:
+    """
+    Draws ``k`` distinct phonewords of ``number`` uniformly at random, without
+    enumerating the rest.
+
+    The number of phonewords completing each suffix of ``number`` follows from a
+    suffix recurrence over the token lattice. Distinct ranks are drawn uniformly from
+    the total and each is decoded by walking the lattice once, choosing each token
+    with probability proportional to the count of completions after it.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    k : ``int``.
+        Number of phonewords to draw. All of them are returned if there are fewer.
+    seed : ``Optional[int]``.
+        Seed for the random draw. The same seed, number and vocabulary always yield
+        the same sample.
+    numformat : ``str``.
+        Format of the number using "0" and "-", e.g. "0-000-000-0000" for US numbers.
+    vocabulary : ``Optional[Set[str]]``.
+        Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
+        and use a default US vocabulary.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+
+    Returns
+    -------
+    phonewords : ``List[str]``.
+        A uniform sample without replacement from ``all_wordifications(number, ...)``,
+        in the order drawn.
+    """
+    validate(number)
+    if k < 0:
+        raise ValueError("Sample size must be nonnegative, got '%d'." % k)
+    if number == "":
+        return []
+
+    vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
+    vocabulary_map: Dict[str, List[str]] = compute_vocab_map(vocab, letter_map)
+
+    return compute_sample_wordifications(number, k, seed, numformat, vocabulary_map)
+
+
+def compute_sample_wordifications(
+    number: str,
+    k: int,
+    seed: Optional[int],
+    numformat: str,
+    vocabulary_map: Mapping[str, Sequence[str]],
+    hash_lengths: Optional[Sequence[int]] = None,
+    lattice: Optional[List[List[Tuple[str, int]]]] = None,
+) -> List[str]:
+    """
+    Samples phonewords of the nonempty ``number`` given a precomputed
+    ``vocabulary_map``, as returned by ``compute_vocab_map()``. See
+    ``sample_wordifications()``.
+    A ``lattice`` of ``number`` built by the caller, e.g. by
+    ``compute_integer_lattice()``, is used instead of building one.
+    """
+    # Format inference.
+    if numformat == "":
+        numformat = infer_format(number)
+
+    country_code, base_number = get_country_code_and_base(number)
+    if lattice is None:
+        lattice = compute_token_lattice(base_number, vocabulary_map, hash_lengths)
+    counts = count_lattice_paths(lattice)
+
+    rng = random.Random(seed)
+    if counts[0] <= sys.maxsize:
+        ranks = rng.sample(range(counts[0]), min(k, counts[0]))
+    else:
+        # ``random.sample()`` needs a ``range`` of C-sized length. Past that, ``k`` is
+        # far smaller than the count, so rejecting repeated ranks is almost free.
+        ranks = []
+        drawn: Set[int] = set()
+        while len(ranks) < k:
+            rank = rng.randrange(counts[0])
+            if rank not in drawn:
+                drawn.add(rank)
+                ranks.append(rank)
+    return [
+        assemble_phoneword(
+            country_code, unrank_lattice_path(lattice, counts, rank), numformat
+        )
+        for rank in ranks
+    ]
@@ -0,0 +1,332 @@
+""" Checkpointed, resumable wordification scans over a large number inventory. """
+import os
+import time
+import sqlite3
+import hashlib
+import itertools
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Deque,
+    Sized,
+    Iterable,
+    Iterator,
+    Callable,
+    Optional,
+    NamedTuple,
+)
+from collections import deque
+
+from telephone.keypad import LetterMap, US_KEYPAD
+from telephone.engine import Engine, VocabIndex
+from telephone.utils import get_vocabulary
+from telephone.normalize import NumberError, classify_number
+
+# pylint: disable=bad-continuation, too-many-arguments, too-many-locals
+# pylint: disable=global-statement
+
+METHODS = ("all_wordifications", "number_to_words")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk INTEGER PRIMARY KEY, size INTEGER NOT NULL, digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    position INTEGER NOT NULL, number TEXT NOT NULL, phoneword TEXT, error TEXT
+);
+CREATE INDEX IF NOT EXISTS results_position ON results (position);
+"""
+
+# A result row: (inventory position, number, phoneword, error message).
+Row = Tuple[int, str, Optional[str], Optional[str]]
+
+WORKER_SCAN: Optional[Tuple[Engine, str, str]] = None
+
+
+class ScanProgress(NamedTuple):
+    """
+    A progress report from ``run_scan()``.
+
+    Attributes
+    ----------
+    done : ``int``.
+        Numbers scanned so far, including those checkpointed by earlier runs.
+    total : ``Optional[int]``.
+        Size of the inventory, if known.
+    elapsed : ``float``.
+        Seconds since this run started.
+    rate : ``float``.
+        Numbers per second scanned by this run.
+    eta : ``Optional[float]``.
+        Estimated seconds remaining, if ``total`` is known and the rate nonzero.
+    """
+
+    done: int
+    total: Optional[int]
+    elapsed: float
+    rate: float
+    eta: Optional[float]
+
+    def __str__(self) -> str:
+        done = "%d/%d" % (self.done, self.total) if self.total else str(self.done)
+        eta = "?" if self.eta is None else "%.0fs" % self.eta
+        return "%s numbers, %.1f/s, ETA %s" % (done, self.rate, eta)
+
+
+def chunk_digest(numbers: List[str]) -> str:
+    """ Identifies a chunk of the inventory, to detect changed input on resume. """
+    return hashlib.sha256("\n".join(numbers).encode()).hexdigest()
+
+
+def scan_numbers(
+    engine: Engine, method: str, numformat: str, start: int, numbers: List[str]
+) -> List[Row]:
+    """
+    Applies ``method`` of ``engine`` to each of ``numbers``, numbered from ``start``.
+    An invalid number gives a single row holding its error rather than failing the
+    chunk: the name of its ``NumberError`` if ``classify_number()`` rejects it, and
+    otherwise the message of any ``ValueError`` raised. Phonewords of one number are
+    sorted, so reruns write identical rows.
+    """
+    rows: List[Row] = []
+    for position, number in enumerate(numbers, start):
+        code = classify_number(number)
+        if code != NumberError.OK:
+            rows.append((position, number, None, code.name))
+            continue
+        try:
+            if method == "all_wordifications":
+                phonewords = sorted(engine.all_wordifications(number, numformat))
+            else:
+                phonewords = [engine.number_to_words(number, numformat)]
+        except ValueError as error:
+            rows.append((position, number, None, str(error)))
+            continue
+        rows.extend([(position, number, phoneword, None) for phoneword in phonewords])
+    return rows
+
+
+def init_scan_worker(
+    vocab_map: Dict[str, Tuple[str, ...]],
+    letter_map: Dict[str, str],
+    method: str,
+    numformat: str,
+) -> None:
+    """ Compiles the engine once per worker process. """
+    global WORKER_SCAN
+    index = VocabIndex.from_vocab_map(vocab_map, letter_map)
+    WORKER_SCAN = (Engine(index), method, numformat)
+
+
+def scan_chunk(start: int, numbers: List[str]) -> List[Row]:
+    """ Runs ``scan_numbers()`` in a worker set up by ``init_scan_worker()``. """
+    assert WORKER_SCAN is not None
+    engine, method, numformat = WORKER_SCAN
+    return scan_numbers(engine, method, numformat, start, numbers)
+
+
+def check_settings(connection: sqlite3.Connection, settings: Dict[str, str]) -> None:
+    """
+    Records the settings of a new scan, or checks that a resumed scan uses the same
+    ones.
+
+    Raises
+    ------
+    ValueError.
+        If the database holds a scan with different settings.
+    """
+    stored = dict(connection.execute("SELECT name, value FROM settings").fetchall())
+    if not stored:
+        with connection:
+            connection.executemany(
+                "INSERT INTO settings VALUES (?, ?)", sorted(settings.items())
+            )
+        return
+    for name, value in sorted(settings.items()):
+        if stored.get(name) != value:
+            raise ValueError(
+                "Scan database was started with %s '%s', not '%s'."
+                % (name, stored.get(name), value)
+            )
+
+
+def run_scan(
+    numbers: Iterable[str],
+    database: str,
+    method: str = "number_to_words",
+    numformat: str = "",
+    vocabulary: Optional[Set[str]] = None,
+    letter_map: LetterMap = US_KEYPAD,
+    processes: Optional[int] = None,
+    chunk_size: int = 1000,
+    total: Optional[int] = None,
+    progress: Optional[Callable[[ScanProgress], None]] = None,
+) -> ScanProgress:
+    """
+    Runs ``all_wordifications()`` or ``number_to_words()`` over an inventory of
+    numbers, writing results to a SQLite database as it goes.
+
+    The inventory is split into chunks of ``chunk_size`` numbers, which are scanned
+    on a process pool with at most two chunks per process in flight. Chunks are
+    written in inventory order, each in one transaction together with its
+    checkpoint, so a scan which is interrupted at any point and rerun with the same
+    arguments skips exactly the chunks already written and continues from the next.
+    Results are deterministic; ``number_to_words()`` uses the engine's tie-breaking.
+
+    Parameters
+    ----------
+    numbers : ``Iterable[str]``.
+        The inventory. Surrounding whitespace is stripped, so lines of a file may be
+        passed directly. Must be the same sequence when resuming.
+    database : ``str``.
+        Path of the SQLite database holding checkpoints and results.
+    method : ``str``.
+        Either ``"all_wordifications"`` or ``"number_to_words"``.
+    numformat : ``str``.
+        Format of the numbers using "0" and "-". Inferred per number if empty.
+    vocabulary : ``Optional[Set[str]]``.
+        Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
+        and use a default US vocabulary.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    processes : ``Optional[int]``.
+        Worker processes. ``None`` uses every CPU; ``1`` scans in this process.
+    chunk_size : ``int``.
+        Numbers per chunk, and so per checkpoint.
+    total : ``Optional[int]``.
+        Size of the inventory, for the ETA. Taken from ``len(numbers)`` if omitted.
+    progress : ``Optional[Callable[[ScanProgress], None]]``.
+        Called after each chunk is written, e.g. with ``print``.
+
+    Returns
+    -------
+    progress : ``ScanProgress``.
+        The final progress report.
+
+    Raises
+    ------
+    ValueError.
+        If ``method`` or ``chunk_size`` is invalid, or the database holds a scan with
+        different settings or inventory.
+    """
+    if method not in METHODS:
+        raise ValueError("Scan method must be one of %s, got '%s'." % (METHODS, method))
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive, got '%d'." % chunk_size)
+    if total is None and isinstance(numbers, Sized):
+        total = len(numbers)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
+    engine = Engine.from_vocabulary(vocab, letter_map)
+    settings = {
+        "method": method,
+        "numformat": numformat,
+        "chunk_size": str(chunk_size),
+        "fingerprint": engine.index.fingerprint,
+    }
+
+    started = time.monotonic()
+    scanned = 0
+    done = 0
+
+    def report() -> ScanProgress:
+        elapsed = time.monotonic() - started
+        rate = scanned / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if total is not None and rate > 0:
+            eta = max(total - done, 0) / rate
+        return ScanProgress(done, total, elapsed, rate, eta)
+
+    connection = sqlite3.connect(database)
+    try:
+        connection.executescript(SCHEMA)
+        check_settings(connection, settings)
+        checkpoints: Dict[int, str] = dict(
+            connection.execute("SELECT chunk, digest FROM chunks").fetchall()
+        )
+
+        def write(chunk: int, size: int, digest: str, rows: List[Row]) -> None:
+            nonlocal scanned, done
+            with connection:
+                connection.executemany(
+                    "INSERT INTO results VALUES (?, ?, ?, ?)", rows
+                )
+                connection.execute(
+                    "INSERT INTO chunks VALUES (?, ?, ?)", (chunk, size, digest)
+                )
+            scanned += size
+            done += size
+            if progress is not None:
+                progress(report())
+
+        # Chunks still to scan, as (chunk, first position, numbers, digest).
+        def pending_chunks() -> Iterator[Tuple[int, int, List[str], str]]:
+            nonlocal done
+            stripped = (number.strip() for number in numbers)
+            for chunk in itertools.count():
+                start = chunk * chunk_size
+                batch = list(itertools.islice(stripped, chunk_size))
+                if not batch:
+                    return
+                digest = chunk_digest(batch)
+                if chunk in checkpoints:
+                    if checkpoints[chunk] != digest:
+                        raise ValueError(
+                            "Inventory chunk %d differs from the one checkpointed."
+                            % chunk
+                        )
+                    done += len(batch)
+                    continue
+                yield chunk, start, batch, digest
+
+        if processes <= 1:
+            for chunk, start, batch, digest in pending_chunks():
+                rows = scan_numbers(engine, method, numformat, start, batch)
+                write(chunk, len(batch), digest, rows)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=init_scan_worker,
+                initargs=(
+                    dict(engine.index.vocab_map),
+                    dict(engine.index.keypad.letter_map),
+                    method,
+                    numformat,
+                ),
+            ) as executor:
+                in_flight: Deque[Tuple[int, int, str, "Future[List[Row]]"]] = deque()
+                for chunk, start, batch, digest in pending_chunks():
+                    if len(in_flight) >= 2 * processes:
+                        finished, size, finished_digest, future = in_flight.popleft()
+                        write(finished, size, finished_digest, future.result())
+                    future = executor.submit(scan_chunk, start, batch)
+                    in_flight.append((chunk, len(batch), digest, future))
+                for chunk, size, digest, future in in_flight:
+                    write(chunk, size, digest, future.result())
+    finally:
+        connection.close()
+
+    return report()
+
+
+def iter_scan_results(database: str) -> Iterator[Row]:
+    """
+    Streams the rows written by ``run_scan()`` in inventory order, as
+    ``(position, number, phoneword, error)``, where exactly one of ``phoneword`` and
+    ``error`` is ``None``.
+    """
+    connection = sqlite3.connect(database)
+    try:
+        cursor = connection.execute(
+            "SELECT position, number, phoneword, error FROM results "
+            "ORDER BY position, rowid"
+        )
+        yield from cursor
+    finally:
+        connection.close()
@@ -0,0 +1,190 @@
+""" Parallel enumeration of the phonewords of a single number across processes. """
+import os
+import heapq
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Set, Dict, List, Tuple, Mapping, Sequence, Optional, Generator
+
+from telephone.utils import (
+    validate,
+    get_vocabulary,
+    compute_vocab_map,
+    get_country_code_and_base,
+    infer_format,
+    compute_token_lattice,
+    count_lattice_paths,
+    iter_lattice_paths,
+    assemble_phoneword,
+)
+from telephone.keypad import LetterMap, US_KEYPAD
+
+# pylint: disable=bad-continuation, too-many-arguments, global-statement
+
+Lattice = List[List[Tuple[str, int]]]
+
+# Lattice, country code and format shared by the shards in a worker process.
+WORKER_STATE: Optional[Tuple[Lattice, str, str]] = None
+
+
+def partition_lattice(
+    lattice: Lattice, counts: List[int], shards: int
+) -> List[Tuple[int, List[int]]]:
+    """
+    Splits the paths through ``lattice`` into disjoint shards, each the set of paths
+    extending one prefix.
+
+    Starting from the empty prefix, the largest shard is repeatedly replaced by its
+    children, one per option at the index it reaches, until there are at least
+    ``shards`` of them or no shard can be split. Splitting the all-digits prefix in
+    this way separates paths by the position and identity of their first word.
+
+    Returns
+    -------
+    partition : ``List[Tuple[int, List[int]]]``.
+        ``(size, prefix)`` pairs, largest first, where ``prefix`` lists option
+        indices and ``size`` is the number of paths extending it.
+    """
+    # Max-heap entries of (-size, prefix, index the prefix reaches).
+    heap: List[Tuple[int, List[int], int]] = [(-counts[0], [], 0)]
+    done: List[Tuple[int, List[int]]] = []
+    while heap and len(heap) + len(done) < shards:
+        negative_size, prefix, position = heapq.heappop(heap)
+        if position == len(lattice):
+            done.append((-negative_size, prefix))
+            continue
+        for index, (_, end) in enumerate(lattice[position]):
+            heapq.heappush(heap, (-counts[end], prefix + [index], end))
+    done.extend([(-negative_size, prefix) for negative_size, prefix, _ in heap])
+    done.sort(key=lambda shard: -shard[0])
+    return done
+
+
+def enumerate_shard(
+    lattice: Lattice, country_code: str, numformat: str, prefix: List[int]
+) -> List[str]:
+    """ Renders every phoneword whose lattice path begins with ``prefix``. """
+    position = 0
+    prefix_tokens: List[str] = []
+    for index in prefix:
+        token, position = lattice[position][index]
+        prefix_tokens.append(token)
+
+    phonewords: List[str] = []
+    for path in iter_lattice_paths(lattice, start=position):
+        tokens = list(prefix_tokens)
+        step = position
+        for index in path:
+            token, step = lattice[step][index]
+            tokens.append(token)
+        phonewords.append(assemble_phoneword(country_code, tokens, numformat))
+    return phonewords
+
+
+def init_shard_worker(lattice: Lattice, country_code: str, numformat: str) -> None:
+    """ Receives the shared lattice once per worker process. """
+    global WORKER_STATE
+    WORKER_STATE = (lattice, country_code, numformat)
+
+
+def run_shard(prefix: List[int]) -> List[str]:
+    """ Runs ``enumerate_shard()`` in a worker set up by ``init_shard_worker()``. """
+    assert WORKER_STATE is not None
+    lattice, country_code, numformat = WORKER_STATE
+    return enumerate_shard(lattice, country_code, numformat, prefix)
+
+
+def iter_sharded_wordifications(
+    number: str,
+    numformat: str = "",
+    vocabulary: Optional[Set[str]] = None,
+    letter_map: LetterMap = US_KEYPAD,
+    processes: Optional[int] = None,
+    shards_per_process: int = 4,
+) -> Generator[str, None, None]:
+    """
+    Streams the phonewords of ``number``, enumerating disjoint shards of the result
+    in parallel worker processes. Use this when a single number has too many
+    phonewords for one core.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    numformat : ``str``.
+        Format of the number using "0" and "-", e.g. "0-000-000-0000" for US numbers.
+    vocabulary : ``Optional[Set[str]]``.
+        Set of lowercase, alphabetical-only vocabulary words. Pass ``None`` to download
+        and use a default US vocabulary.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
+    processes : ``Optional[int]``.
+        Worker processes. ``None`` uses every CPU; ``1`` runs every shard in this
+        process.
+    shards_per_process : ``int``.
+        Target number of shards per process, for load balancing.
+
+    Yields
+    ------
+    phoneword : ``str``.
+        Each element of ``all_wordifications(number, ...)`` exactly once, in no
+        particular order. Closing the generator early cancels the shards not yet
+        started.
+    """
+    validate(number)
+    if number == "":
+        return
+
+    vocab: Set[str] = get_vocabulary() if vocabulary is None else vocabulary
+    vocabulary_map: Dict[str, List[str]] = compute_vocab_map(vocab, letter_map)
+
+    yield from compute_sharded_wordifications(
+        number, numformat, vocabulary_map, processes, shards_per_process
+    )
+
+
+def compute_sharded_wordifications(
+    number: str,
+    numformat: str,
+    vocabulary_map: Mapping[str, Sequence[str]],
+    processes: Optional[int] = None,
+    shards_per_process: int = 4,
+    hash_lengths: Optional[Sequence[int]] = None,
+    lattice: Optional[List[List[Tuple[str, int]]]] = None,
+) -> Generator[str, None, None]:
+    """
+    Streams the phonewords of the nonempty ``number`` given a precomputed
+    ``vocabulary_map``, as returned by ``compute_vocab_map()``. See
+    ``iter_sharded_wordifications()``.
+    A ``lattice`` of ``number`` built by the caller, e.g. by
+    ``compute_integer_lattice()``, is used instead of building one.
+    """
+    # Format inference.
+    if numformat == "":
+        numformat = infer_format(number)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    country_code, base_number = get_country_code_and_base(number)
+    if lattice is None:
+        lattice = compute_token_lattice(base_number, vocabulary_map, hash_lengths)
+    counts = count_lattice_paths(lattice)
+    partition = partition_lattice(lattice, counts, processes * shards_per_process)
+
+    if processes <= 1:
+        for _, prefix in partition:
+            yield from enumerate_shard(lattice, country_code, numformat, prefix)
+        return
+
+    # Largest shards are submitted first so that small ones fill in at the end. If
+    # the consumer stops early, shards not yet started are cancelled rather than
+    # waited for.
+    executor = ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=init_shard_worker,
+        initargs=(lattice, country_code, numformat),
+    )
+    try:
+        futures = [executor.submit(run_shard, prefix) for _, prefix in partition]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,108 @@
+""" Tests for the ``AsyncEngine`` class. """
+import asyncio
+import string
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable
+
+import pytest
+
+from telephone.engine import Engine
+from telephone.limits import Limits, LimitExceeded, CancellationToken
+from telephone.async_engine import AsyncEngine
+
+# pylint: disable=bad-continuation, protected-access
+
+VOCAB = {"paint", "painter", "saint", "art", "ter"}
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """ A thread pool which counts submitted computations. """
+
+    submitted = 0
+
+    def submit(  # type: ignore
+        self, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_identical_requests_are_coalesced() -> None:
+    """ Concurrent identical requests share one computation and its result. """
+    engine = Engine.from_vocabulary(VOCAB)
+    with CountingExecutor(max_workers=2) as executor:
+        async_engine = AsyncEngine(engine, executor)
+
+        async def main() -> None:
+            results = await asyncio.gather(
+                *[async_engine.aall_wordifications("1-800-724-6837") for _ in range(5)],
+                async_engine.anumber_to_words("1-800-724-6837"),
+            )
+            assert all(result == results[0] for result in results[:5])
+            assert results[0] == engine.all_wordifications("1-800-724-6837")
+            assert results[5] == engine.number_to_words("1-800-724-6837")
+            assert async_engine.in_flight() == 0
+
+            first, second = await asyncio.gather(
+                async_engine.aall_wordifications("1-800-724-6837"),
+                async_engine.aall_wordifications("1-800-724-6837"),
+            )
+            first.clear()
+            assert second == engine.all_wordifications("1-800-724-6837")
+
+        asyncio.run(main())
+        assert executor.submitted == 3
+
+
+def test_errors_reach_every_waiter() -> None:
+    """ Invalid numbers raise in each coalesced caller. """
+    async_engine = AsyncEngine(Engine.from_vocabulary(VOCAB))
+
+    async def main() -> None:
+        results = await asyncio.gather(
+            async_engine.aall_wordifications("1-800-PAINTER"),
+            async_engine.aall_wordifications("1-800-PAINTER"),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError):
+            await async_engine.anumber_to_words(
+                "1-800-724-6837", limits=Limits(cancel=CancellationToken())
+            )
+
+    asyncio.run(main())
+
+
+def test_cancelling_last_waiter_stops_computation() -> None:
+    """ Once every waiter is cancelled, the computation is cancelled too. """
+    engine = Engine.from_vocabulary(set(string.ascii_lowercase))
+    async_engine = AsyncEngine(engine)
+    number = "1-777-999-7799"
+
+    async def main() -> None:
+        first = asyncio.ensure_future(async_engine.aall_wordifications(number))
+        second = asyncio.ensure_future(async_engine.aall_wordifications(number))
+        await asyncio.sleep(0.01)
+        assert async_engine.in_flight() == 1
+        flight = next(iter(async_engine._flights.values()))
+
+        first.cancel()
+        await asyncio.sleep(0)
+        assert not flight.token.cancelled
+        second.cancel()
+        await asyncio.wait([first, second])
+        assert async_engine.in_flight() == 0
+        assert flight.token.cancelled
+
+        with pytest.raises(LimitExceeded) as info:
+            await flight.future
+        assert info.value.reason == "cancelled"
+
+    asyncio.run(main())
+
+
+def test_process_pools_are_rejected() -> None:
+    """ Only thread pools can share the engine and its cancellation tokens. """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(TypeError):
+            AsyncEngine(Engine.from_vocabulary(VOCAB), executor)  # type: ignore
@@ -0,0 +1,61 @@
+""" Tests for the ``build_vocab_index()`` function. """
+import gzip
+import pathlib
+import tempfile
+from typing import Set
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.engine import VocabIndex
+from telephone.build_index import build_vocab_index
+from telephone.tests.test_constants import LOWERCASE_ALPHA
+
+# pylint: disable=bad-continuation
+
+
+@settings(max_examples=20, deadline=None)
+@given(st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True), max_size=40))
+def test_build_vocab_index_matches_in_memory_index(vocab: Set[str]) -> None:
+    """
+    Tests that a chunked build over a file gives the same index as compiling the
+    vocabulary in memory.
+
+    Parameters
+    ----------
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "words.txt"
+        path.write_text("".join(word + "\n" for word in sorted(vocab)))
+        index = build_vocab_index([str(path)], processes=1, chunk_size=7)
+    expected = VocabIndex(vocab)
+    assert index.vocab_map == expected.vocab_map
+    assert index.fingerprint == expected.fingerprint
+
+
+def test_build_vocab_index_ranks_across_processes(tmp_path: pathlib.Path) -> None:
+    """ Frequencies, duplicates and gzip are handled across worker processes. """
+    plain = tmp_path / "words.txt"
+    plain.write_text("paint 10\nsaint 30\n\nart 20\n")
+    zipped = tmp_path / "more.txt.gz"
+    with gzip.open(str(zipped), "wt") as zipped_file:
+        zipped_file.write("painter\t40\nPaint 50\nter\n")
+
+    index = build_vocab_index([str(plain), str(zipped)], processes=2, chunk_size=2)
+    assert index.vocab_map["72468"] == ("PAINT", "SAINT")
+    assert index.ranks["PAINT"] == 0
+    assert [word for word, _ in sorted(index.ranks.items(), key=lambda x: x[1])] == [
+        "PAINT",
+        "PAINTER",
+        "SAINT",
+        "ART",
+        "TER",
+    ]
+
+    invalid = tmp_path / "invalid.txt"
+    invalid.write_text("paint\nn0t\n")
+    with pytest.raises(ValueError):
+        build_vocab_index([str(invalid)], processes=2, chunk_size=1)
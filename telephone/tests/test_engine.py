@@ -0,0 +1,72 @@
+""" Tests for the ``Engine`` class and ``run_batch()``. """
+import datetime
+from typing import Set, List
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.engine import Engine, VocabIndex, run_batch
+from telephone.all_wordifications import all_wordifications
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+    UPPERCASE_ALPHA,
+)
+
+# pylint: disable=bad-continuation
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+)
+def test_engine_matches_functions(number: str, vocab: Set[str]) -> None:
+    """
+    Tests that the engine agrees with the module-level functions.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    """
+    engine = Engine.from_vocabulary(vocab, US_LETTER_MAP)
+    expected = all_wordifications(number, US_FORMAT, vocab, US_LETTER_MAP)
+    assert engine.all_wordifications(number, US_FORMAT) == expected
+
+    phoneword = engine.number_to_words(number, US_FORMAT)
+    assert phoneword in expected
+    assert len(UPPERCASE_ALPHA.findall(phoneword)) <= 1
+    assert engine.words_to_number(phoneword, US_FORMAT) == number
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.lists(st.from_regex(US_NUMBER, fullmatch=True), max_size=20),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+)
+def test_run_batch_matches_sequential(numbers: List[str], vocab: Set[str]) -> None:
+    """ Concurrent readers of one engine get the same answers as a serial loop. """
+    engine = Engine.from_vocabulary(vocab, US_LETTER_MAP)
+    results = run_batch(engine.all_wordifications, numbers, max_workers=4)
+    assert results == [engine.all_wordifications(number) for number in numbers]
+
+
+def test_engine_is_read_only() -> None:
+    """ Neither the index nor the engine may be mutated after construction. """
+    index = VocabIndex({"paint", "painter"}, US_LETTER_MAP)
+    engine = Engine(index)
+    with pytest.raises(AttributeError):
+        engine.index = index
+    with pytest.raises(AttributeError):
+        index.hash_lengths = ()
+    with pytest.raises(TypeError):
+        index.vocab_map["7246837"] = ("X",)  # type: ignore
+    assert index.vocab_map["7246837"] == ("PAINTER",)
+    assert index.fingerprint == VocabIndex({"painter", "paint"}).fingerprint
+    assert engine.number_to_words("1-800-724-6837") == "1-800-PAINTER"
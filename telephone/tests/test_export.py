@@ -0,0 +1,72 @@
+""" Tests for the ``export_wordifications()`` function. """
+import gzip
+import pathlib
+from typing import Set, List
+
+import pytest
+
+from telephone.engine import Engine
+from telephone.export import export_wordifications
+
+# pylint: disable=bad-continuation
+
+VOCAB = {"paint", "painter", "saint", "art", "ter", "cat", "act", "bat", "a"}
+NUMBERS = ["1-800-724-6837", "1-800-228-2287", "1-800-724-6837", " 1-222-333-4444\n"]
+
+
+def expected_lines() -> List[str]:
+    """ The export computed in memory. """
+    engine = Engine.from_vocabulary(VOCAB)
+    phonewords: Set[str] = set()
+    for number in NUMBERS:
+        phonewords |= engine.all_wordifications(number.strip())
+    return [phoneword + "\n" for phoneword in sorted(phonewords)]
+
+
+def test_export_matches_in_memory_sort(tmp_path: pathlib.Path) -> None:
+    """ A tiny budget and fan-in force many runs and passes without changing output. """
+    path = str(tmp_path / "export.txt")
+    stats = export_wordifications(
+        NUMBERS,
+        path,
+        vocabulary=VOCAB,
+        processes=1,
+        memory_budget=1,
+        chunk_size=1,
+        fan_in=2,
+        temp_dir=str(tmp_path),
+    )
+    with open(path, "r", encoding="utf-8") as export_file:
+        lines = export_file.readlines()
+    assert lines == expected_lines()
+    assert stats.numbers == len(NUMBERS)
+    assert stats.runs == len(NUMBERS)
+    assert stats.merge_passes == 2
+    assert stats.phonewords == len(lines)
+    assert [child.name for child in tmp_path.iterdir()] == ["export.txt"]
+
+
+def test_export_in_parallel_gzipped(tmp_path: pathlib.Path) -> None:
+    """ Workers' runs merge into the same gzipped output. """
+    path = str(tmp_path / "export.txt.gz")
+    stats = export_wordifications(
+        NUMBERS, path, vocabulary=VOCAB, processes=2, memory_budget=500, chunk_size=1
+    )
+    with gzip.open(path, "rt", encoding="utf-8") as export_file:
+        assert export_file.readlines() == expected_lines()
+    assert stats.merge_passes == 1
+
+
+def test_export_rejects_bad_arguments(tmp_path: pathlib.Path) -> None:
+    """ Invalid numbers and settings raise ``ValueError``. """
+    path = str(tmp_path / "export.txt")
+    with pytest.raises(ValueError):
+        export_wordifications(["not-a-number"], path, vocabulary=VOCAB, processes=1)
+    with pytest.raises(ValueError, match="18007246837.*MISSING_BASE"):
+        export_wordifications(["18007246837"], path, vocabulary=VOCAB, processes=1)
+    with pytest.raises(ValueError, match="MISSING_BASE"):
+        export_wordifications(["18007246837"], path, vocabulary=VOCAB, processes=2)
+    with pytest.raises(ValueError):
+        export_wordifications(NUMBERS, path, vocabulary=VOCAB, fan_in=1)
+    with pytest.raises(ValueError):
+        export_wordifications(NUMBERS, path, vocabulary=VOCAB, chunk_size=0)
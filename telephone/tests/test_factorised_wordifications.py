@@ -0,0 +1,66 @@
+""" Tests for the ``factorised_wordifications()`` function. """
+import json
+import datetime
+from typing import Set, Dict
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.all_wordifications import all_wordifications
+from telephone.factorised_wordifications import (
+    FactorisedWordifications,
+    factorised_wordifications,
+)
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+)
+
+# pylint: disable=bad-continuation
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+    st.dictionaries(
+        keys=st.from_regex(r"[A-Z]", fullmatch=True),
+        values=st.from_regex(r"[0-9]", fullmatch=True),
+        min_size=26,
+    ),
+)
+def test_factorised_wordifications_expands_to_all_wordifications(
+    number: str, vocab: Set[str], letter_map: Dict[str, str]
+) -> None:
+    """
+    Tests that expanding the factorised form gives exactly ``all_wordifications()``,
+    that ``count()`` agrees, and that no phoneword is produced twice.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    letter_map : ``Dict[str, str]``.
+        Maps uppercase English letters to digits.
+    """
+    expected = all_wordifications(number, US_FORMAT, vocab, letter_map)
+    factorised = factorised_wordifications(number, US_FORMAT, vocab, letter_map)
+    streamed = list(factorised)
+    assert len(streamed) == len(set(streamed)) == factorised.count()
+    assert factorised.expand() == expected
+
+
+def test_factorised_wordifications_manual() -> None:
+    """ Colliding words share a single template. """
+    vocab = {"paint", "saint", "painter", "art", "ter"}
+    factorised = factorised_wordifications("1-800-724-6837", vocabulary=vocab)
+    assert "1-800-{7246837}" in factorised.templates
+    assert "1-800-{72468}-{37}" not in factorised.templates
+    assert factorised.classes["72468"] == ("PAINT", "SAINT")
+    assert factorised.count() == len(factorised.templates) + 1
+    roundtrip = json.loads(json.dumps(factorised.to_dict()))
+    assert FactorisedWordifications.from_dict(roundtrip) == factorised
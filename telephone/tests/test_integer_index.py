@@ -0,0 +1,96 @@
+""" Tests for integer-encoded hashes and rolling-hash matching. """
+import time
+import datetime
+from typing import Set
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.utils import compute_vocab_map, compute_token_lattice
+from telephone.engine import Engine
+from telephone.factorised_wordifications import (
+    PlaceholderMap,
+    IntegerPlaceholderMap,
+    compute_hash_lattice,
+)
+from telephone.limits import Limits, Budget, LimitExceeded
+from telephone.all_wordifications import all_wordifications
+from telephone.number_to_words import compute_number_to_words
+from telephone.integer_index import (
+    encode_digits,
+    compute_integer_vocab_map,
+    compute_integer_lattice,
+    compute_wordifications_by_lattice,
+    compute_number_to_words_by_lattice,
+)
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+)
+
+# pylint: disable=bad-continuation
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+)
+def test_integer_path_matches_string_path(number: str, vocab: Set[str]) -> None:
+    """
+    Tests that rolling integer matching finds the same lattice, phonewords and single
+    substitution as substring matching.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    """
+    vocab_map = compute_vocab_map(vocab, US_LETTER_MAP)
+    integer_map = compute_integer_vocab_map(vocab_map)
+    hash_lengths = sorted({len(wordhash) for wordhash in vocab_map})
+    max_length = max(hash_lengths, default=0)
+    base_number = number.replace("-", "")[1:]
+
+    assert compute_integer_lattice(
+        base_number, integer_map, max_length
+    ) == compute_token_lattice(base_number, vocab_map)
+    assert compute_wordifications_by_lattice(
+        number, US_FORMAT, integer_map, max_length
+    ) == all_wordifications(number, US_FORMAT, vocab, US_LETTER_MAP)
+    assert compute_number_to_words_by_lattice(
+        number, US_FORMAT, integer_map, max_length
+    ) == compute_number_to_words(number, US_FORMAT, vocab_map, hash_lengths)
+    hash_lattice = compute_token_lattice(base_number, PlaceholderMap(vocab_map))
+    assert (
+        compute_integer_lattice(
+            base_number, IntegerPlaceholderMap(integer_map), max_length
+        )
+        == hash_lattice
+    )
+    assert (
+        compute_hash_lattice(compute_token_lattice(base_number, vocab_map))
+        == hash_lattice
+    )
+
+
+@given(st.from_regex(r"[0-9]*", fullmatch=True))
+def test_encode_digits_is_injective_on_digit_strings(digits: str) -> None:
+    """ Leading zeros and length survive the round trip. """
+    assert str(encode_digits(digits))[1:] == digits
+
+
+def test_engine_timeout_partial_is_bounded() -> None:
+    """ Rendering the partial result adds little to a timed-out engine call. """
+    vocab = set("abcdefghijklmnopqrstuvwxyz") | {"ab", "ba", "abc", "cab", "bac"}
+    engine = Engine.from_vocabulary(vocab)
+    started = time.monotonic()
+    with pytest.raises(LimitExceeded) as info:
+        engine.all_wordifications("1-222-222-2222", limits=Limits(timeout=0.05))
+    assert time.monotonic() - started < 0.5
+    assert 0 < len(info.value.partial) <= Budget.PARTIAL_LIMIT
@@ -0,0 +1,80 @@
+""" Tests for the ``Keypad`` class. """
+from typing import Set, Dict
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given
+
+from telephone.keypad import Keypad, US_KEYPAD, as_keypad
+from telephone.utils import compute_vocab_map
+from telephone.tests.test_constants import US_LETTER_MAP, LOWERCASE_ALPHA
+
+# pylint: disable=bad-continuation
+
+
+@given(st.from_regex(r"[A-Za-z]+", fullmatch=True))
+def test_keypad_translate_matches_letter_map(word: str) -> None:
+    """ Translation is the character-wise letter map lookup for both cases. """
+    expected = "".join([US_LETTER_MAP[char] for char in word.upper()])
+    assert US_KEYPAD.translate(word) == expected
+    assert US_KEYPAD.unmapped(word) == ""
+
+
+@given(
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+    st.dictionaries(
+        keys=st.from_regex(r"[A-Z]", fullmatch=True),
+        values=st.from_regex(r"[0-9]", fullmatch=True),
+        min_size=26,
+    ),
+)
+def test_keypad_is_interchangeable_with_dict(
+    vocab: Set[str], letter_map: Dict[str, str]
+) -> None:
+    """ A ``Keypad`` and its source dict build the same vocab map. """
+    assert compute_vocab_map(vocab, Keypad(letter_map)) == compute_vocab_map(
+        vocab, letter_map
+    )
+
+
+def test_keypad_digit_map_inverts_letter_map() -> None:
+    """ Every letter appears under exactly its own digit. """
+    assert US_KEYPAD.digit_map["2"] == "ABC"
+    assert US_KEYPAD.digit_map["7"] == "PQRS"
+    assert "1" not in US_KEYPAD.digit_map
+    for digit, letters in US_KEYPAD.digit_map.items():
+        for letter in letters:
+            assert US_KEYPAD.letter_map[letter] == digit
+
+
+def test_keypad_fingerprint_is_stable() -> None:
+    """ Equal layouts share a fingerprint regardless of insertion order. """
+    reordered = dict(reversed(list(US_LETTER_MAP.items())))
+    assert Keypad(reordered).fingerprint == US_KEYPAD.fingerprint
+    assert Keypad(reordered) == US_KEYPAD
+    altered = dict(US_LETTER_MAP, Z="0")
+    assert Keypad(altered).fingerprint != US_KEYPAD.fingerprint
+
+
+def test_keypad_rejects_malformed_layouts() -> None:
+    """ Keys must be uppercase letters and values single digits. """
+    with pytest.raises(ValueError):
+        Keypad({"a": "2"})
+    with pytest.raises(ValueError):
+        Keypad({"A": "22"})
+    assert US_KEYPAD.unmapped("A1B") == "1"
+
+
+def test_as_keypad_caches_dict_layouts() -> None:
+    """ Equal dicts compile once, and a later mutation gives a new layout. """
+    letter_map = dict(US_LETTER_MAP)
+    keypad = as_keypad(letter_map)
+    assert keypad == US_KEYPAD
+    assert as_keypad(dict(reversed(list(letter_map.items())))) is keypad
+    letter_map["Z"] = "0"
+    assert as_keypad(letter_map).letter_map["Z"] == "0"
+    assert as_keypad(US_KEYPAD) is US_KEYPAD
+    with pytest.raises(AttributeError):
+        keypad.table = {}
+    with pytest.raises(AttributeError):
+        del keypad.mask
@@ -0,0 +1,112 @@
+""" Tests for the resource limits of the wordification entry points. """
+import time
+import itertools
+from typing import Set
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given
+
+from telephone.limits import Limits, Budget, LimitExceeded, CancellationToken
+from telephone.all_wordifications import all_wordifications
+from telephone.number_to_words import number_to_words
+from telephone.words_to_number import words_to_number
+from telephone.page_wordifications import page_wordifications
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+)
+
+# pylint: disable=bad-continuation
+
+NUMBER = "1-222-333-2222"
+VOCAB = set("abcdefghijklmnopqrstuvwxyz") | {"ad", "be", "cab", "dab", "bead"}
+LARGE_VOCAB = {"".join(letters) for letters in itertools.product("abc", repeat=7)}
+
+
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+    st.integers(min_value=1, max_value=20),
+)
+def test_all_wordifications_max_results_partial_is_valid(
+    number: str, vocab: Set[str], max_results: int
+) -> None:
+    """
+    Tests that ``max_results`` either leaves the result untouched or raises with a
+    bounded subset of the full result.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    max_results : ``int``.
+        The limit under test.
+    """
+    expected = all_wordifications(number, US_FORMAT, vocab, US_LETTER_MAP)
+    limits = Limits(max_results=max_results)
+    try:
+        phonewords = all_wordifications(
+            number, US_FORMAT, vocab, US_LETTER_MAP, limits
+        )
+    except LimitExceeded as error:
+        assert error.reason == "max_results"
+        assert len(expected) > max_results
+        assert 0 < len(error.partial) <= max_results
+        assert error.partial <= expected
+    else:
+        assert phonewords == expected
+        assert len(expected) <= max_results
+
+
+def test_all_wordifications_max_states() -> None:
+    """ A tiny state budget stops a large enumeration. """
+    with pytest.raises(LimitExceeded) as info:
+        all_wordifications(NUMBER, US_FORMAT, VOCAB, limits=Limits(max_states=50))
+    assert info.value.reason == "max_states"
+    assert info.value.partial
+    for phoneword in info.value.partial:
+        assert words_to_number(phoneword, US_FORMAT) == NUMBER
+
+
+def test_limits_deadline_and_cancellation() -> None:
+    """ An expired deadline or a cancelled token stops every entry point. """
+    token = CancellationToken()
+    token.cancel()
+    for limits, reason in [
+        (Limits(deadline=time.monotonic() - 1.0), "deadline"),
+        (Limits(timeout=0.0), "deadline"),
+        (Limits(cancel=token), "cancelled"),
+    ]:
+        with pytest.raises(LimitExceeded) as info:
+            all_wordifications(NUMBER, US_FORMAT, VOCAB, limits=limits)
+        assert info.value.reason == reason
+        with pytest.raises(LimitExceeded):
+            page_wordifications(NUMBER, None, 5000, US_FORMAT, VOCAB, limits=limits)
+        with pytest.raises(LimitExceeded):
+            number_to_words(NUMBER, US_FORMAT, LARGE_VOCAB, limits=limits)
+
+
+def test_timeout_partial_is_bounded() -> None:
+    """ Rendering the partial result adds little to a timed-out call. """
+    vocab = set("abcdefghijklmnopqrstuvwxyz") | {"ab", "ba", "abc", "cab", "bac"}
+    started = time.monotonic()
+    with pytest.raises(LimitExceeded) as info:
+        all_wordifications("1-222-222-2222", "", vocab, limits=Limits(timeout=0.05))
+    assert time.monotonic() - started < 0.5
+    assert info.value.reason == "deadline"
+    assert 0 < len(info.value.partial) <= Budget.PARTIAL_LIMIT
+
+
+def test_page_partial_is_bounded() -> None:
+    """ A large page cut short keeps no more than the partial limit. """
+    with pytest.raises(LimitExceeded) as info:
+        page_wordifications(
+            NUMBER, None, 5000, US_FORMAT, VOCAB, limits=Limits(max_states=30000)
+        )
+    assert info.value.reason == "max_states"
+    assert len(info.value.partial) == Budget.PARTIAL_LIMIT
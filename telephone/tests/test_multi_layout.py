@@ -0,0 +1,104 @@
+""" Tests for the ``multi_layout_wordifications()`` function. """
+import time
+import string
+import datetime
+from typing import Set, Dict
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.limits import Limits, Budget, LimitExceeded
+from telephone.integer_index import compute_lattice_wordifications
+from telephone.all_wordifications import all_wordifications
+from telephone.multi_layout import LetterTrie, multi_layout_wordifications
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+)
+
+# pylint: disable=bad-continuation
+
+LEGACY_LETTER_MAP = {
+    letter: digit for letter, digit in US_LETTER_MAP.items() if letter not in "QZ"
+}
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+    st.dictionaries(
+        st.sampled_from(string.ascii_uppercase), st.sampled_from(string.digits)
+    ),
+)
+def test_multi_layout_matches_each_layout(
+    number: str, vocab: Set[str], custom: Dict[str, str]
+) -> None:
+    """
+    Tests that one pass gives, for every layout, what ``all_wordifications()`` gives
+    for the words that layout can spell.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    custom : ``Dict[str, str]``.
+        A letter map covering any subset of the alphabet.
+    """
+    layouts = {"us": US_LETTER_MAP, "legacy": LEGACY_LETTER_MAP, "custom": custom}
+    results = multi_layout_wordifications(number, layouts, US_FORMAT, vocab)
+    assert list(results) == list(layouts)
+    for name, layout in layouts.items():
+        spellable = {word for word in vocab if set(word.upper()) <= set(layout)}
+        expected = all_wordifications(number, US_FORMAT, spellable, layout)
+        assert results[name] == expected
+
+
+def test_multi_layout_skips_unmapped_letters() -> None:
+    """ Words using Q are only matched by layouts which map Q. """
+    layouts = {"us": US_LETTER_MAP, "legacy": LEGACY_LETTER_MAP}
+    results = multi_layout_wordifications("1-800-783-7867", layouts, "", {"quest"})
+    assert "1-800-QUEST-67" in results["us"]
+    assert results["legacy"] == {"1-800-783-7867"}
+    assert multi_layout_wordifications("", layouts, "", {"quest"}) == {
+        "us": set(),
+        "legacy": set(),
+    }
+
+
+def test_letter_trie_rejects_non_alpha_words() -> None:
+    """ Vocabulary words are checked as ``compute_vocab_map()`` checks them. """
+    with pytest.raises(ValueError):
+        LetterTrie({"paint", "x-ray"})
+
+
+def test_multi_layout_limits_bound_the_whole_call() -> None:
+    """ States and time are shared by the layouts rather than reset for each. """
+    vocab = set(string.ascii_lowercase) | {"ab", "ba", "abc", "cab", "bac"}
+    (lattice,) = LetterTrie(vocab).project([US_LETTER_MAP]).compute_lattices("2222222")
+    budget = Budget()
+    compute_lattice_wordifications("1", "2222222", "0-000-0000", lattice, 3, budget)
+    limits = Limits(max_states=budget.states * 3 // 2)
+    layouts = {"us": US_LETTER_MAP}
+    multi_layout_wordifications("1-222-2222", layouts, "", vocab, limits)
+    layouts["copy"] = US_LETTER_MAP
+    with pytest.raises(LimitExceeded) as info:
+        multi_layout_wordifications("1-222-2222", layouts, "", vocab, limits)
+    assert info.value.reason == "max_states"
+
+    started = time.monotonic()
+    with pytest.raises(LimitExceeded) as info:
+        multi_layout_wordifications(
+            "1-222-222-2222",
+            {"us": US_LETTER_MAP, "legacy": LEGACY_LETTER_MAP},
+            "",
+            vocab,
+            Limits(timeout=0.05),
+        )
+    assert time.monotonic() - started < 0.5
+    assert info.value.reason == "deadline"
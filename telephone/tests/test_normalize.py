@@ -0,0 +1,71 @@
+""" Tests for the ``normalize_numbers()`` function. """
+from typing import List
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given
+
+from telephone.normalize import normalize_numbers, NumberError
+from telephone.utils import validate, get_country_code_and_base, infer_format
+from telephone.tests.test_constants import US_NUMBER
+
+# pylint: disable=bad-continuation
+
+
+@given(
+    st.lists(
+        st.one_of(
+            st.from_regex(US_NUMBER, fullmatch=True),
+            st.from_regex(r"[0-9\- ]{0,8}", fullmatch=True),
+            st.text(max_size=6),
+        ),
+        max_size=30,
+    )
+)
+def test_normalize_numbers_agrees_with_scalar_functions(raw: List[str]) -> None:
+    """
+    Tests that each row is classified as ``validate()`` would, and that the columns
+    match the scalar helpers.
+
+    Parameters
+    ----------
+    raw : ``List[str]``.
+        A mix of valid US numbers, near misses and arbitrary text.
+    """
+    normalized = normalize_numbers(raw)
+    assert len(normalized.rows) == len(normalized.errors) == len(raw)
+    assert len(set(normalized.numbers)) == len(normalized.numbers)
+    for raw_number, row, error in zip(raw, normalized.rows, normalized.errors):
+        number = raw_number.strip()
+        if error is NumberError.OK:
+            validate(number)
+            assert normalized.numbers[row] == number
+            country_code, base_number = get_country_code_and_base(number)
+            assert normalized.country_codes[row] == country_code
+            assert normalized.base_numbers[row] == base_number
+            assert normalized.numformats[row] == infer_format(number)
+        else:
+            assert row == -1
+            if error is NumberError.INVALID_SEQUENCE:
+                with pytest.raises(ValueError):
+                    validate(number)
+
+
+def test_normalize_numbers_manual() -> None:
+    """ Manual check of deduplication and error codes. """
+    normalized = normalize_numbers(
+        ["1-800-724-6837", " 1-800-724-6837\n", "", "1--800", "1-8a0", "1800", "1-"]
+    )
+    assert normalized.numbers == ["1-800-724-6837"]
+    assert normalized.base_numbers == ["8007246837"]
+    assert normalized.numformats == ["0-000-000-0000"]
+    assert normalized.rows == [0, 0, -1, -1, -1, -1, -1]
+    assert normalized.errors == [
+        NumberError.OK,
+        NumberError.OK,
+        NumberError.EMPTY,
+        NumberError.INVALID_SEQUENCE,
+        NumberError.INVALID_CHARACTERS,
+        NumberError.MISSING_BASE,
+        NumberError.MISSING_BASE,
+    ]
@@ -0,0 +1,84 @@
+""" Tests for the ``page_wordifications()`` function. """
+import datetime
+from typing import Set, List, Optional
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.all_wordifications import all_wordifications
+from telephone.page_wordifications import page_wordifications
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+)
+
+# pylint: disable=bad-continuation
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+    st.integers(min_value=1, max_value=7),
+)
+def test_page_wordifications_pages_partition_all_wordifications(
+    number: str, vocab: Set[str], limit: int
+) -> None:
+    """
+    Tests that walking every page yields each phoneword from ``all_wordifications()``
+    exactly once, with no page longer than ``limit``.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    limit : ``int``.
+        Page size.
+    """
+    expected: Set[str] = all_wordifications(number, US_FORMAT, vocab, US_LETTER_MAP)
+    seen: List[str] = []
+    cursor: Optional[str] = None
+    while True:
+        page, cursor = page_wordifications(
+            number, cursor, limit, US_FORMAT, vocab, US_LETTER_MAP
+        )
+        assert len(page) <= limit
+        seen.extend(page)
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen))
+    assert set(seen) == expected
+
+
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+)
+def test_page_wordifications_is_deterministic(number: str, vocab: Set[str]) -> None:
+    """ A resumed page is identical to the same slice of one large page. """
+    whole, _ = page_wordifications(number, None, 10, US_FORMAT, vocab, US_LETTER_MAP)
+    first, cursor = page_wordifications(
+        number, None, 4, US_FORMAT, vocab, US_LETTER_MAP
+    )
+    assert first == whole[:4]
+    if cursor is not None:
+        second, _ = page_wordifications(
+            number, cursor, 6, US_FORMAT, vocab, US_LETTER_MAP
+        )
+        assert second == whole[4:10]
+
+
+def test_page_wordifications_rejects_foreign_cursor() -> None:
+    """ Cursors are bound to the number and vocabulary they were issued for. """
+    vocab = {"paint", "painter", "art"}
+    _, cursor = page_wordifications("1-800-724-6837", None, 1, vocabulary=vocab)
+    assert cursor is not None
+    with pytest.raises(ValueError):
+        page_wordifications("1-800-724-6838", cursor, 1, vocabulary=vocab)
+    with pytest.raises(ValueError):
+        page_wordifications("1-800-724-6837", "not-a-cursor", 1, vocabulary=vocab)
@@ -0,0 +1,103 @@
+""" Tests for the ``Planner`` class and its cost model. """
+import pathlib
+import datetime
+from typing import Set
+
+import pytest
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.engine import Engine
+from telephone.limits import Limits
+from telephone.planner import (
+    STRATEGIES,
+    CostModel,
+    Planner,
+    calibrate,
+    fit_line,
+)
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+)
+
+# pylint: disable=bad-continuation
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+)
+def test_every_strategy_agrees(number: str, vocab: Set[str]) -> None:
+    """
+    Tests that the planner's choice cannot change a result: every candidate strategy
+    gives the engine's answer.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    """
+    engine = Engine.from_vocabulary(vocab, US_LETTER_MAP)
+    planner = Planner(engine, processes=1)
+    expected = engine.all_wordifications(number, US_FORMAT)
+    lattice = planner.plan(number).lattice
+    for strategy in STRATEGIES["all"]:
+        assert planner.execute(strategy, number, US_FORMAT, None) == expected
+        assert planner.execute(strategy, number, US_FORMAT, None, lattice) == expected
+    for strategy in STRATEGIES["one"]:
+        assert planner.execute(
+            strategy, number, US_FORMAT, None
+        ) == engine.number_to_words(number, US_FORMAT)
+    assert planner.all_wordifications(number, US_FORMAT) == expected
+    assert planner.count_wordifications(number) == len(expected)
+    assert planner.plan(number).features.results == len(expected)
+    assert planner.features(number, "all").templates == len(
+        engine.factorised_wordifications(number, US_FORMAT).templates
+    )
+
+
+def test_templates_count_one_letter_hashes_apart_from_digits() -> None:
+    """ A one-letter hash and the digit it replaces make distinct templates. """
+    engine = Engine.from_vocabulary({"a", "b", "c", "ab"})
+    features = Planner(engine).features("1-222", "all")
+    assert features.templates == 12
+    factorised = engine.factorised_wordifications("1-222")
+    assert features.templates == len(factorised.templates)
+
+
+def test_plan_follows_costs() -> None:
+    """ The cheapest candidate is chosen, limits exclude inexact strategies. """
+    engine = Engine.from_vocabulary({"paint", "painter", "saint", "art", "ter"})
+    cheap_dp = CostModel({"substring_dp": (0.0, 0.0)})
+    planner = Planner(engine, cheap_dp)
+    assert planner.plan("1-800-724-6837").strategy == "substring_dp"
+    assert "sharded" not in planner.plan("1-800-724-6837").estimates
+
+    cheap_factorised = Planner(engine, CostModel({"factorised": (0.0, 0.0)}))
+    assert cheap_factorised.plan("1-800-724-6837").strategy == "factorised"
+    limited = cheap_factorised.plan("1-800-724-6837", limits=Limits(max_results=5))
+    assert "factorised" not in limited.estimates
+
+    explanation = planner.explain("1-800-724-6837", "count")
+    assert "strategy=count_lattice" in explanation
+    assert "results=%d" % planner.count_wordifications("1-800-724-6837") in explanation
+    with pytest.raises(ValueError):
+        planner.plan("1-800-724-6837", "some")
+
+
+def test_calibration_round_trips(tmp_path: pathlib.Path) -> None:
+    """ A calibrated model saves, loads and fits lines exactly. """
+    assert fit_line([(0.0, 1.0), (2.0, 5.0), (4.0, 9.0)]) == (1.0, 2.0)
+    assert fit_line([(3.0, 1.0), (3.0, 2.0)]) is None
+
+    engine = Engine.from_vocabulary({"paint", "painter", "saint", "art", "ter", "a"})
+    costs = calibrate(engine, ["1-800-724-6837", "1-22-33", "1-2"], repeats=1)
+    path = str(tmp_path / "costs.json")
+    costs.to_json(path)
+    assert CostModel.from_json(path).coefficients == costs.coefficients
@@ -0,0 +1,68 @@
+""" Differential tests of every fast path against the frozen reference. """
+import datetime
+from typing import Set
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+from hypothesis.strategies._internal.core import DataObject
+
+from telephone.regression import compute_paths, check_path, find_regressions
+from telephone.tests.generators import generate_phoneword
+from telephone.tests.test_constants import US_NUMBER, LOWERCASE_ALPHA, US_FORMAT
+
+# pylint: disable=bad-continuation
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+)
+def test_number_paths_match_reference(number: str, vocab: Set[str]) -> None:
+    """
+    Tests every ``all_wordifications`` and ``number_to_words`` path against the
+    frozen reference.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    """
+    paths = compute_paths(vocab)
+    for name in paths:
+        if not name.startswith("words_to_number/"):
+            check_path(paths, name, number)
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(st.data())
+def test_phoneword_paths_match_reference(data: DataObject) -> None:
+    """
+    Tests every ``words_to_number`` path against the frozen reference.
+
+    Parameters
+    ----------
+    data : ``DataObject``.
+        Hypothesis data generator, used by ``generate_phoneword()``.
+    """
+    phoneword = generate_phoneword(data, US_FORMAT)
+    paths = compute_paths(set())
+    for name in paths:
+        if name.startswith("words_to_number/"):
+            check_path(paths, name, phoneword)
+
+
+def test_find_regressions_applies_tolerance() -> None:
+    """ Only paths slower than the baseline by more than the tolerance are flagged. """
+    baseline = {"all_wordifications/engine": 0.1, "number_to_words/engine": 0.02}
+    timings = {
+        "all_wordifications/engine": 0.12,
+        "number_to_words/engine": 0.04,
+        "words_to_number/engine": 5.0,
+    }
+    regressions = find_regressions(timings, baseline, 0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("number_to_words/engine: 0.040x")
+    assert regressions[0].endswith("(+100%)")
@@ -0,0 +1,98 @@
+""" Tests for the ``sample_wordifications()`` function. """
+import datetime
+import collections
+from typing import Set
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.all_wordifications import all_wordifications
+from telephone.sample_wordifications import sample_wordifications
+from telephone.words_to_number import words_to_number
+from telephone.utils import (
+    compute_vocab_map,
+    compute_token_lattice,
+    count_lattice_paths,
+)
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+)
+
+# pylint: disable=bad-continuation
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+    st.integers(min_value=0, max_value=30),
+    st.integers(),
+)
+def test_sample_wordifications_is_reproducible_subset(
+    number: str, vocab: Set[str], k: int, seed: int
+) -> None:
+    """
+    Tests that a sample is a set of distinct phonewords from ``all_wordifications()``,
+    of the right size, and that a seed always gives the same sample.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    k : ``int``.
+        Sample size.
+    seed : ``int``.
+        Random seed.
+    """
+    expected = all_wordifications(number, US_FORMAT, vocab, US_LETTER_MAP)
+    sample = sample_wordifications(number, k, seed, US_FORMAT, vocab, US_LETTER_MAP)
+    assert len(sample) == min(k, len(expected))
+    assert len(set(sample)) == len(sample)
+    assert set(sample) <= expected
+    assert sample == sample_wordifications(
+        number, k, seed, US_FORMAT, vocab, US_LETTER_MAP
+    )
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+)
+def test_lattice_counts_match_all_wordifications(number: str, vocab: Set[str]) -> None:
+    """ The suffix recurrence counts exactly the phonewords of the full DP. """
+    base_number = number.replace("-", "")[1:]
+    vocab_map = compute_vocab_map(vocab, US_LETTER_MAP)
+    lattice = compute_token_lattice(base_number, vocab_map)
+    expected = all_wordifications(number, US_FORMAT, vocab, US_LETTER_MAP)
+    assert count_lattice_paths(lattice)[0] == len(expected)
+
+
+def test_sample_wordifications_is_uniform() -> None:
+    """ Single draws hit each of a small result set about equally often. """
+    number = "1-222-2"
+    vocab = {"a", "b", "ab", "ba", "cab"}
+    population = all_wordifications(number, "0-000-0", vocab)
+    frequencies = collections.Counter(
+        sample_wordifications(number, 1, seed, "0-000-0", vocab)[0]
+        for seed in range(200 * len(population))
+    )
+    assert set(frequencies) == population
+    assert min(frequencies.values()) > 100
+    assert max(frequencies.values()) < 300
+
+
+def test_sample_wordifications_beyond_machine_size() -> None:
+    """ Counts too large for ``random.sample()`` still sample distinct phonewords. """
+    number = "1-" + "2" * 60
+    vocab = {"a", "b", "c", "ab", "ba", "abc", "cab"}
+    sample = sample_wordifications(number, 2, 0, "", vocab)
+    assert len(set(sample)) == 2
+    for phoneword in sample:
+        assert words_to_number(phoneword, "0-" + "0" * 60) == number
+    assert sample == sample_wordifications(number, 2, 0, "", vocab)
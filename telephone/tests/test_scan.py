@@ -0,0 +1,93 @@
+""" Tests for the ``run_scan()`` function. """
+import pathlib
+from typing import List, Optional
+
+import pytest
+
+from telephone.engine import Engine
+from telephone.scan import ScanProgress, run_scan, iter_scan_results
+
+# pylint: disable=bad-continuation
+
+VOCAB = {"paint", "painter", "saint", "art", "ter", "cat", "act"}
+NUMBERS = [
+    "1-800-724-6837",
+    "1-800-228-2287",
+    "not-a-number",
+    "1-222-333-4444",
+    "18007246837",
+] * 3
+
+
+class Interrupt(Exception):
+    """ Simulates a crash part way through a scan. """
+
+
+def test_scan_resumes_after_interruption(tmp_path: pathlib.Path) -> None:
+    """ An interrupted scan, rerun, writes exactly what an uninterrupted one does. """
+    reference = str(tmp_path / "reference.db")
+    run_scan(NUMBERS, reference, "all_wordifications", vocabulary=VOCAB, processes=1)
+
+    reports: List[ScanProgress] = []
+
+    def crash_after_two_chunks(report: ScanProgress) -> None:
+        reports.append(report)
+        if len(reports) == 2:
+            raise Interrupt()
+
+    resumed = str(tmp_path / "resumed.db")
+    with pytest.raises(Interrupt):
+        run_scan(
+            NUMBERS,
+            resumed,
+            "all_wordifications",
+            vocabulary=VOCAB,
+            processes=1,
+            chunk_size=5,
+            progress=crash_after_two_chunks,
+        )
+    assert reports[-1].done == 10
+    assert reports[-1].total == len(NUMBERS)
+
+    final = run_scan(
+        NUMBERS,
+        resumed,
+        "all_wordifications",
+        vocabulary=VOCAB,
+        processes=2,
+        chunk_size=5,
+        progress=reports.append,
+    )
+    assert final.done == len(NUMBERS)
+    assert final.eta == 0.0
+    assert list(iter_scan_results(resumed)) == list(iter_scan_results(reference))
+
+
+def test_scan_rows_match_engine(tmp_path: pathlib.Path) -> None:
+    """ Each number gets its engine result, or the error it raised. """
+    database = str(tmp_path / "scan.db")
+    run_scan(iter(NUMBERS), database, vocabulary=VOCAB, processes=1, chunk_size=3)
+    engine = Engine.from_vocabulary(VOCAB)
+    rows = list(iter_scan_results(database))
+    assert [position for position, _, _, _ in rows] == list(range(len(NUMBERS)))
+    for position, number, phoneword, error in rows:
+        assert number == NUMBERS[position]
+        expected: Optional[str] = None
+        if number not in ("not-a-number", "18007246837"):
+            expected = engine.number_to_words(number)
+        assert phoneword == expected
+        assert (error is None) == (expected is not None)
+        if number == "18007246837":
+            assert error == "MISSING_BASE"
+
+
+def test_scan_rejects_changed_settings(tmp_path: pathlib.Path) -> None:
+    """ Resuming with different settings or inventory is an error. """
+    database = str(tmp_path / "scan.db")
+    run_scan(NUMBERS[:4], database, vocabulary=VOCAB, processes=1, chunk_size=2)
+    with pytest.raises(ValueError):
+        run_scan(NUMBERS[:4], database, vocabulary=VOCAB, processes=1, chunk_size=3)
+    with pytest.raises(ValueError):
+        run_scan(NUMBERS[:4], database, vocabulary={"cat"}, processes=1, chunk_size=2)
+    with pytest.raises(ValueError):
+        run_scan(NUMBERS[3::-1], database, vocabulary=VOCAB, processes=1, chunk_size=2)
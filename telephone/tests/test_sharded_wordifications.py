@@ -0,0 +1,78 @@
+""" Tests for the ``iter_sharded_wordifications()`` function. """
+import time
+import string
+import datetime
+from typing import Set
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+from telephone.engine import Engine
+from telephone.all_wordifications import all_wordifications
+from telephone.sharded_wordifications import iter_sharded_wordifications
+from telephone.tests.test_constants import (
+    US_NUMBER,
+    LOWERCASE_ALPHA,
+    US_LETTER_MAP,
+    US_FORMAT,
+)
+
+# pylint: disable=bad-continuation
+
+
+@settings(deadline=datetime.timedelta(milliseconds=20000))
+@given(
+    st.from_regex(US_NUMBER, fullmatch=True),
+    st.sets(st.from_regex(LOWERCASE_ALPHA, fullmatch=True)),
+    st.integers(min_value=1, max_value=16),
+)
+def test_shards_partition_all_wordifications(
+    number: str, vocab: Set[str], shards: int
+) -> None:
+    """
+    Tests that the shards are disjoint and together give ``all_wordifications()``.
+
+    Parameters
+    ----------
+    number : ``str``.
+        A valid US phone number with country code and dashes.
+    vocab : ``Set[str]``.
+        A set of strings consisting of lowercase alpha characters only. All nonempty.
+    shards : ``int``.
+        Target shard count, run in-process.
+    """
+    streamed = list(
+        iter_sharded_wordifications(
+            number, US_FORMAT, vocab, US_LETTER_MAP, 1, shards_per_process=shards
+        )
+    )
+    assert len(streamed) == len(set(streamed))
+    assert set(streamed) == all_wordifications(number, US_FORMAT, vocab, US_LETTER_MAP)
+
+
+def test_sharded_wordifications_across_processes() -> None:
+    """ Worker processes return the same phonewords as the serial DP. """
+    vocab = set("abcdefghijklmnopqrstuvwxyz") | {"paint", "painter", "art"}
+    number = "1-800-724-6837"
+    streamed = list(iter_sharded_wordifications(number, vocabulary=vocab, processes=2))
+    assert len(streamed) == len(set(streamed))
+    assert set(streamed) == all_wordifications(number, vocabulary=vocab)
+
+    engine = Engine.from_vocabulary(vocab)
+    assert sorted(engine.iter_sharded_wordifications(number, processes=2)) == sorted(
+        streamed
+    )
+
+
+def test_abandoned_stream_stops_remaining_shards() -> None:
+    """ Closing a stream early does not wait for the shards still queued. """
+    vocab = set(string.ascii_lowercase) | {"ab", "ba", "abc", "cab", "bac"}
+    number = "1-222-222-22"
+    started = time.monotonic()
+    stream = iter_sharded_wordifications(
+        number, vocabulary=vocab, processes=2, shards_per_process=16
+    )
+    next(stream)
+    first = time.monotonic() - started
+    stream.close()
+    assert time.monotonic() - started < 2 * first + 1.0
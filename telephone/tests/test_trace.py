@@ -0,0 +1,139 @@
+""" Tests for trace recording and replay. """
+import pathlib
+
+import pytest
+
+from telephone.engine import Engine, run_batch
+from telephone.limits import Limits, LimitExceeded
+from telephone.all_wordifications import all_wordifications
+from telephone.number_to_words import number_to_words
+from telephone.words_to_number import words_to_number
+from telephone.trace import (
+    TraceRecord,
+    TraceRecorder,
+    TracingEngine,
+    anonymise,
+    trace_function,
+    read_trace,
+    engine_caller,
+    module_caller,
+    replay,
+)
+
+# pylint: disable=bad-continuation
+
+VOCAB = {"paint", "painter", "saint", "art", "ter"}
+
+
+def test_anonymise_is_consistent_and_keeps_shape() -> None:
+    """ Pseudonyms keep the prefix, dashes and character classes, and repetition. """
+    key = b"k" * 32
+    pseudonym = anonymise("1-800-724-6837", key)
+    assert pseudonym == anonymise("1-800-724-6837", key)
+    assert pseudonym != anonymise("1-800-724-6837", b"j" * 32)
+    assert pseudonym.startswith("1-800-")
+    assert [len(part) for part in pseudonym.split("-")] == [1, 3, 3, 4]
+    assert pseudonym.replace("-", "").isdigit()
+
+    phoneword = anonymise("1-800-PAINTER", key)
+    assert phoneword.startswith("1-800-")
+    assert phoneword[6:].isalpha() and len(phoneword) == len("1-800-PAINTER")
+
+    vanity = anonymise("1-FLOWERS-4", key)
+    assert vanity != anonymise("1-FLOWERS-4", b"j" * 32)
+    assert vanity.startswith("1-") and "FLO" not in vanity
+    assert [len(part) for part in vanity.split("-")] == [1, 7, 1]
+    assert vanity[2:9].isalpha() and vanity[10].isdigit()
+
+
+def test_record_and_replay(tmp_path: pathlib.Path) -> None:
+    """ Recorded calls replay against the engine with a full report. """
+    engine = Engine.from_vocabulary(VOCAB)
+    path = str(tmp_path / "trace.jsonl")
+    with TraceRecorder(path) as recorder:
+        tracing = TracingEngine(engine, recorder)
+        numbers = ["1-800-724-6837"] * 6 + ["1-212-555-0100"]
+        run_batch(tracing.all_wordifications, numbers, max_workers=2)
+        assert tracing.number_to_words("1-800-724-6837") == "1-800-PAINTER"
+        phoneword = "1-800-PAINTER"
+        assert tracing.words_to_number(phoneword, "0-000-000-0000") == "1-800-724-6837"
+        with pytest.raises(ValueError):
+            tracing.all_wordifications("1-800-PAINTER")
+
+    records = list(read_trace(path))
+    assert len(records) == 10
+    text = pathlib.Path(path).read_text()
+    assert "724-6837" not in text and "PAINTER" not in text
+    assert records[-1].error == "ValueError"
+    assert all(record.fingerprint == engine.index.fingerprint for record in records)
+    pseudonyms = [record.arguments["number"] for record in records[:7]]
+    assert sorted(pseudonyms.count(pseudonym) for pseudonym in set(pseudonyms)) == [
+        1,
+        6,
+    ]
+    assert records[8].arguments == {
+        "phoneword": records[8].arguments["phoneword"],
+        "numformat": "0-000-000-0000",
+    }
+    assert records[0].arguments["limits"] == {}
+
+    for speedup in (0.0, 1000.0):
+        report = replay(
+            records,
+            engine_caller(engine),
+            speedup=speedup,
+            concurrency=3,
+            fingerprint=engine.index.fingerprint,
+        )
+        assert report.calls == 10
+        assert report.errors == 1
+        assert report.fingerprint_mismatches == 0
+        assert report.latencies["p50"] <= report.latencies["max"]
+        assert report.throughput > 0
+        assert "10 calls" in str(report)
+
+
+def test_module_functions_record_arguments(tmp_path: pathlib.Path) -> None:
+    """ Module-level calls are recorded with their format and limits, and replay. """
+    engine = Engine.from_vocabulary(VOCAB)
+    path = str(tmp_path / "trace.jsonl")
+    with TraceRecorder(path) as recorder:
+        traced_all = trace_function(all_wordifications, recorder)
+        traced_one = trace_function(
+            number_to_words, recorder, engine.index.fingerprint
+        )
+        traced_reverse = trace_function(words_to_number, recorder)
+        limits = Limits(max_results=1, timeout=60.0)
+        with pytest.raises(LimitExceeded):
+            traced_all("1-800-724-6837", "0-000-000-0000", VOCAB, limits=limits)
+        phoneword = traced_one("1-800-724-6837", vocabulary=VOCAB)
+        assert words_to_number(phoneword, "0-000-000-0000") == "1-800-724-6837"
+        assert traced_reverse("1-800-PAINTER", "0-000-000-0000") == "1-800-724-6837"
+
+    records = list(read_trace(path))
+    assert [record.function for record in records] == [
+        "all_wordifications",
+        "number_to_words",
+        "words_to_number",
+    ]
+    assert records[0].arguments["numformat"] == "0-000-000-0000"
+    assert records[0].arguments["limits"] == {"max_results": 1, "timeout": 60.0}
+    assert records[0].error == "LimitExceeded"
+    assert records[1].fingerprint == engine.index.fingerprint
+    assert records[2].fingerprint == ""
+
+    # Replays repeat the recorded call, limits included.
+    record = TraceRecord(
+        0.0,
+        "all_wordifications",
+        dict(records[0].arguments, number="1-800-724-6837"),
+        "",
+        0.0,
+        None,
+    )
+    for call in (engine_caller(engine), module_caller(VOCAB)):
+        with pytest.raises(LimitExceeded):
+            call(record)
+    report = replay(records, module_caller(VOCAB), speedup=0.0)
+    assert report.calls == 3
+    assert report.fingerprint_mismatches == 0
@@ -0,0 +1,522 @@
+""" Recording of anonymised call traces and their replay as a load test. """
+import hmac
+import json
+import time
+import string
+import inspect
+import hashlib
+import secrets
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    IO,
+    Any,
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Mapping,
+    Iterable,
+    Iterator,
+    Callable,
+    Optional,
+    NamedTuple,
+)
+
+from telephone.keypad import LetterMap, US_KEYPAD
+from telephone.engine import Engine
+from telephone.limits import Limits
+from telephone.all_wordifications import all_wordifications
+from telephone.number_to_words import number_to_words
+from telephone.words_to_number import words_to_number
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+# pylint: disable=bad-continuation, too-many-arguments, too-many-locals
+
+# Characters of a number or phoneword kept verbatim: the country code, its dash,
+# and the first three digits of the base, which identify toll-free ranges. Letters
+# are never kept, and end the prefix early, so no part of a vanity word survives.
+KEPT_PREFIX = 3
+
+
+class TraceRecord(NamedTuple):
+    """
+    One recorded call.
+
+    Attributes
+    ----------
+    timestamp : ``float``.
+        Seconds from the start of the trace to the start of the call.
+    function : ``str``.
+        Name of the ``Engine`` method or module-level function called.
+    arguments : ``Dict[str, Any]``.
+        The anonymised ``number`` or ``phoneword``, the ``numformat``, and for
+        wordification calls the ``limits`` as a dict of ``max_results``,
+        ``max_states`` and ``timeout``, with any deadline converted to seconds from
+        the start of the call. Cancellation tokens are not recorded.
+    fingerprint : ``str``.
+        Fingerprint of the ``VocabIndex`` the call used, or ``""`` if unknown.
+    latency : ``float``.
+        Seconds the call took.
+    error : ``Optional[str]``.
+        Name of the exception raised, if any.
+    """
+
+    timestamp: float
+    function: str
+    arguments: Dict[str, Any]
+    fingerprint: str
+    latency: float
+    error: Optional[str]
+
+
+def anonymise(value: str, key: bytes) -> str:
+    """
+    Replaces each letter, and each digit after the kept prefix of leading digits, of
+    a number or phoneword with one derived from a keyed hash of the whole value,
+    preserving dashes and the class of each character. Equal values map to equal
+    pseudonyms under one key, so the repetition in a trace survives, but values
+    cannot be recovered without it.
+    """
+    country_code, dash, rest = value.partition("-")
+    kept = 0
+    digest = b""
+    counter = 0
+    characters: List[str] = []
+    for character in rest:
+        if not character.isalnum() or (kept < KEPT_PREFIX and character.isdigit()):
+            kept += character.isalnum()
+            characters.append(character)
+            continue
+        kept = KEPT_PREFIX
+        if not digest:
+            message = b"%d:%s" % (counter, value.encode())
+            digest = hmac.new(key, message, hashlib.sha256).digest()
+            counter += 1
+        byte, digest = digest[0], digest[1:]
+        if character.isdigit():
+            characters.append(string.digits[byte % 10])
+        else:
+            characters.append(string.ascii_uppercase[byte % 26])
+    return country_code + dash + "".join(characters)
+
+
+class TraceRecorder:
+    """
+    Appends ``TraceRecord`` lines to a JSON lines file. Safe to share between
+    threads.
+
+    Parameters
+    ----------
+    path : ``str``.
+        File to append to.
+    key : ``Optional[bytes]``.
+        Key for ``anonymise()``. A random one is used if omitted, so pseudonyms are
+        only consistent within one recorder.
+    """
+
+    def __init__(self, path: str, key: Optional[bytes] = None) -> None:
+        self.key = secrets.token_bytes(32) if key is None else key
+        self.started = time.monotonic()
+        self._file: IO[str] = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        function: str,
+        arguments: Mapping[str, Any],
+        fingerprint: str,
+        started: float,
+        latency: float,
+        error: Optional[str] = None,
+    ) -> None:
+        """ Writes one call, given its ``time.monotonic()`` start and latency. """
+        record = TraceRecord(
+            started - self.started,
+            function,
+            dict(arguments),
+            fingerprint,
+            latency,
+            error,
+        )
+        line = json.dumps(record._asdict(), sort_keys=True)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """ Closes the trace file. """
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+def limit_settings(limits: Optional[Limits], started: float) -> Dict[str, Any]:
+    """
+    The replayable settings of ``limits`` for a call starting at ``started``, with
+    any deadline converted to a timeout.
+    """
+    if limits is None:
+        return {}
+    timeout = limits.timeout
+    if limits.deadline is not None:
+        remaining = limits.deadline - started
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    settings = {
+        "max_results": limits.max_results,
+        "max_states": limits.max_states,
+        "timeout": timeout,
+    }
+    return {name: value for name, value in settings.items() if value is not None}
+
+
+def record_call(
+    recorder: TraceRecorder,
+    function: str,
+    value: str,
+    numformat: str,
+    limits: Optional[Limits],
+    fingerprint: str,
+    call: Callable[[], Any],
+) -> Any:
+    """
+    Runs ``call``, recording it to ``recorder`` as ``function`` of ``value`` with
+    the given ``numformat`` and ``limits``.
+    """
+    name = "phoneword" if function == "words_to_number" else "number"
+    arguments: Dict[str, Any] = {
+        name: anonymise(value, recorder.key),
+        "numformat": numformat,
+    }
+    error: Optional[str] = None
+    started = time.monotonic()
+    if function != "words_to_number":
+        arguments["limits"] = limit_settings(limits, started)
+    try:
+        return call()
+    except Exception as exception:
+        error = type(exception).__name__
+        raise
+    finally:
+        latency = time.monotonic() - started
+        recorder.record(function, arguments, fingerprint, started, latency, error)
+
+
+class TracingEngine:
+    """
+    An ``Engine`` whose public entry points record each call to ``recorder``, with
+    numbers and phonewords anonymised. Pass its methods to ``run_batch()`` to trace
+    batch scans as well as single requests.
+
+    Parameters
+    ----------
+    engine : ``Engine``.
+        The engine to compute with.
+    recorder : ``TraceRecorder``.
+        Where to record calls.
+    """
+
+    def __init__(self, engine: Engine, recorder: TraceRecorder) -> None:
+        self.engine = engine
+        self.recorder = recorder
+
+    def _traced(
+        self,
+        function: str,
+        value: str,
+        numformat: str,
+        limits: Optional[Limits],
+        call: Callable[[], Any],
+    ) -> Any:
+        """ Runs ``call``, recording it as ``function`` of ``value``. """
+        fingerprint = self.engine.index.fingerprint
+        return record_call(
+            self.recorder, function, value, numformat, limits, fingerprint, call
+        )
+
+    def all_wordifications(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> Set[str]:
+        """ As ``Engine.all_wordifications()``, recorded. """
+        result: Set[str] = self._traced(
+            "all_wordifications",
+            number,
+            numformat,
+            limits,
+            lambda: self.engine.all_wordifications(number, numformat, limits),
+        )
+        return result
+
+    def number_to_words(
+        self, number: str, numformat: str = "", limits: Optional[Limits] = None
+    ) -> str:
+        """ As ``Engine.number_to_words()``, recorded. """
+        result: str = self._traced(
+            "number_to_words",
+            number,
+            numformat,
+            limits,
+            lambda: self.engine.number_to_words(number, numformat, limits),
+        )
+        return result
+
+    def words_to_number(self, phoneword: str, numformat: str = "") -> str:
+        """ As ``Engine.words_to_number()``, recorded. """
+        result: str = self._traced(
+            "words_to_number",
+            phoneword,
+            numformat,
+            None,
+            lambda: self.engine.words_to_number(phoneword, numformat),
+        )
+        return result
+
+
+def trace_function(
+    function: Callable[..., Any], recorder: TraceRecorder, fingerprint: str = ""
+) -> Callable[..., Any]:
+    """
+    Wraps one of the module-level ``all_wordifications()``, ``number_to_words()``
+    or ``words_to_number()`` so that each call is recorded to ``recorder``. The
+    wrapper takes the same arguments as ``function``.
+
+    Parameters
+    ----------
+    function : ``Callable[..., Any]``.
+        The function to trace.
+    recorder : ``TraceRecorder``.
+        Where to record calls.
+    fingerprint : ``str``.
+        Recorded with each call to identify the vocabulary and letter map passed
+        to it, e.g. ``VocabIndex.from_vocabulary(vocabulary).fingerprint``. Left
+        empty, replays do not check the vocabulary of these records.
+    """
+    signature = inspect.signature(function)
+
+    @functools.wraps(function)
+    def traced(*args: Any, **kwargs: Any) -> Any:
+        arguments = signature.bind(*args, **kwargs).arguments
+        value = arguments.get("number", arguments.get("phoneword", ""))
+        return record_call(
+            recorder,
+            function.__name__,
+            value,
+            arguments.get("numformat", ""),
+            arguments.get("limits"),
+            fingerprint,
+            lambda: function(*args, **kwargs),
+        )
+
+    return traced
+
+
+def read_trace(path: str) -> Iterator[TraceRecord]:
+    """ Streams the records of a trace written by ``TraceRecorder``. """
+    with open(path, "r", encoding="utf-8") as trace_file:
+        for line in trace_file:
+            if line.strip():
+                yield TraceRecord(**json.loads(line))
+
+
+def replay_arguments(record: TraceRecord) -> Tuple[str, Dict[str, Any]]:
+    """
+    The number or phoneword of ``record``, and the keyword arguments with which to
+    repeat its call. A recorded timeout restarts from the replayed call.
+    """
+    arguments = record.arguments
+    value = arguments["phoneword" if "phoneword" in arguments else "number"]
+    keywords: Dict[str, Any] = {"numformat": arguments.get("numformat", "")}
+    if "limits" in arguments:
+        keywords["limits"] = Limits(**arguments["limits"])
+    return value, keywords
+
+
+def engine_caller(engine: Engine) -> Callable[[TraceRecord], Any]:
+    """
+    Returns a function which replays a record by calling ``engine`` directly. Other
+    targets, such as a client of a local server, can be replayed by passing any
+    function of a ``TraceRecord`` to ``replay()`` instead.
+    """
+
+    def call(record: TraceRecord) -> Any:
+        value, keywords = replay_arguments(record)
+        return getattr(engine, record.function)(value, **keywords)
+
+    return call
+
+
+def module_caller(
+    vocabulary: Set[str], letter_map: LetterMap = US_KEYPAD
+) -> Callable[[TraceRecord], Any]:
+    """
+    Returns a function which replays a record through the module-level function it
+    names, with ``vocabulary`` and ``letter_map``. Each call recompiles the
+    vocabulary, as the module-level functions always do.
+    """
+    functions: Dict[str, Callable[..., Any]] = {
+        "all_wordifications": all_wordifications,
+        "number_to_words": number_to_words,
+    }
+
+    def call(record: TraceRecord) -> Any:
+        value, keywords = replay_arguments(record)
+        if record.function == "words_to_number":
+            return words_to_number(value, letter_map=letter_map, **keywords)
+        function = functions[record.function]
+        return function(value, vocabulary=vocabulary, letter_map=letter_map, **keywords)
+
+    return call
+
+
+class ReplayReport(NamedTuple):
+    """
+    Results of a ``replay()``.
+
+    Attributes
+    ----------
+    calls : ``int``.
+        Records replayed.
+    errors : ``int``.
+        Calls which raised.
+    wall_time : ``float``.
+        Seconds from the first call starting to the last finishing.
+    throughput : ``float``.
+        Calls per second of wall time.
+    latencies : ``Dict[str, float]``.
+        Seconds at the ``p50``, ``p90``, ``p99`` and ``max`` percentiles.
+    peak_memory : ``Optional[int]``.
+        Peak resident set size of this process in kilobytes, where available.
+    fingerprint_mismatches : ``int``.
+        Records made against a different vocabulary than the one replayed. Records
+        without a fingerprint are not counted.
+    """
+
+    calls: int
+    errors: int
+    wall_time: float
+    throughput: float
+    latencies: Dict[str, float]
+    peak_memory: Optional[int]
+    fingerprint_mismatches: int
+
+    def __str__(self) -> str:
+        latencies = " ".join(
+            "%s=%.2fms" % (name, 1000 * seconds)
+            for name, seconds in self.latencies.items()
+        )
+        memory = "?" if self.peak_memory is None else "%dkB" % self.peak_memory
+        return "%d calls, %d errors, %.1f calls/s, %s, peak RSS %s" % (
+            self.calls,
+            self.errors,
+            self.throughput,
+            latencies,
+            memory,
+        )
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """ Nearest-rank percentile of the sorted, nonempty ``ordered``. """
+    rank = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def replay(
+    records: Iterable[TraceRecord],
+    call: Callable[[TraceRecord], Any],
+    speedup: float = 1.0,
+    concurrency: int = 4,
+    fingerprint: Optional[str] = None,
+) -> ReplayReport:
+    """
+    Replays a trace as a load test. Each record is issued at its recorded offset
+    divided by ``speedup`` on a pool of ``concurrency`` threads, so the mix, skew
+    and burstiness of the original traffic are kept.
+
+    Parameters
+    ----------
+    records : ``Iterable[TraceRecord]``.
+        The trace, e.g. from ``read_trace()``.
+    call : ``Callable[[TraceRecord], Any]``.
+        Issues one call, e.g. ``engine_caller(engine)``.
+    speedup : ``float``.
+        Factor by which to compress the trace's timeline. ``0`` or ``inf`` issues
+        every call as soon as a thread is free.
+    concurrency : ``int``.
+        Calls in flight at once.
+    fingerprint : ``Optional[str]``.
+        Fingerprint of the replayed vocabulary, to count records made against
+        another.
+
+    Returns
+    -------
+    report : ``ReplayReport``.
+        Latency percentiles, throughput and memory. When paced, latency is measured
+        from when a call was due, so it includes any wait for a free thread.
+    """
+    records = list(records)
+    paced = 0 < speedup < float("inf")
+    first = records[0].timestamp if records else 0.0
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    started = time.monotonic()
+
+    def issue(record: TraceRecord) -> None:
+        nonlocal errors
+        if paced:
+            due = started + (record.timestamp - first) / speedup
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            due = time.monotonic()
+        failed = False
+        try:
+            call(record)
+        except Exception:  # pylint: disable=broad-except
+            failed = True
+        latency = time.monotonic() - due
+        with lock:
+            latencies.append(latency)
+            errors += failed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(issue, records))
+    wall_time = time.monotonic() - started
+
+    ordered = sorted(latencies)
+    percentiles: Dict[str, float] = {}
+    if ordered:
+        percentiles = {
+            "p50": percentile(ordered, 0.5),
+            "p90": percentile(ordered, 0.9),
+            "p99": percentile(ordered, 0.99),
+            "max": ordered[-1],
+        }
+    peak_memory = None
+    if resource is not None:
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    mismatches = 0
+    if fingerprint is not None:
+        mismatches = sum(
+            record.fingerprint not in ("", fingerprint) for record in records
+        )
+    return ReplayReport(
+        len(records),
+        errors,
+        wall_time,
+        len(records) / wall_time if wall_time > 0 else 0.0,
+        percentiles,
+        peak_memory,
+        mismatches,
+    )
@@ -3,12 +3,20 @@ import os
 import re
 import itertools
 import urllib.request
-from typing import List, Set, Dict, Tuple
+from typing import List, Set, Dict, Tuple, Mapping, Sequence, Iterator, Optional
+
+from telephone.keypad import LetterMap, as_keypad
 
 # pylint: disable=bad-continuation
 
 VALID_CHARACTERS = set(list(" -0123456789"))
 FUNCTION_CHARACTERS = set(list("-"))
+FUNCTION_SEQUENCES = [
+    "".join(comb)
+    for comb in itertools.combinations_with_replacement(sorted(FUNCTION_CHARACTERS), 2)
+]
+STRIP_FUNCTION_TABLE = str.maketrans("", "", "".join(FUNCTION_CHARACTERS))
+FORMAT_TABLE = str.maketrans("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ", "0" * 36)
 VOCAB_URL = (
     "https://raw.githubusercontent.com/first20hours/"
     + "google-10000-english/master/google-10000-english.txt"
@@ -67,7 +75,7 @@ def get_vocabulary() -> Set[str]:
 
 
 def compute_vocab_map(
-    vocabulary: Set[str], letter_map: Dict[str, str]
+    vocabulary: Set[str], letter_map: LetterMap
 ) -> Dict[str, List[str]]:
     """
     Computes hashes of each word in ``vocabulary`` and maps the hashes to equivalence
@@ -77,8 +85,8 @@ def compute_vocab_map(
     ----------
     vocabulary : ``Set[str]``.
         A set of strings consisting of lowercase alpha characters only. All nonempty.
-    letter_map : ``Dict[str, str]``.
-        Mapping from uppercase letters to digits.
+    letter_map : ``LetterMap``.
+        Mapping from uppercase letters to digits, or a precompiled ``Keypad``.
 
     Returns
     -------
@@ -86,13 +94,19 @@ def compute_vocab_map(
         A mapping from sequences of numerals to words in a vocabulary which map to them
         under ``letter_map`` which maps letters to numbers not necessarily injectively.
     """
+    keypad = as_keypad(letter_map)
+
     # Construct vocab_map.
     vocab_map: Dict[str, List[str]] = {}
     for token in vocabulary:
         if not token.isalpha():
             raise ValueError("Vocabulary word '%s' contains non-alpha chars." % token)
+        if keypad.unmapped(token):
+            raise ValueError(
+                "Vocabulary word '%s' contains letters outside of the keypad." % token
+            )
         uppercased_token = token.upper()
-        tokenhash = "".join([letter_map[char] for char in uppercased_token])
+        tokenhash = keypad.translate(token)
         if tokenhash in vocab_map:
             vocab_map[tokenhash].append(uppercased_token)
         else:
@@ -101,6 +115,167 @@ def compute_vocab_map(
     return vocab_map
 
 
+def compute_token_lattice(
+    base_number: str,
+    vocab_map: Mapping[str, Sequence[str]],
+    hash_lengths: Optional[Sequence[int]] = None,
+) -> List[List[Tuple[str, int]]]:
+    """
+    Lists the tokens which may be placed at each index of ``base_number``.
+
+    Parameters
+    ----------
+    base_number : ``str``.
+        A phone number without its country code. Digits only.
+    vocab_map : ``Mapping[str, Sequence[str]]``.
+        Maps digit hashes to the uppercase words which hash to them.
+    hash_lengths : ``Optional[Sequence[int]]``.
+        The sorted, distinct lengths of the keys of ``vocab_map``. Computed if not
+        given.
+
+    Returns
+    -------
+    lattice : ``List[List[Tuple[str, int]]]``.
+        Entry ``i`` holds ``(token, end)`` pairs, where ``token`` may replace
+        ``base_number[i:end]``. The digit ``base_number[i]`` always comes first,
+        followed by the matching words in lexicographic order, so a depth-first walk
+        of the lattice visits token sequences in lexicographic order.
+    """
+    if hash_lengths is None:
+        hash_lengths = sorted({len(wordhash) for wordhash in vocab_map})
+    lattice: List[List[Tuple[str, int]]] = []
+    for i, digit in enumerate(base_number):
+        words: List[Tuple[str, int]] = []
+        for length in hash_lengths:
+            end = i + length
+            if end > len(base_number):
+                break
+            substr = base_number[i:end]
+            if substr in vocab_map:
+                words.extend([(word, end) for word in vocab_map[substr]])
+        words.sort()
+        lattice.append([(digit, i + 1)] + words)
+    return lattice
+
+
+def iter_lattice_paths(
+    lattice: List[List[Tuple[str, int]]],
+    after: Optional[List[int]] = None,
+    start: int = 0,
+) -> Iterator[List[int]]:
+    """
+    Walks ``lattice`` depth-first, yielding each complete path as the list of option
+    indices chosen at each step. Paths come out in lexicographic token order.
+
+    Parameters
+    ----------
+    lattice : ``List[List[Tuple[str, int]]]``.
+        As returned by ``compute_token_lattice()``.
+    after : ``Optional[List[int]]``.
+        A previously yielded path. If given, the walk resumes immediately after it
+        without revisiting any earlier path.
+    start : ``int``.
+        Index at which paths begin, to walk only the completions of a suffix.
+
+    Yields
+    ------
+    path : ``List[int]``.
+        A fresh list of option indices; ``lattice[positions[k]][path[k]]`` is the
+        ``k``-th token.
+    """
+    size = len(lattice)
+    path: List[int] = []
+    positions: List[int] = [start]
+
+    if after is None:
+        while positions[-1] < size:
+            path.append(0)
+            positions.append(lattice[positions[-1]][0][1])
+        yield list(path)
+    else:
+        for index in after:
+            position = positions[-1]
+            if position >= size or not 0 <= index < len(lattice[position]):
+                raise ValueError("Path '%s' does not fit the lattice." % str(after))
+            path.append(index)
+            positions.append(lattice[position][index][1])
+        if positions[-1] != size:
+            raise ValueError("Path '%s' is incomplete." % str(after))
+
+    while path:
+        # Backtrack to the deepest step with an untried sibling.
+        position = positions[-2]
+        index = path[-1] + 1
+        if index >= len(lattice[position]):
+            path.pop()
+            positions.pop()
+            continue
+
+        # Take the sibling, then descend along first options to a leaf.
+        path[-1] = index
+        positions[-1] = lattice[position][index][1]
+        while positions[-1] < size:
+            path.append(0)
+            positions.append(lattice[positions[-1]][0][1])
+        yield list(path)
+
+
+def count_lattice_paths(lattice: List[List[Tuple[str, int]]]) -> List[int]:
+    """
+    Counts the complete paths through ``lattice`` from each index, via the suffix
+    recurrence ``counts[i] = sum(counts[end] for _, end in lattice[i])``.
+
+    Returns
+    -------
+    counts : ``List[int]``.
+        ``counts[i]`` is the number of distinct token sequences covering
+        ``base_number[i:]``. ``counts[0]`` is the total number of phonewords.
+    """
+    counts = [0] * len(lattice) + [1]
+    for i in range(len(lattice) - 1, -1, -1):
+        counts[i] = sum([counts[end] for _, end in lattice[i]])
+    return counts
+
+
+def unrank_lattice_path(
+    lattice: List[List[Tuple[str, int]]], counts: List[int], rank: int
+) -> List[str]:
+    """
+    Returns the tokens of the ``rank``-th path through ``lattice`` in the order of
+    ``iter_lattice_paths()``, in time linear in the length of the path and the number
+    of options along it.
+    """
+    if not 0 <= rank < counts[0]:
+        raise ValueError("Rank '%d' out of range [0, %d)." % (rank, counts[0]))
+    tokens: List[str] = []
+    position = 0
+    while position < len(lattice):
+        for token, end in lattice[position]:
+            if rank < counts[end]:
+                tokens.append(token)
+                position = end
+                break
+            rank -= counts[end]
+    return tokens
+
+
+def assemble_phoneword(country_code: str, tokens: List[str], numformat: str) -> str:
+    """
+    Joins a sequence of single digits and uppercase words into a phoneword, separating
+    adjacent words and formatting the result according to ``numformat``.
+    """
+    spacer = "&"
+    parts: List[str] = [country_code, spacer]
+    previous_is_word = False
+    for token in tokens:
+        is_word = token.isalpha()
+        if is_word and previous_is_word:
+            parts.append(spacer)
+        parts.append(token)
+        previous_is_word = is_word
+    return insert_dashes("".join(parts), spacer, numformat)
+
+
 def validate(number: str) -> None:
     """
     Determines if a string COULD be a valid phone number according to a general format.
@@ -122,8 +297,7 @@ def validate(number: str) -> None:
         return
 
     # Check for invalid characters.
-    for char in FUNCTION_CHARACTERS:
-        sanitized_number = number.replace(char, "")
+    sanitized_number = number.translate(STRIP_FUNCTION_TABLE)
     if not sanitized_number.isnumeric():
         raise ValueError(
             "The number '%s' contains invalid characters. " % number
@@ -131,9 +305,7 @@ def validate(number: str) -> None:
         )
 
     # Check for invalid arrangements of function characters.
-    fn_combs = itertools.combinations_with_replacement(FUNCTION_CHARACTERS, 2)
-    fn_strs = ["".join(comb) for comb in fn_combs]
-    for fn_str in fn_strs:
+    for fn_str in FUNCTION_SEQUENCES:
         if fn_str in number:
             raise ValueError(
                 "Invalid arrangement '%s' of function characters from '%s' in '%s'."
@@ -143,16 +315,17 @@ def validate(number: str) -> None:
 
 def get_country_code_and_base(number: str) -> Tuple[str, str]:
     """ Splits on the first dash. """
-    # Treat empty string.
-    if number == "":
-        return "", ""
-    segments = number.split("-")
-    country_code = segments[0]
-    base_number = "".join(segments[1:])
+    country_code, _, rest = number.partition("-")
+    base_number = rest.replace("-", "")
 
     return country_code, base_number
 
 
+def infer_format(number: str) -> str:
+    """ Replaces each alphanumeric character of ``number`` with ``0``. """
+    return number.translate(FORMAT_TABLE)
+
+
 def insert_dashes(spaced_phoneword: str, spacer: str, numformat: str) -> str:
     """
     Inserts dashes between appropriate segments of a US phoneword.
@@ -1,14 +1,13 @@
 """ Translation of phonewords to US phone numbers. """
-import re
-from typing import List, Dict
-from telephone.utils import insert_dashes
-from telephone.tests.test_constants import US_LETTER_MAP
+from typing import List
+from telephone.utils import insert_dashes, infer_format
+from telephone.keypad import LetterMap, US_KEYPAD, as_keypad
 
 # pylint: disable=bad-continuation
 
 
 def words_to_number(
-    phoneword: str, numformat: str = "", letter_map: Dict[str, str] = US_LETTER_MAP
+    phoneword: str, numformat: str = "", letter_map: LetterMap = US_KEYPAD
 ) -> str:
     """
     Maps a phoneword back to the origin phone number.
@@ -20,8 +19,8 @@ def words_to_number(
         characters. Contiguous sequences of alpha characters are separated by dashes.
     numformat : ``str``.
         Format of the number using "0" and "-", e.g. "0-000-000-0000" for US numbers.
-    letter_map : ``Dict[str, str]``.
-        Maps uppercase English letters to digits.
+    letter_map : ``LetterMap``.
+        Maps uppercase English letters to digits, or a precompiled ``Keypad``.
 
     Returns
     -------
@@ -32,22 +31,22 @@ def words_to_number(
         return ""
     if phoneword.upper() != phoneword:
         raise ValueError("Word '%s' contains lowercase letters." % phoneword)
+    keypad = as_keypad(letter_map)
 
     # Format inference.
     if numformat == "":
-        numformat = re.sub(r"[A-Z0-9]", "0", phoneword)
+        numformat = infer_format(phoneword)
 
     segments: List[str] = phoneword.split("-")
     translated_segments: List[str] = []
     for segment in segments:
         if not segment.isnumeric():
-            try:
-                segment_hash = "".join([letter_map[char] for char in segment])
-            except KeyError:
+            if keypad.unmapped(segment):
                 raise ValueError(
                     "Found invalid character in '%s' for mapping domain '%s'."
-                    % (segment, str(letter_map.keys()))
+                    % (segment, str(keypad.letter_map.keys()))
                 )
+            segment_hash = keypad.translate(segment)
         else:
             segment_hash = segment
         translated_segments.append(segment_hash)